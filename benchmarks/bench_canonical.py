@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+링크 정규화 / 리디렉션 해제 검증 + 벤치마크
+
+사용법:
+    python benchmarks/bench_canonical.py
+    python benchmarks/bench_canonical.py --stories 500 --latency 50
+
+로컬 HTTP 서버를 리디렉션 래퍼(news.google.com 대신)로 띄우고, 기사마다 서로 다른 래퍼 링크 두 개를 만듭니다.
+래퍼는 기사 번호에 따라 302 한 번, 301 두 번, meta refresh HTML, data-n-au HTML 중 하나로 원문 URL을 알려 주며,
+일부 링크는 404로 실패합니다. 원문 URL에는 utm_* 추적 파라미터가 붙어 있습니다.
+
+확인하는 것:
+    - 같은 기사의 두 래퍼 링크가 추적 파라미터를 뺀 같은 원문 URL로 정규화되는지
+    - 실패한 링크는 래퍼 링크 그대로 남는지
+    - 같은 캐시 파일로 다시 실행하면 HTTP 요청이 0번인지
+하나라도 어긋나면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.canonical import LinkCanonicalizer, ResolvedLinkCache, strip_tracking  # noqa: E402
+
+PUBLISHER = 'https://www.publisher.example'
+FAILING_EVERY = 17      # 이 간격마다 404를 돌려주는 기사
+
+
+def target_url(story: int) -> str:
+    return f'{PUBLISHER}/news/{story}?id={story}&utm_source=googlenews&utm_medium=rss'
+
+
+def serve_wrappers(latency: float):
+    """래퍼 링크를 처리하는 로컬 서버. server.hits에 받은 요청 수를 셉니다."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            server.hits += 1
+            time.sleep(latency)
+            kind, _, rest = self.path.split('?')[0].strip('/').partition('/')
+            story = int(rest.split('/')[0])
+
+            if story % FAILING_EVERY == 0:
+                self.send_error(404)
+            elif kind == 'wrap' and story % 4 == 1:
+                self.redirect(301, f'/hop/{story}')
+            elif kind == 'hop':
+                self.redirect(301, target_url(story))
+            elif story % 4 == 2:
+                self.html(f'<html><head><meta http-equiv="refresh" content="0;url={target_url(story).replace("&", "&amp;")}">'
+                          f'</head></html>')
+            elif story % 4 == 3:
+                self.html(f'<html><body><c-wiz data-n-au="{target_url(story).replace("&", "&amp;")}"></c-wiz></body></html>')
+            else:
+                self.redirect(302, target_url(story))
+
+        def redirect(self, status: int, location: str):
+            self.send_response(status)
+            self.send_header('Location', location)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def html(self, body: str):
+            data = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.hits = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stories', type=int, default=200, help='기사 수 (래퍼 링크는 두 배, 기본값: 200)')
+    parser.add_argument('--latency', type=float, default=20, help='래퍼 서버 응답 지연 ms (기본값: 20)')
+    parser.add_argument('--workers', type=int, default=8, help='동시 해제 수 (기본값: 8)')
+    args = parser.parse_args()
+
+    server = serve_wrappers(args.latency / 1000)
+    host = f'127.0.0.1:{server.server_address[1]}'
+    state_dir = tempfile.mkdtemp(prefix='gamenews-canonical-')
+    cache_path = os.path.join(state_dir, 'resolved_links.sqlite')
+
+    # 기사마다 경로가 다른 래퍼 링크 두 개 (서로 다른 검색 피드에서 온 것처럼)
+    links = []
+    for story in range(1, args.stories + 1):
+        links.append(f'http://{host}/wrap/{story}?oc=5')
+        links.append(f'http://{host}/wrap/{story}/alt?hl=ko&gl=KR&oc=5')
+
+    failures = []
+    try:
+        cache = ResolvedLinkCache(cache_path)
+        canonicalizer = LinkCanonicalizer(cache, wrapper_hosts=['127.0.0.1'], max_workers=args.workers)
+        start = time.perf_counter()
+        canonical = canonicalizer.canonicalize_many(links)
+        cold_seconds = time.perf_counter() - start
+        cold_requests = canonicalizer.requests
+        cache.close()
+
+        for i, link in enumerate(links):
+            story = i // 2 + 1
+            expected = strip_tracking(link) if story % FAILING_EVERY == 0 else strip_tracking(target_url(story))
+            if canonical[link] != expected:
+                failures.append(f'{link} -> {canonical[link]} (예상: {expected})')
+
+        unique_stories = len({canonical[link] for link in links})
+
+        # 같은 캐시 파일로 다시 실행: HTTP 요청 없이 같은 결과
+        cache = ResolvedLinkCache(cache_path)
+        canonicalizer = LinkCanonicalizer(cache, wrapper_hosts=['127.0.0.1'], max_workers=args.workers)
+        hits_before = server.hits
+        start = time.perf_counter()
+        cached = canonicalizer.canonicalize_many(links)
+        warm_seconds = time.perf_counter() - start
+        warm_hits = server.hits - hits_before
+        cache.close()
+
+        if cached != canonical:
+            failures.append('캐시로 다시 정규화한 결과가 처음 결과와 다릅니다')
+        if warm_hits:
+            failures.append(f'캐시가 있는데도 HTTP 요청을 {warm_hits}번 보냈습니다')
+
+        targets = [target_url(story) for story in range(1, args.stories + 1)] * 10
+        start = time.perf_counter()
+        for target in targets:
+            strip_tracking(target)
+        strip_rate = len(targets) / (time.perf_counter() - start)
+    finally:
+        server.shutdown()
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    print(f"🔗 래퍼 링크 {len(links)}개 (기사 {args.stories}개, 응답 지연 {args.latency:.0f} ms, 동시 {args.workers}개)")
+    print(f"   처음 해제: {cold_seconds * 1000:,.0f} ms, HTTP 요청 {cold_requests}번, 정규화 후 고유 링크 {unique_stories}개")
+    print(f"   캐시 사용: {warm_seconds * 1000:,.1f} ms, HTTP 요청 {warm_hits}번")
+    print(f"   strip_tracking: {strip_rate:,.0f} links/s")
+
+    if failures:
+        print(f"\n❌ 검증 실패 {len(failures)}건")
+        for failure in failures[:10]:
+            print(f"   {failure}")
+        sys.exit(1)
+    print("\n✅ 같은 기사의 래퍼 링크가 모두 같은 원문 URL로 정규화되었습니다")
+
+
+if __name__ == "__main__":
+    main()
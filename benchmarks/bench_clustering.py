@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+스토리 묶기(gamenews/clustering.py) 벤치마크 + 정확도 확인
+
+사용법:
+    python benchmarks/bench_clustering.py
+    python benchmarks/bench_clustering.py --per-day 5000 --window-days 3 --threshold 0.3
+
+합성 한국어 뉴스로 최근 윈도우(--window-days일)와 하루치 새 기사(--per-day개)를 만듭니다.
+스토리마다 고유한 고유명사(게임명, 인물 등)와 회사명을 정해 두고, 같은 스토리의 기사는
+그 단어 일부와 흔한 단어를 섞어 언론사마다 다른 제목 / 요약으로 씁니다.
+같은 회사의 다른 스토리도 많으므로 회사명만 겹치는 기사는 묶이면 안 됩니다.
+
+    - 윈도우 적재(extend)와 하루치 기사 묶기(assign, 크롤러처럼 500개씩) 시간
+    - B-cubed 정밀도 / 재현율: 새 기사마다 같은 cluster_id로 묶인 기사 중 실제 같은 스토리의 비율 /
+      실제 같은 스토리 중 같은 cluster_id로 묶인 비율
+    - 비교용으로 기존 제목 유사도 검사(SequenceMatcher 80%)가 같은 스토리의 앞 기사를 찾은 비율
+하루치 묶기가 --max-seconds를 넘거나 F1이 --min-f1보다 낮으면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler import CLUSTER_WINDOW_DAYS  # noqa: E402
+from gamenews.clustering import CLUSTER_THRESHOLD, StoryIndex  # noqa: E402
+from gamenews.near_duplicate import NearDuplicateIndex  # noqa: E402
+
+COMPANIES = [
+    '넥슨', '엔씨소프트', '크래프톤', '펄어비스', '넷마블', '컴투스', '스마일게이트', '카카오게임즈', '위메이드',
+    '네오위즈', '시프트업', '데브시스터즈', '그라비티', '웹젠', '닌텐도', '소니', '마이크로소프트', '유비소프트',
+]
+COMMON_WORDS = [
+    '게임', '신작', '출시', '공개', '발표', '업데이트', '이용자', '서비스', '글로벌', '모바일', 'PC', '콘솔',
+    '개발', '사전예약', '매출', '실적', '분기', '영업이익', '투자', '기대', '인기', '순위', '이벤트', '시즌',
+    '대회', '참가', '진행', '예정', '확인', '관계자', '밝혔다', '전했다', '올해', '내년', '최대', '최초',
+    '시장', '플랫폼', '콘텐츠', '신규', '정식', '테스트', '흥행', '국내', '해외', '기록', '이번', '지난',
+]
+BRACKETS = ['', '', '', '[단독] ', '[종합] ', '[게임] ', '(속보) ']
+INTAKE_BATCH = 500      # 크롤러의 INSERT_BATCH_SIZE
+
+
+def make_word(rng: random.Random) -> str:
+    """무작위 한글 음절 2~4개로 만든 고유명사"""
+    return ''.join(chr(rng.randint(0xAC00, 0xD7A3)) for _ in range(rng.randint(2, 4)))
+
+
+def make_story(rng: random.Random) -> dict:
+    return {'company': rng.choice(COMPANIES), 'names': [make_word(rng) for _ in range(4)]}
+
+
+def write_article(story: dict, rng: random.Random) -> tuple:
+    """스토리의 고유명사 일부 + 흔한 단어로 제목 / 요약을 만듭니다 (언론사마다 다른 표현)."""
+    names = rng.sample(story['names'], 2)
+    title_words = [story['company']] + names + rng.sample(COMMON_WORDS, 3)
+    rng.shuffle(title_words)
+    title = rng.choice(BRACKETS) + ' '.join(title_words)
+
+    summary_words = [story['company']] + rng.sample(story['names'], 3) + rng.sample(COMMON_WORDS, 18)
+    rng.shuffle(summary_words)
+    summary = ' '.join(summary_words)[:200] if rng.random() > 0.1 else ''
+    return title, summary
+
+
+def build_days(days: int, per_day: int, rng: random.Random) -> list:
+    """
+    하루씩 (제목, 요약, 스토리 번호) 목록을 만듭니다.
+    스토리는 1~6개 기사로 이뤄지고, 일부는 다음 날까지 이어집니다.
+    """
+    stories = []
+    result = []
+    for _ in range(days):
+        items = []
+        while len(items) < per_day:
+            if stories and rng.random() < 0.15:
+                story_id = rng.randrange(max(0, len(stories) - per_day // 2), len(stories))   # 전날 스토리 후속 기사
+            else:
+                stories.append(make_story(rng))
+                story_id = len(stories) - 1
+            for _ in range(min(rng.choice([1, 1, 2, 2, 3, 4, 6]), per_day - len(items))):
+                items.append(write_article(stories[story_id], rng) + (story_id,))
+        rng.shuffle(items)
+        result.append(items)
+    return result
+
+
+def b_cubed(predicted: list, truth: list, targets: range) -> tuple:
+    """targets 위치의 항목에 대한 B-cubed (정밀도, 재현율)"""
+    pair_count = Counter(zip(predicted, truth))
+    predicted_count = Counter(predicted)
+    truth_count = Counter(truth)
+
+    precision = recall = 0.0
+    for i in targets:
+        same = pair_count[(predicted[i], truth[i])]
+        precision += same / predicted_count[predicted[i]]
+        recall += same / truth_count[truth[i]]
+    return precision / len(targets), recall / len(targets)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--per-day', type=int, default=3000, help='하루 기사 수 (기본값: 3000)')
+    parser.add_argument('--window-days', type=int, default=CLUSTER_WINDOW_DAYS,
+                        help=f'최근 윈도우 일 수 (기본값: {CLUSTER_WINDOW_DAYS})')
+    parser.add_argument('--threshold', type=float, default=CLUSTER_THRESHOLD,
+                        help=f'묶는 코사인 유사도 기준 (기본값: {CLUSTER_THRESHOLD})')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드 (기본값: 42)')
+    parser.add_argument('--max-seconds', type=float, default=1.0, help='하루치 묶기 시간 상한 (기본값: 1초)')
+    parser.add_argument('--min-f1', type=float, default=0.9, help='B-cubed F1 하한 (기본값: 0.9)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    *window_days, today = build_days(args.window_days + 1, args.per_day, rng)
+    window = [item for day in window_days for item in day]
+
+    # 윈도우는 이전 실행에서 정답대로 묶였다고 가정 (cluster_id = 스토리 번호)
+    index = StoryIndex(threshold=args.threshold)
+    start = time.perf_counter()
+    index.extend((f"story-{story}", title, summary) for title, summary, story in window)
+    extend_seconds = time.perf_counter() - start
+
+    predicted = [f"story-{story}" for _, _, story in window]
+    start = time.perf_counter()
+    for i in range(0, len(today), INTAKE_BATCH):
+        predicted.extend(index.assign((title, summary) for title, summary, _ in today[i:i + INTAKE_BATCH]))
+    assign_seconds = time.perf_counter() - start
+
+    truth = [story for _, _, story in window + today]
+    precision, recall = b_cubed(predicted, truth, range(len(window), len(truth)))
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    # 기존 방식: 제목 SequenceMatcher 80% 이상인 앞 기사를 찾으면 같은 스토리로 보는 셈
+    titles = NearDuplicateIndex(threshold=0.8)
+    titles.extend(title for title, _, _ in window)
+    earlier_stories = {story for _, _, story in window}
+    has_earlier = found = 0
+    for title, _, story in today:
+        if story in earlier_stories:
+            has_earlier += 1
+            found += titles.find_similar(title)[0] is not None
+        titles.add(title)
+        earlier_stories.add(story)
+
+    stories_today = len(set(story for _, _, story in today))
+    print(f"🧩 윈도우 {len(window):,}개 ({args.window_days}일) + 새 기사 {len(today):,}개, "
+          f"실제 스토리 {stories_today:,}개, 기준 {args.threshold}")
+    print("=" * 64)
+    print(f"윈도우 적재 (extend)          {extend_seconds * 1000:>10,.1f} ms")
+    print(f"하루치 묶기 (assign x {-(-len(today) // INTAKE_BATCH)})      {assign_seconds * 1000:>10,.1f} ms"
+          f"   ({len(today) / assign_seconds:,.0f} items/s)")
+    print(f"묶인 스토리 수                {len(set(predicted[len(window):])):>10,}")
+    print(f"B-cubed 정밀도 / 재현율 / F1  {precision:>10.3f} / {recall:.3f} / {f1:.3f}")
+    print(f"제목 유사도(80%)가 찾은 같은 스토리 앞 기사 {found:,}/{has_earlier:,}개")
+    print("=" * 64)
+
+    failures = []
+    if assign_seconds > args.max_seconds:
+        failures.append(f"하루치 묶기가 {assign_seconds:.2f}초 걸렸습니다 (상한 {args.max_seconds}초)")
+    if f1 < args.min_f1:
+        failures.append(f"F1 {f1:.3f}이 하한 {args.min_f1}보다 낮습니다")
+    if failures:
+        print(f"\n❌ 검증 실패 {len(failures)}건")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print(f"\n✅ 하루치 {len(today):,}개를 {assign_seconds:.2f}초에 묶었습니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+크롤러 파이프라인 오프라인 벤치마크
+
+사용법:
+    python benchmarks/bench_crawler.py
+    python benchmarks/bench_crawler.py --feeds 20 --items 50 --dup-ratio 0.4
+    python benchmarks/bench_crawler.py --save-baseline          # 현재 결과를 기준값으로 저장
+    python benchmarks/bench_crawler.py --check                  # 기준값 대비 회귀가 있으면 종료 코드 1 (기준값이 없으면 건너뜀)
+    python benchmarks/bench_crawler.py --store sqlite           # posts를 로컬 SQLite 파일에 저장
+
+합성 RSS 문서(피드 수, 피드당 항목 수, 중복 비율 조절 가능)를 로컬 HTTP 서버로 제공하고, 네트워크 없이 실행합니다.
+posts 저장소(gamenews/storage.py)는 --store로 고릅니다.
+    memory (기본값): Supabase 저장소 + 메모리 기반 대역(gamenews.memory_db.MemorySupabase), 실제와 같은 쿼리 / 왕복 수
+    sqlite: 임시 디렉토리의 SQLite 저장소, 디스크에 쓰는 전체 흐름
+
+측정 단계:
+    clean_title, clean_summary, extract_tags, is_spam, calculate_similarity
+    fetch_and_store (cold): 캐시와 DB가 비어 있는 첫 실행
+    fetch_and_store (warm): 같은 피드를 다시 처리 (피드 커서로 모든 항목 스킵)
+
+단계별 처리량(ops/s, 반복 중 최고값)과 tracemalloc 최대 메모리(KiB)를 출력합니다.
+기준값은 같은 머신 / 같은 옵션으로 저장한 결과와만 비교하세요.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+# crawler.py / gamenews는 import 시점에 캐시 경로를 읽으므로 import 전에 설정
+# (인증 정보도 실제 .env 값보다 먼저 설정해, 대역을 넣기 전에 실제 Supabase에 연결하는 일이 없도록 함)
+STATE_DIR = tempfile.mkdtemp(prefix='gamenews-bench-')
+os.environ['SUPABASE_URL'] = 'http://127.0.0.1:9'
+os.environ['SUPABASE_KEY'] = 'bench.offline.key'
+os.environ['DISCORD_WEBHOOK_URL'] = ''
+os.environ['FEED_CACHE_FILE'] = os.path.join(STATE_DIR, 'feed_validators.json')
+os.environ['SEEN_LINKS_DB'] = os.path.join(STATE_DIR, 'seen_links.sqlite')
+os.environ['FEED_CURSORS_FILE'] = os.path.join(STATE_DIR, 'feed_cursors.json')
+os.environ['RESOLVED_LINKS_DB'] = os.path.join(STATE_DIR, 'resolved_links.sqlite')
+os.environ['TITLE_SIGNATURES_DB'] = os.path.join(STATE_DIR, 'title_signatures.sqlite')
+os.environ['FEED_SNAPSHOT_DIR'] = os.path.join(STATE_DIR, 'feed_snapshots')
+
+import crawler  # noqa: E402
+from bench_near_duplicate import make_title, mutate_title  # noqa: E402
+from gamenews.memory_db import MemorySupabase  # noqa: E402
+from gamenews.storage import SqlitePostStore, SupabasePostStore  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, 'baseline.json')
+
+PUBLISHERS = ['게임메카', '디스이즈게임', '인벤', '게임동아', '경향게임스', '전자신문', '지디넷코리아']
+SPAM_WORDS = ['쿠폰', '경품', '프로모션']
+
+
+# --- 합성 데이터 ---
+
+def make_summary(title: str, publisher: str, rng: random.Random) -> str:
+    """Google News RSS와 비슷한 HTML 요약"""
+    related = ''.join(
+        f'<li><a href="https://example.com/r/{rng.randint(1, 10**9)}">{escape(make_title(rng))}</a>'
+        f'&nbsp;&nbsp;<font color="#6f6f6f">{publisher}</font></li>'
+        for _ in range(rng.randint(0, 3))
+    )
+    return (f'<ol><li><a href="https://example.com/a" target="_blank">{escape(title)}</a>'
+            f'&nbsp;&nbsp;<font color="#6f6f6f">{publisher}</font></li>{related}</ol>')
+
+
+def build_dataset(feeds: int, items: int, dup_ratio: float, spam_ratio: float,
+                  existing: int, seed: int):
+    """
+    피드 문서와 DB에 미리 들어 있을 행을 만듭니다.
+    중복 항목의 절반은 DB에 이미 있는 링크(정확한 일치), 절반은 기존 제목을 살짝 바꾼 유사 제목입니다.
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+
+    seed_rows = []
+    for i in range(existing):
+        seed_rows.append({
+            'id': f'{i:08d}-0000-0000-0000-000000000000',
+            'title': make_title(rng),
+            'summary': '',
+            'original_link': f'https://news.example.com/existing/{i}',
+            'category': 'Industry',
+            'tags': [],
+            'created_at': (now - timedelta(minutes=i)).isoformat(),
+        })
+
+    documents = {}
+    entries = []
+    for f in range(feeds):
+        item_xml = []
+        for i in range(items):
+            publisher = rng.choice(PUBLISHERS)
+            roll = rng.random()
+            if seed_rows and roll < dup_ratio / 2:
+                row = rng.choice(seed_rows)
+                title, link = row['title'], row['original_link']
+            elif seed_rows and roll < dup_ratio:
+                title = mutate_title(rng.choice(seed_rows)['title'], rng)
+                link = f'https://news.example.com/{f}/{i}/{rng.randint(1, 10**9)}'
+            else:
+                title = make_title(rng)
+                link = f'https://news.example.com/{f}/{i}/{rng.randint(1, 10**9)}'
+            if rng.random() < spam_ratio:
+                title = f'{title} {rng.choice(SPAM_WORDS)}'
+
+            raw_title = f'{title} - {publisher}'
+            summary = make_summary(title, publisher, rng)
+            entries.append((raw_title, summary))
+            item_xml.append(
+                f'<item><title>{escape(raw_title)}</title><link>{escape(link)}</link>'
+                f'<guid isPermaLink="false">{f}-{i}</guid>'
+                f'<pubDate>{format_datetime(now - timedelta(minutes=i))}</pubDate>'
+                f'<description>{escape(summary)}</description>'
+                f'<source url="https://example.com">{publisher}</source></item>'
+            )
+        documents[f'/feed/{f}.xml'] = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>bench feed {f}</title><link>https://news.example.com</link>'
+            f'<description>synthetic</description>{"".join(item_xml)}</channel></rss>'
+        ).encode('utf-8')
+
+    return documents, entries, seed_rows
+
+
+def serve_documents(documents: dict):
+    """문서를 제공하는 로컬 HTTP 서버를 백그라운드 스레드로 띄웁니다."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = documents.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- 측정 ---
+
+def measure(fn, ops: int, repeat: int):
+    """
+    fn()을 repeat번 실행해 가장 빠른 실행의 처리량(ops/s)을 구하고,
+    tracemalloc으로 한 번 더 실행해 최대 메모리(KiB)를 구합니다.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'ops_per_sec': ops / best if best > 0 else 0.0, 'peak_kib': peak / 1024, 'seconds': best}
+
+
+def reset_state():
+    shutil.rmtree(STATE_DIR, ignore_errors=True)
+    os.makedirs(STATE_DIR, exist_ok=True)
+
+
+def open_store(kind: str, seed_rows: list):
+    """기존 게시물을 미리 넣은 저장소를 엽니다 (sqlite는 STATE_DIR 안에 만드므로 reset_state() 뒤에 호출)."""
+    if kind == 'sqlite':
+        store = SqlitePostStore(os.path.join(STATE_DIR, 'posts.sqlite'), metrics=crawler.metrics)
+        store.insert_posts(seed_rows)
+        return store
+    fake = MemorySupabase({'posts': [dict(row) for row in seed_rows]})
+    return SupabasePostStore(fake, scheduler=crawler.scheduler, metrics=crawler.metrics)
+
+
+def run_pipeline(store):
+    """파이프라인을 한 번 실행하고 DB 왕복 횟수를 반환합니다."""
+    crawler.post_store = store
+    with contextlib.redirect_stdout(io.StringIO()):
+        stats = crawler.fetch_and_store_news()
+    return stats['metrics']['counters'].get('db_round_trips', 0)
+
+
+def run_benchmarks(args) -> dict:
+    documents, entries, seed_rows = build_dataset(
+        args.feeds, args.items, args.dup_ratio, args.spam_ratio, args.existing, args.seed)
+
+    server = serve_documents(documents)
+    host, port = server.server_address
+    crawler.RSS_FEEDS = [
+        {'url': f'http://{host}:{port}{path}', 'category': 'Industry', 'name': f'bench {path}'}
+        for path in documents
+    ]
+
+    raw_titles = [title for title, _ in entries]
+    raw_summaries = [summary for _, summary in entries]
+    titles = [crawler.clean_title(t) for t in raw_titles]
+    texts = [f"{t} {crawler.clean_summary(s)}" for t, s in zip(titles, raw_summaries)]
+    rng = random.Random(args.seed)
+    pairs = [(t, mutate_title(t, rng) if rng.random() < 0.5 else rng.choice(titles)) for t in titles]
+
+    results = {}
+    micro = [
+        ('clean_title', lambda: [crawler.clean_title(t) for t in raw_titles], len(raw_titles)),
+        ('clean_summary', lambda: [crawler.clean_summary(s) for s in raw_summaries], len(raw_summaries)),
+        ('extract_tags', lambda: [crawler.extract_tags(t) for t in texts], len(texts)),
+        ('is_spam', lambda: [crawler.is_spam(t) for t in texts], len(texts)),
+        ('calculate_similarity', lambda: [crawler.calculate_similarity(a, b) for a, b in pairs], len(pairs)),
+    ]
+    for name, fn, ops in micro:
+        results[name] = measure(fn, ops, args.repeat)
+
+    # 전체 흐름: 처리 단위는 피드 항목 수
+    processed = args.feeds * args.items
+    round_trips = {}
+
+    def cold():
+        reset_state()
+        store = open_store(args.store, seed_rows)
+        round_trips['cold'] = run_pipeline(store)
+        store.close()
+
+    results['fetch_and_store (cold)'] = measure(cold, processed, args.repeat)
+
+    reset_state()
+    warm_store = open_store(args.store, seed_rows)
+    run_pipeline(warm_store)
+
+    def warm():
+        round_trips['warm'] = run_pipeline(warm_store)
+
+    results['fetch_and_store (warm)'] = measure(warm, processed, args.repeat)
+    warm_store.close()
+    results['fetch_and_store (cold)']['db_round_trips'] = round_trips['cold']
+    results['fetch_and_store (warm)']['db_round_trips'] = round_trips['warm']
+
+    server.shutdown()
+    shutil.rmtree(STATE_DIR, ignore_errors=True)
+    return results
+
+
+def workload(args) -> dict:
+    return {
+        'feeds': args.feeds, 'items': args.items, 'dup_ratio': args.dup_ratio,
+        'spam_ratio': args.spam_ratio, 'existing': args.existing, 'seed': args.seed,
+        'store': args.store,
+    }
+
+
+def check_regressions(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    기준값 대비 처리량이 tolerance 이상 줄었거나 최대 메모리가 tolerance 이상 늘어난 단계를 반환합니다.
+    """
+    regressions = []
+    for name, base in baseline.get('stages', {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        if current['ops_per_sec'] < base['ops_per_sec'] * (1 - tolerance):
+            regressions.append(f"{name}: 처리량 {base['ops_per_sec']:,.0f} → {current['ops_per_sec']:,.0f} ops/s")
+        if current['peak_kib'] > base['peak_kib'] * (1 + tolerance) + 64:
+            regressions.append(f"{name}: 메모리 {base['peak_kib']:,.0f} → {current['peak_kib']:,.0f} KiB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--feeds', type=int, default=20, help='피드 수 (기본값: 20)')
+    parser.add_argument('--items', type=int, default=50, help='피드당 항목 수 (기본값: 50)')
+    parser.add_argument('--dup-ratio', type=float, default=0.3, help='중복 항목 비율 (기본값: 0.3)')
+    parser.add_argument('--spam-ratio', type=float, default=0.05, help='스팸 항목 비율 (기본값: 0.05)')
+    parser.add_argument('--existing', type=int, default=5000, help='DB에 미리 있는 게시물 수 (기본값: 5000)')
+    parser.add_argument('--repeat', type=int, default=3, help='단계별 반복 횟수, 최고값 사용 (기본값: 3)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--store', choices=('memory', 'sqlite'), default='memory',
+                        help='posts 저장소 (기본값: memory = Supabase 저장소 + 메모리 대역)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='기준값 파일 경로')
+    parser.add_argument('--save-baseline', action='store_true', help='결과를 기준값 파일로 저장')
+    parser.add_argument('--check', action='store_true', help='기준값 대비 회귀가 있으면 종료 코드 1')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='허용 오차 비율 (기본값: 0.25 = 처리량 25%% 감소 / 메모리 25%% 증가까지 허용)')
+    args = parser.parse_args()
+
+    print(f"📊 피드 {args.feeds}개 × 항목 {args.items}개, 중복 {args.dup_ratio:.0%}, "
+          f"스팸 {args.spam_ratio:.0%}, 기존 게시물 {args.existing:,}개, 저장소 {args.store}")
+
+    results = run_benchmarks(args)
+
+    print("\n" + "=" * 72)
+    print(f"{'단계':<26}{'ops/s':>14}{'최대 메모리(KiB)':>18}{'DB 왕복':>10}")
+    print("-" * 72)
+    for name, r in results.items():
+        trips = r.get('db_round_trips', '')
+        print(f"{name:<26}{r['ops_per_sec']:>14,.0f}{r['peak_kib']:>18,.1f}{trips:>10}")
+    print("=" * 72)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'workload': workload(args), 'stages': results}, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 기준값 저장: {args.baseline}")
+
+    if args.check:
+        try:
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            # 기준값은 머신마다 달라 저장소에 두지 않으므로, 처음 실행한 머신에서는 비교할 대상이 없음
+            print(f"\n⏭️  기준값 파일이 없어 회귀 검사를 건너뜁니다: {args.baseline} (--save-baseline으로 먼저 저장)")
+            return
+        except (OSError, ValueError) as e:
+            print(f"\n❌ 기준값 파일을 읽을 수 없습니다: {args.baseline} ({e})")
+            sys.exit(2)
+
+        if baseline.get('workload') != workload(args):
+            print("\n❌ 기준값과 측정 옵션이 다릅니다. 같은 옵션으로 실행하거나 기준값을 다시 저장하세요.")
+            sys.exit(2)
+
+        regressions = check_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 성능 회귀 {len(regressions)}건 (허용 오차 {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   - {line}")
+            sys.exit(1)
+        print(f"\n✅ 기준값 대비 회귀 없음 (허용 오차 {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+crawler.py 콜드 스타트(import) 시간 측정
+
+사용법:
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 20 --top 15
+
+새 파이썬 프로세스에서 `import crawler`만 실행해 걸린 시간을 재고(최솟값 / 중앙값),
+`-X importtime` 결과에서 누적 시간이 큰 모듈을 보여줍니다.
+SUPABASE_URL / SUPABASE_KEY를 지운 환경에서 실행하므로, 인증 정보 없이 import되는지도 함께 확인합니다.
+import 시점에 불러오면 안 되는 무거운 패키지(supabase, feedparser, requests, httpx)가 로드되면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('supabase', 'feedparser', 'requests', 'httpx', 'numpy', 'scipy')
+
+TIMED_IMPORT = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import crawler\n"
+    "elapsed = time.perf_counter() - start\n"
+    f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+    "print(elapsed, ','.join(loaded))\n"
+)
+
+
+def clean_env() -> dict:
+    env = dict(os.environ)
+    for name in ('SUPABASE_URL', 'SUPABASE_KEY'):
+        env.pop(name, None)
+    env['PYTHONPATH'] = REPO_DIR
+    return env
+
+
+def timed_import():
+    """새 프로세스에서 crawler를 import하고 (초, 로드된 무거운 모듈 목록)을 반환합니다."""
+    result = subprocess.run([sys.executable, '-c', TIMED_IMPORT], cwd=REPO_DIR, env=clean_env(),
+                            capture_output=True, text=True, check=True)
+    seconds, _, loaded = result.stdout.strip().partition(' ')
+    return float(seconds), [m for m in loaded.split(',') if m]
+
+
+def import_profile(top: int) -> list:
+    """-X importtime 결과 중 crawler가 직접 import한 모듈을 누적 시간 순으로 반환합니다."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import crawler'], cwd=REPO_DIR,
+                            env=clean_env(), capture_output=True, text=True, check=True)
+    # 출력은 자식 모듈이 부모보다 먼저 나오므로, 최상위 'crawler' 줄 직전까지 모은 깊이 1 모듈이 직접 import한 모듈
+    rows = []
+    children = []
+    for line in result.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <들여쓰기로 깊이를 표시한 모듈 이름>"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        parts = line.split('|')
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = int(parts[0].split(':')[1]), int(parts[1]), parts[2]
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children.append((cumulative_us, self_us, name.strip()))
+        elif depth == 0:
+            if name.strip() == 'crawler':
+                rows = children + [(cumulative_us, self_us, 'crawler')]
+            children = []
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=10, help='측정 횟수 (기본값: 10)')
+    parser.add_argument('--top', type=int, default=10, help='표시할 모듈 수 (기본값: 10)')
+    args = parser.parse_args()
+
+    timings = []
+    loaded = []
+    for _ in range(args.runs):
+        seconds, loaded = timed_import()
+        timings.append(seconds)
+
+    print(f"🚀 import crawler ({args.runs}회, 인증 정보 없음)")
+    print(f"   최솟값 {min(timings) * 1000:.1f} ms / 중앙값 {statistics.median(timings) * 1000:.1f} ms")
+
+    print(f"\n📦 누적 import 시간 상위 {args.top}개 (-X importtime)")
+    for cumulative_us, self_us, name in import_profile(args.top):
+        print(f"   {cumulative_us / 1000:>8.1f} ms  {name}")
+
+    if loaded:
+        print(f"\n❌ import 시점에 무거운 모듈이 로드되었습니다: {', '.join(loaded)}")
+        sys.exit(1)
+    print(f"\n✅ {', '.join(HEAVY_MODULES)}는 처음 필요할 때 로드됩니다")
+
+
+if __name__ == "__main__":
+    main()
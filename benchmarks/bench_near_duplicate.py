@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+유사 제목 검사 벤치마크: 기존 선형 SequenceMatcher 스캔 vs NearDuplicateIndex
+
+사용법:
+    python benchmarks/bench_near_duplicate.py
+    python benchmarks/bench_near_duplicate.py --window 30000 --queries 500
+
+합성 한국어 게임 뉴스 제목으로 윈도우를 만들고, 일부는 기존 제목을 살짝 바꾼
+유사 제목으로 질의합니다. 두 방식의 질의당 소요 시간과, 선형 스캔(0.8 기준) 결과 대비
+인덱스의 재현율 / 정밀도를 출력합니다.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.near_duplicate import (  # noqa: E402
+    NearDuplicateIndex, TitleSignatureCache, normalize_title, similarity_ratio,
+)
+
+SUBJECTS = [
+    '넥슨', '엔씨소프트', '크래프톤', '펄어비스', '넷마블', '컴투스', '스마일게이트',
+    '카카오게임즈', '위메이드', '네오위즈', '시프트업', '데브시스터즈', '그라비티', '웹젠',
+]
+OBJECTS = [
+    '신작 MMORPG', '모바일 RPG', '배틀로얄 신작', '언리얼엔진5 프로젝트', '인디게임 지원 사업',
+    '글로벌 퍼블리싱', '3분기 실적', '4분기 실적', '신규 IP', 'PC 온라인 게임', '콘솔 신작',
+    'AI 개발 도구', '게임 개발자 컨퍼런스', 'e스포츠 대회', '클라우드 게임 서비스',
+]
+ACTIONS = [
+    '공개', '출시', '발표', '사전예약 시작', '글로벌 출시', '업데이트 예고', '쇼케이스 개최',
+    '테스트 모집', '흥행 돌풍', '매출 상승', '영업이익 감소', '투자 유치', '파트너십 체결',
+]
+EXTRAS = ['', '', '', '…기대감 ↑', '"역대 최대"', '올해 하반기', '내년 상반기', '국내 최초', '첫 공개']
+
+
+def make_title(rng: random.Random) -> str:
+    parts = [
+        f"{rng.choice(SUBJECTS)},",
+        rng.choice(OBJECTS),
+        rng.choice(ACTIONS),
+        rng.choice(EXTRAS),
+        str(rng.randint(1, 9999)),
+    ]
+    return ' '.join(p for p in parts if p)
+
+
+def mutate_title(title: str, rng: random.Random) -> str:
+    """언론사마다 다르게 쓰는 정도의 작은 변형을 만듭니다."""
+    words = title.split()
+    choice = rng.random()
+    if choice < 0.3:
+        words.append(rng.choice(['[종합]', '(종합)', '단독', '속보']))
+    elif choice < 0.6 and len(words) > 3:
+        del words[rng.randrange(len(words))]
+    elif choice < 0.8:
+        words = [w.replace(',', '') for w in words]
+    else:
+        words.insert(0, rng.choice(['[게임]', '[IT]']))
+    return ' '.join(words)
+
+
+def linear_find(title: str, titles: list, threshold: float):
+    normalized = normalize_title(title)
+    for existing in titles:
+        score = similarity_ratio(normalized, normalize_title(existing))
+        if score >= threshold:
+            return existing, score
+    return None, 0.0
+
+
+def exact_has_similar(title: str, normalized_window: list, threshold: float) -> bool:
+    """
+    선형 스캔과 같은 결과를 내되, 상한값(quick_ratio)으로 불필요한 ratio() 계산을 건너뜁니다.
+    상한값은 인자 순서와 무관하지만 ratio()는 순서에 따라 달라지므로, 남은 후보는 선형 스캔과 같은 순서
+    (질의, 기존 제목)로 계산합니다.
+    """
+    normalized = normalize_title(title)
+    matcher = SequenceMatcher()
+    matcher.set_seq2(normalized)
+    for existing in normalized_window:
+        matcher.set_seq1(existing)
+        if matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold \
+                and similarity_ratio(normalized, existing) >= threshold:
+            return True
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--window', type=int, default=30000, help='윈도우 제목 수 (기본값: 30000)')
+    parser.add_argument('--queries', type=int, default=300, help='질의 수 (기본값: 300)')
+    parser.add_argument('--dup-ratio', type=float, default=0.3, help='유사 제목 질의 비율 (기본값: 0.3)')
+    parser.add_argument('--linear-queries', type=int, default=30,
+                        help='선형 스캔은 느리므로 시간 측정에 사용할 질의 수 (기본값: 30)')
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    window = [make_title(rng) for _ in range(args.window)]
+    normalized_window = [normalize_title(t) for t in window]
+
+    queries = []
+    for _ in range(args.queries):
+        if rng.random() < args.dup_ratio:
+            queries.append(mutate_title(rng.choice(window), rng))
+        else:
+            queries.append(make_title(rng))
+
+    print(f"📊 윈도우 {len(window):,}개, 질의 {len(queries):,}개 (유사 비율 {args.dup_ratio:.0%})")
+
+    # 인덱스 구축
+    start = time.perf_counter()
+    index = NearDuplicateIndex(threshold=args.threshold)
+    index.extend(window)
+    build_seconds = time.perf_counter() - start
+    print(f"🏗️  인덱스 구축: {build_seconds:.2f}초 ({build_seconds / len(window) * 1e6:.0f}µs/제목)")
+
+    # 서명 캐시(TitleSignatureCache)에 저장된 밴드 키로 다시 구축 (다음 실행의 load_recent_titles)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TitleSignatureCache(os.path.join(tmp, 'title_signatures.sqlite'))
+        NearDuplicateIndex(threshold=args.threshold, cache=cache).extend(window)
+        cache.commit()
+        start = time.perf_counter()
+        NearDuplicateIndex(threshold=args.threshold, cache=cache).extend(window)
+        cached_seconds = time.perf_counter() - start
+        cache.close()
+    print(f"🗂️  저장된 서명으로 구축: {cached_seconds:.2f}초 ({cached_seconds / len(window) * 1e6:.0f}µs/제목)")
+
+    # 인덱스 질의
+    start = time.perf_counter()
+    index_results = [index.find_similar(q) for q in queries]
+    index_seconds = time.perf_counter() - start
+    candidate_counts = [len(index.candidates(q)) for q in queries]
+
+    # 선형 스캔 (기존 동작) - 정답 기준
+    linear_queries = queries[:args.linear_queries]
+    start = time.perf_counter()
+    for q in linear_queries:
+        linear_find(q, window, args.threshold)
+    linear_seconds = time.perf_counter() - start
+
+    # 재현율 / 정밀도: "threshold 이상 유사한 제목이 하나라도 있는가"를 선형 스캔과 비교
+    # (정답 계산은 SequenceMatcher의 상한값으로 가지치기한 전체 스캔이라 결과는 선형 스캔과 동일)
+    true_pos = false_pos = false_neg = 0
+    for q, (found, _) in zip(queries, index_results):
+        expected = exact_has_similar(q, normalized_window, args.threshold)
+        if found is not None and expected:
+            true_pos += 1
+        elif found is not None:
+            false_pos += 1
+        elif expected:
+            false_neg += 1
+
+    index_ms = index_seconds / len(queries) * 1000
+    linear_ms = linear_seconds / max(len(linear_queries), 1) * 1000
+    recall = true_pos / (true_pos + false_neg) if (true_pos + false_neg) else 1.0
+    precision = true_pos / (true_pos + false_pos) if (true_pos + false_pos) else 1.0
+
+    print("\n" + "=" * 50)
+    print(f"선형 스캔 (SequenceMatcher, {args.threshold}): {linear_ms:.2f} ms/질의")
+    print(f"NearDuplicateIndex:                 {index_ms:.3f} ms/질의")
+    print(f"속도 향상:                           {linear_ms / index_ms:.0f}x")
+    print(f"평균 후보 수:                        {sum(candidate_counts) / len(candidate_counts):.1f}")
+    print(f"재현율 (선형 스캔 대비):             {recall:.1%}")
+    print(f"정밀도 (선형 스캔 대비):             {precision:.1%}")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
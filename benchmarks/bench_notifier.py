@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Discord 알림 큐(gamenews/notifier.py) 검증 + 벤치마크
+
+사용법:
+    python benchmarks/bench_notifier.py
+    python benchmarks/bench_notifier.py --events 500 --seconds 5 --window 0.1 --latency 100
+
+로컬 HTTP 서버를 Discord 웹훅 대신 띄웁니다. 서버는 Discord처럼 2초에 5개까지만 받고
+X-RateLimit-Remaining / X-RateLimit-Reset-After 헤더를 돌려주며, 넘치면 429와 retry_after를 돌려줍니다.
+크롤링 결과 이벤트 --events개를 --seconds초 동안 나눠 보내며 두 방식을 비교합니다.
+
+    - 동기 전송: 이벤트마다 바로 POST (이전 send_discord_notification, 429는 그대로 실패)
+    - 알림 큐: DiscordNotifier.notify() (백그라운드에서 --window초씩 묶어 전송)
+
+확인하는 것:
+    - 알림 큐가 모든 이벤트를 잃지 않고 전달하는지 (받은 임베드의 새 기사 수 합계로 확인)
+    - 429를 받은 뒤 retry_after가 지나기 전에 다시 보내지 않는지
+    - 웹훅이 응답하지 않아도 close(timeout)이 기한 안에 반환되는지
+하나라도 어긋나면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.http import get_session  # noqa: E402
+from gamenews.notifier import DiscordNotifier, build_embed, NotifyEvent  # noqa: E402
+
+BUCKET_LIMIT = 5            # Discord 웹훅: 2초에 5개
+BUCKET_SECONDS = 2.0
+
+
+def serve_webhook(latency: float):
+    """
+    Discord 웹훅 대역. server.added에 받은 임베드의 새 기사 수 합계를, server.events에 이벤트 수를 셉니다.
+    429를 보낸 뒤 retry_after가 지나기 전에 들어온 요청은 server.violations로 셉니다.
+    """
+    lock = threading.Lock()
+    state = {'window_start': time.monotonic(), 'used': 0, 'blocked_until': 0.0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(server.latency)
+
+            with lock:
+                now = time.monotonic()
+                server.requests += 1
+                if now < state['blocked_until']:
+                    server.violations += 1
+                if now - state['window_start'] >= BUCKET_SECONDS:
+                    state['window_start'], state['used'] = now, 0
+                reset_after = max(0.0, state['window_start'] + BUCKET_SECONDS - now)
+
+                if state['used'] >= BUCKET_LIMIT:
+                    server.rate_limited += 1
+                    state['blocked_until'] = now + reset_after
+                    return self.reply(429, {'message': 'You are being rate limited.',
+                                            'retry_after': round(reset_after, 3), 'global': False},
+                                      reset_after, 0)
+
+                state['used'] += 1
+                remaining = BUCKET_LIMIT - state['used']
+                embed = json.loads(body)['embeds'][0]
+                fields = {field['name']: field['value'] for field in embed['fields']}
+                server.messages += 1
+                server.added += int(re.sub(r'\D', '', fields.get('✅ 새 기사', '0')) or 0)
+                server.events += int(re.sub(r'\D', '', fields.get('🔁 실행 횟수', '1')))
+
+            self.reply(204, None, reset_after, remaining)
+
+        def reply(self, status: int, payload, reset_after: float, remaining: int):
+            data = json.dumps(payload).encode('utf-8') if payload is not None else b''
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.send_header('X-RateLimit-Limit', str(BUCKET_LIMIT))
+            self.send_header('X-RateLimit-Remaining', str(remaining))
+            self.send_header('X-RateLimit-Reset-After', f'{reset_after:.3f}')
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.handle_error = lambda request, client_address: None
+    server.latency = latency
+    server.requests = server.messages = server.rate_limited = server.violations = 0
+    server.added = server.events = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def reset(server):
+    server.requests = server.messages = server.rate_limited = server.violations = 0
+    server.added = server.events = 0
+
+
+def make_stats(i: int) -> dict:
+    return {'added': i % 7, 'skipped': 3, 'spam': 1, 'total_processed': i % 7 + 3, 'total_tags': 2,
+            'top_tags': ['Unity', 'Nintendo'][:i % 3], 'duration': 0.5,
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+
+def fire(events: int, seconds: float, send) -> list:
+    """events개 이벤트를 seconds초에 걸쳐 send(stats)로 보내고, 호출마다 막힌 시간을 반환합니다."""
+    blocked = []
+    interval = seconds / events
+    start = time.monotonic()
+    for i in range(events):
+        delay = start + i * interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        t0 = time.perf_counter()
+        send(make_stats(i))
+        blocked.append(time.perf_counter() - t0)
+    return blocked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=300, help='보낼 이벤트 수 (기본값: 300)')
+    parser.add_argument('--seconds', type=float, default=3.0, help='이벤트를 나눠 보낼 시간 (기본값: 3초)')
+    parser.add_argument('--window', type=float, default=0.2, help='알림 큐의 묶는 시간 (기본값: 0.2초)')
+    parser.add_argument('--latency', type=float, default=50, help='웹훅 응답 지연 ms (기본값: 50)')
+    args = parser.parse_args()
+
+    server = serve_webhook(args.latency / 1000)
+    url = f'http://127.0.0.1:{server.server_address[1]}/api/webhooks/1/token'
+    expected_added = sum(make_stats(i)['added'] for i in range(args.events))
+    failures = []
+    results = {}
+
+    try:
+        # 이전 방식: 이벤트마다 동기 POST
+        session = get_session()
+
+        def send_sync(stats):
+            try:
+                session.post(url, json={'embeds': [build_embed([NotifyEvent(stats)])]}, timeout=10)
+            except Exception:
+                pass
+
+        blocked = fire(args.events, args.seconds, send_sync)
+        results['동기 전송'] = (blocked, server.messages, server.events, server.added, server.rate_limited, 0.0)
+        time.sleep(BUCKET_SECONDS)
+        reset(server)
+
+        # 알림 큐
+        notifier = DiscordNotifier(url, window=args.window)
+        start = time.monotonic()
+        blocked = fire(args.events, args.seconds, notifier.notify)
+        delivered_all = notifier.close(timeout=30)
+        flush_seconds = time.monotonic() - start - args.seconds
+        results['알림 큐'] = (blocked, server.messages, server.events, server.added, server.rate_limited,
+                            flush_seconds)
+
+        if not delivered_all or server.events != args.events or server.added != expected_added:
+            failures.append(f"알림 큐가 이벤트를 잃었습니다: 전달 {server.events}/{args.events}개, "
+                            f"새 기사 합계 {server.added}/{expected_added}")
+        if server.violations:
+            failures.append(f"429 retry_after가 지나기 전에 {server.violations}번 다시 보냈습니다")
+
+        # 웹훅이 응답하지 않을 때 종료 기한
+        time.sleep(BUCKET_SECONDS)
+        server.latency = 5.0
+        notifier = DiscordNotifier(url, window=60)
+        notifier.notify(make_stats(1))
+        start = time.monotonic()
+        notifier.close(timeout=1.0)
+        close_seconds = time.monotonic() - start
+        if close_seconds > 1.5:
+            failures.append(f"close(timeout=1)이 {close_seconds:.2f}초 걸렸습니다")
+    finally:
+        server.shutdown()
+
+    print(f"📨 이벤트 {args.events}개 / {args.seconds:.0f}초, 웹훅 {BUCKET_LIMIT}개/{BUCKET_SECONDS:.0f}초 제한, "
+          f"응답 지연 {args.latency:.0f} ms, 묶는 시간 {args.window}초")
+    print("=" * 84)
+    print(f"{'방식':<12}{'호출 최대(ms)':>14}{'호출 합계(ms)':>14}{'메시지':>8}{'전달 이벤트':>12}"
+          f"{'429':>6}{'종료 후 전송(s)':>16}")
+    print("-" * 84)
+    for name, (blocked, messages, events, _, rate_limited, flush) in results.items():
+        print(f"{name:<12}{max(blocked) * 1000:>14,.2f}{sum(blocked) * 1000:>14,.1f}{messages:>8}"
+              f"{events:>12}{rate_limited:>6}{flush:>16.2f}")
+    print("=" * 84)
+    print(f"응답 없는 웹훅에서 close(timeout=1): {close_seconds:.2f}초")
+
+    if failures:
+        print(f"\n❌ 검증 실패 {len(failures)}건")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print("\n✅ 알림 큐가 모든 이벤트를 전달했고, retry_after와 종료 기한을 지켰습니다")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Supabase 요청 스케줄러(gamenews/ratelimit.py) 검증 + 벤치마크
+
+사용법:
+    python benchmarks/bench_ratelimit.py
+    python benchmarks/bench_ratelimit.py --server-rate 30 --writers 16 --batches 400
+
+로컬 HTTP 서버를 PostgREST 대신 띄웁니다. 서버는 초당 --server-rate개까지만 요청을 받고
+넘치면 429(Retry-After: 1)를, 일부 요청에는 무작위로 503을 돌려줍니다.
+--writers개 스레드가 실제 Supabase 클라이언트로 posts에 배치 upsert를 보내며, 두 방식을 비교합니다.
+
+    - 스케줄러 없음: execute()를 그대로 호출 (이전 crawler / 스크립트 동작, 실패한 배치는 버려짐)
+    - 재시도만: 지수 백오프로 최대 5번 재시도 (이전 restore_archive.py 동작, 속도 조절 없음)
+    - 스케줄러: RequestScheduler.execute() (토큰 버킷 AIMD + 재시도 + 서킷 브레이커)
+
+마지막으로 서버가 모든 요청에 503을 돌려줄 때 서킷 브레이커가 열려 요청을 멈추고,
+서버가 회복되면 다시 닫히는지 확인합니다. 스케줄러가 배치를 하나라도 잃거나, 처리량이 서버 한도의
+--min-efficiency(기본값: 85%)에 못 미치거나, 브레이커가 기대대로 동작하지 않으면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.clients import create_supabase_client  # noqa: E402
+from gamenews.ratelimit import CircuitBreaker, CircuitOpenError, RequestScheduler  # noqa: E402
+
+
+def serve_postgrest(server_rate: float, error_rate: float, seed: int):
+    """
+    posts upsert를 받는 로컬 서버. 초당 server_rate개(최대 server_rate/5개 몰아서)를 넘으면 429를 돌려줍니다.
+    server.rows에 original_link별로 저장하고, server.down이 True면 모든 요청에 503을 돌려줍니다.
+    """
+    lock = threading.Lock()
+    rng = random.Random(seed)
+    burst = max(1.0, server_rate / 5)
+    bucket = {'tokens': burst, 'at': time.monotonic()}
+
+    def admit() -> bool:
+        with lock:
+            now = time.monotonic()
+            bucket['tokens'] = min(burst, bucket['tokens'] + (now - bucket['at']) * server_rate)
+            bucket['at'] = now
+            if bucket['tokens'] >= 1:
+                bucket['tokens'] -= 1
+                return True
+            return False
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            with lock:
+                server.hits += 1
+                unlucky = rng.random() < error_rate
+
+            if server.down or unlucky:
+                return self.reply(503, {'message': 'Service Unavailable'})
+            if not admit():
+                with lock:
+                    server.throttled += 1
+                return self.reply(429, {'message': 'Too Many Requests'}, {'Retry-After': '1'})
+
+            rows = json.loads(body)
+            with lock:
+                for row in rows:
+                    server.rows[row['original_link']] = row
+            self.reply(201, rows)
+
+        def reply(self, status: int, payload, headers: dict = None):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.handle_error = lambda request, client_address: None  # 클라이언트가 끊은 연결 로그 생략
+    server.hits = 0
+    server.throttled = 0
+    server.rows = {}
+    server.down = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_batches(count: int, size: int) -> list:
+    return [
+        [{'title': f'기사 {b}-{i}', 'original_link': f'https://news.example/{b}/{i}'} for i in range(size)]
+        for b in range(count)
+    ]
+
+
+def execute_with_backoff(query, retries: int = 5):
+    """속도 조절 없이 지수 백오프(+지터)로만 재시도 (Retry-After 무시)"""
+    for attempt in range(retries + 1):
+        try:
+            return query.execute()
+        except Exception:
+            if attempt == retries:
+                raise
+            delay = min(30.0, 1.0 * 2 ** attempt)
+            time.sleep(random.uniform(delay / 2, delay))
+
+
+def run_writes(server, supabase, batches: list, writers: int, execute) -> dict:
+    """batches를 writers개 스레드가 execute(query)로 upsert하고 결과를 반환합니다."""
+    server.rows.clear()
+    hits_before, throttled_before = server.hits, server.throttled
+
+    def write(batch):
+        try:
+            execute(supabase.table('posts').upsert(batch, on_conflict='original_link'))
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=writers) as executor:
+        results = list(executor.map(write, batches))
+    seconds = time.perf_counter() - start
+
+    return {
+        'seconds': seconds,
+        'lost': results.count(False),
+        'stored': len(server.rows),
+        'requests': server.hits - hits_before,
+        'throttled': server.throttled - throttled_before,
+    }
+
+
+def check_breaker(server, supabase, failures: int, reset_seconds: float) -> list:
+    """서버가 내려가면 브레이커가 열려 요청을 멈추고, 회복되면 다시 닫히는지 확인합니다."""
+    problems = []
+    breaker = CircuitBreaker(failure_threshold=failures, reset_seconds=reset_seconds)
+    scheduler = RequestScheduler(max_retries=failures * 2, breaker=breaker, sleep=lambda seconds: None)
+    batch = make_batches(1, 1)[0]
+
+    server.down = True
+    hits_before = server.hits
+    try:
+        scheduler.execute(supabase.table('posts').upsert(batch, on_conflict='original_link'))
+        problems.append('서버가 내려갔는데 요청이 성공했습니다')
+    except CircuitOpenError:
+        pass
+    except Exception as e:
+        problems.append(f'CircuitOpenError 대신 {type(e).__name__}가 발생했습니다')
+
+    sent = server.hits - hits_before
+    if sent != failures:
+        problems.append(f'브레이커가 열리기까지 요청 {sent}번 (예상: {failures}번)')
+
+    # 열려 있는 동안에는 요청을 보내지 않음
+    hits_before = server.hits
+    try:
+        scheduler.execute(supabase.table('posts').upsert(batch, on_conflict='original_link'))
+    except CircuitOpenError:
+        pass
+    if server.hits != hits_before:
+        problems.append('브레이커가 열려 있는데 요청을 보냈습니다')
+
+    # 회복 후 reset_seconds가 지나면 요청 하나로 확인하고 닫힘
+    server.down = False
+    time.sleep(reset_seconds)
+    try:
+        scheduler.execute(supabase.table('posts').upsert(batch, on_conflict='original_link'))
+    except Exception as e:
+        problems.append(f'서버 회복 후에도 요청이 실패했습니다: {e}')
+    if breaker.state != 'closed':
+        problems.append(f'서버 회복 후 브레이커 상태가 {breaker.state}입니다')
+
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--server-rate', type=float, default=50, help='서버가 받는 초당 요청 수 (기본값: 50)')
+    parser.add_argument('--error-rate', type=float, default=0.02, help='무작위 503 비율 (기본값: 0.02)')
+    parser.add_argument('--writers', type=int, default=8, help='동시에 쓰는 스레드 수 (기본값: 8)')
+    parser.add_argument('--batches', type=int, default=400, help='upsert할 배치 수 (기본값: 400)')
+    parser.add_argument('--batch-size', type=int, default=20, help='배치당 행 수 (기본값: 20)')
+    parser.add_argument('--min-efficiency', type=float, default=0.85,
+                        help='스케줄러 처리량(배치/s)의 최소 기준, 서버 한도 대비 (기본값: 0.85)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    server = serve_postgrest(args.server_rate, args.error_rate, args.seed)
+    supabase = create_supabase_client(f'http://127.0.0.1:{server.server_address[1]}', 'bench-key')
+    batches = make_batches(args.batches, args.batch_size)
+    expected_rows = args.batches * args.batch_size
+    failures = []
+
+    try:
+        naive = run_writes(server, supabase, batches, args.writers, lambda query: query.execute())
+        time.sleep(1)
+        backoff = run_writes(server, supabase, batches, args.writers, execute_with_backoff)
+        time.sleep(1)
+        scheduler = RequestScheduler(concurrency=args.writers)
+        scheduled = run_writes(server, supabase, batches, args.writers, scheduler.execute)
+
+        if scheduled['lost'] or scheduled['stored'] != expected_rows:
+            failures.append(f"스케줄러 사용 시 배치 {scheduled['lost']}개 유실, "
+                            f"저장된 행 {scheduled['stored']}/{expected_rows}개")
+        scheduled_rate = (args.batches - scheduled['lost']) / scheduled['seconds']
+        if scheduled_rate < args.server_rate * args.min_efficiency:
+            failures.append(f"스케줄러 처리량 {scheduled_rate:.1f}배치/s가 서버 한도의 "
+                            f"{args.min_efficiency:.0%}({args.server_rate * args.min_efficiency:.1f})보다 낮습니다")
+
+        failures.extend(check_breaker(server, supabase, failures=3, reset_seconds=0.5))
+    finally:
+        server.shutdown()
+
+    print(f"✍️  배치 {args.batches}개 × {args.batch_size}행, 스레드 {args.writers}개, "
+          f"서버 한도 {args.server_rate:.0f}회/초, 무작위 503 {args.error_rate:.0%}")
+    print("=" * 72)
+    print(f"{'방식':<16}{'배치/s':>10}{'요청':>8}{'429':>8}{'유실 배치':>12}{'저장 행':>12}")
+    print("-" * 72)
+    for name, result in (('스케줄러 없음', naive), ('재시도만', backoff), ('스케줄러', scheduled)):
+        rate = (args.batches - result['lost']) / result['seconds']
+        print(f"{name:<16}{rate:>10,.1f}{result['requests']:>8}{result['throttled']:>8}"
+              f"{result['lost']:>12}{result['stored']:>12}")
+    print("=" * 72)
+    print(f"스케줄러: 재시도 {scheduler.stats['retries']}번, 스로틀링 {scheduler.stats['throttled']}번, "
+          f"마지막 요청 속도 {scheduler.rate:.1f}회/초")
+
+    if failures:
+        print(f"\n❌ 검증 실패 {len(failures)}건")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print(f"\n✅ 스케줄러가 배치를 잃지 않고 서버 한도의 {scheduled_rate / args.server_rate:.0%}로 썼고, "
+          "서킷 브레이커가 열리고 닫혔습니다")
+
+
+if __name__ == "__main__":
+    main()
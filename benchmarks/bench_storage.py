@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+posts 저장소(gamenews/storage.py) 검증 + 부하 테스트
+
+사용법:
+    python benchmarks/bench_storage.py
+    python benchmarks/bench_storage.py --rows 200000 --days 180
+
+같은 합성 게시물(--rows개, 최근 --days일에 고르게 분포)로 두 저장소에 크롤러 / 스크립트와 같은 작업을 순서대로 실행합니다.
+
+    memory: Supabase 저장소 + 메모리 기반 대역(gamenews/memory_db.py), 실제와 같은 쿼리와 DB 왕복 수
+    sqlite: 임시 디렉토리의 SQLite 파일
+
+    1. insert_posts    INSERT_BATCH_SIZE(500)개씩 일괄 저장
+    2. existing_links  크롤러처럼 100개씩 정확한 일치 확인 (절반은 있는 링크)
+    3. recent_rows     최근 30일 제목 (유사도 인덱스 적재)
+    4. iter_pages      전체 (created_at, id) 키셋 순회
+    5. update_tags     500개씩 태그 갱신
+    6. delete_before   절반 기간보다 오래된 행을 1000개씩 삭제
+
+단계별 처리량(행/초)과 DB 왕복 수를 출력하고, 두 저장소의 단계별 결과(개수, 남은 행)가 다르면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.memory_db import MemorySupabase  # noqa: E402
+from gamenews.metrics import Metrics  # noqa: E402
+from gamenews.ratelimit import RequestScheduler  # noqa: E402
+from gamenews.storage import SqlitePostStore, SupabasePostStore  # noqa: E402
+
+INSERT_BATCH_SIZE = 500     # 크롤러의 INSERT_BATCH_SIZE
+EXISTS_CHUNK_SIZE = 100     # 크롤러의 EXISTS_CHUNK_SIZE
+UPDATE_BATCH_SIZE = 500     # scripts/backfill_tags.py
+DELETE_BATCH_SIZE = 1000    # scripts/cleanup_old_posts.py
+TAGS = ['넥슨', '엔씨소프트', '크래프톤', '넷마블', 'Unity', '언리얼', 'RPG', '모바일']
+
+
+def build_rows(count: int, days: int, rng: random.Random) -> list:
+    now = datetime.now(timezone.utc)
+    step = timedelta(days=days) / max(count, 1)
+    return [
+        {
+            'id': f'{i:08x}-0000-4000-8000-000000000000',
+            'title': f"{rng.choice(TAGS)} 신작 {rng.randint(1, 10**6)} 공개",
+            'summary': '게임 업계 소식 요약 ' * rng.randint(1, 10),
+            'original_link': f'https://news.example.com/{i}',
+            'category': rng.choice(['Industry', 'Dev']),
+            'tags': rng.sample(TAGS, rng.randint(0, 3)),
+            'created_at': (now - step * i).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def run_workload(store, rows: list, days: int, rng: random.Random) -> tuple:
+    """
+    작업을 순서대로 실행하고 ({단계: (처리 행 수, 초, DB 왕복 수)}, {단계: 결과})를 반환합니다.
+    결과는 두 저장소가 같아야 하는 값입니다.
+    """
+    now = datetime.now(timezone.utc)
+    timings = {}
+    results = {}
+
+    def stage(name, count, fn):
+        trips = store.metrics.counters.get('db_round_trips', 0)
+        start = time.perf_counter()
+        results[name] = fn()
+        timings[name] = (count, time.perf_counter() - start, store.metrics.counters.get('db_round_trips', 0) - trips)
+
+    stage('insert_posts', len(rows), lambda: sum(
+        len(store.insert_posts(rows[i:i + INSERT_BATCH_SIZE])) for i in range(0, len(rows), INSERT_BATCH_SIZE)))
+
+    probes = [row['original_link'] for row in rng.sample(rows, min(len(rows), 5000))]
+    probes += [f'https://news.example.com/missing/{i}' for i in range(len(probes))]
+    rng.shuffle(probes)
+    stage('existing_links', len(probes), lambda: sum(
+        len(store.existing_links(probes[i:i + EXISTS_CHUNK_SIZE])) for i in range(0, len(probes), EXISTS_CHUNK_SIZE)))
+
+    since = now - timedelta(days=min(30, days))
+    recent = store.recent_rows('title', since)
+    stage('recent_rows', len(recent), lambda: len(store.recent_rows('title', since)))
+
+    stage('iter_pages', len(rows), lambda: sum(len(page) for page in store.iter_pages('id, created_at, tags')))
+
+    updates = [{'id': row['id'], 'tags': list(reversed(row['tags']))} for row in rng.sample(rows, len(rows) // 2)]
+    stage('update_tags', len(updates), lambda: sum(
+        store.update_tags(updates[i:i + UPDATE_BATCH_SIZE]) for i in range(0, len(updates), UPDATE_BATCH_SIZE)))
+
+    cutoff = now - timedelta(days=days / 2)
+
+    def delete_old():
+        total = 0
+        while True:
+            deleted = store.delete_before(cutoff, DELETE_BATCH_SIZE)
+            total += deleted
+            if deleted < DELETE_BATCH_SIZE:
+                return total
+
+    doomed = sum(1 for row in rows if datetime.fromisoformat(row['created_at']) < cutoff)
+    stage('delete_before', doomed, delete_old)
+    results['remaining'] = store.count_posts()[0]
+    return timings, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000, help='게시물 수 (기본값: 50000)')
+    parser.add_argument('--days', type=int, default=90, help='게시물이 퍼진 기간(일) (기본값: 90)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드 (기본값: 42)')
+    args = parser.parse_args()
+
+    rows = build_rows(args.rows, args.days, random.Random(args.seed))
+    state_dir = tempfile.mkdtemp(prefix='gamenews-storage-')
+    stores = {
+        'memory': lambda: SupabasePostStore(
+            MemorySupabase({'posts': []}), metrics=Metrics(),
+            # 메모리 대역에는 요청 속도 제한이 필요 없으므로 버킷을 사실상 무한하게 둠
+            scheduler=RequestScheduler(rate=1e9, max_rate=1e9),
+        ),
+        'sqlite': lambda: SqlitePostStore(os.path.join(state_dir, 'posts.sqlite'), metrics=Metrics()),
+    }
+
+    timings = {}
+    results = {}
+    try:
+        for name, open_store in stores.items():
+            with open_store() as store:
+                timings[name], results[name] = run_workload(store, rows, args.days, random.Random(args.seed))
+        db_bytes = os.path.getsize(os.path.join(state_dir, 'posts.sqlite'))
+    finally:
+        shutil.rmtree(state_dir, ignore_errors=True)
+
+    print(f"🗄️  게시물 {args.rows:,}개 ({args.days}일), SQLite 파일 {db_bytes / 1024 / 1024:,.1f} MB")
+    print("=" * 78)
+    print(f"{'단계':<18}{'행 수':>10}{'memory 행/초':>16}{'왕복':>8}{'sqlite 행/초':>16}{'왕복':>8}")
+    print("-" * 78)
+    for stage in timings['sqlite']:
+        count, memory_seconds, memory_trips = timings['memory'][stage]
+        _, sqlite_seconds, sqlite_trips = timings['sqlite'][stage]
+        print(f"{stage:<18}{count:>10,}{count / max(memory_seconds, 1e-9):>16,.0f}{memory_trips:>8,}"
+              f"{count / max(sqlite_seconds, 1e-9):>16,.0f}{sqlite_trips:>8,}")
+    print("=" * 78)
+
+    mismatches = [
+        f"{key}: memory {results['memory'][key]} / sqlite {results['sqlite'][key]}"
+        for key in results['sqlite'] if results['memory'][key] != results['sqlite'][key]
+    ]
+    if mismatches:
+        print(f"\n❌ 저장소 결과가 다릅니다 ({len(mismatches)}건)")
+        for line in mismatches:
+            print(f"   {line}")
+        sys.exit(1)
+    print(f"\n✅ 두 저장소의 결과가 같습니다 (남은 행 {results['sqlite']['remaining']:,}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,421 +5,1042 @@ RSS 피드에서 게임 관련 뉴스를 가져와 Supabase의 posts_pending 테
 검수 후 승인되면 posts 테이블로 이동됩니다.
 """
 
+import io
 import os
-import re
-import feedparser
-import requests
-from difflib import SequenceMatcher
-from supabase import create_client, Client
-from datetime import datetime
+import json
+import time
+import shutil
+import signal
+import sqlite3
+import argparse
+import tempfile
+import threading
+import contextlib
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
+from gamenews.canonical import RESOLVED_LINKS_DB, RESOLVE_REDIRECTS, LinkCanonicalizer, ResolvedLinkCache
+from gamenews.feeds import FEED_CURSORS_FILE, FEEDS_FILE, FeedCursorStore, advance_cursor, load_feeds, select_new_entries
+from gamenews.keywords import get_keyword_matcher
+from gamenews.metrics import Metrics
+from gamenews.near_duplicate import TITLE_SIGNATURES_DB, NearDuplicateIndex, TitleSignatureCache, best_match, normalize_title
+from gamenews.pipeline import EMPTY_SUMMARY, PIPELINE_CHUNK_SIZE, Article, CpuPool, bounded_imap, chunked
+from gamenews.polling import AdaptivePoller
+from gamenews.ratelimit import RequestScheduler
+from gamenews.seen_links import SEEN_LINKS_DB, SeenLinkStore
+from gamenews.snapshots import FEED_SNAPSHOT_DIR, SnapshotStore
+from gamenews.storage import is_missing_column, open_post_store
+from gamenews.text import calculate_similarity, clean_summary, clean_title  # noqa: F401
+
 # 환경 변수 로드
 load_dotenv()
 
-# Supabase 클라이언트 초기화
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")  # Optional
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
+# Discord 알림 큐 (get_notifier()를 처음 호출할 때 생성)
+notifier = None
+
+# posts 저장소 (get_post_store()를 처음 호출할 때 생성, STORAGE_BACKEND로 Supabase / SQLite 선택)
+post_store = None
+
+# 피드 동시 요청 수 / 조건부 요청(ETag, Last-Modified) 캐시 파일 경로
+FEED_FETCH_WORKERS = int(os.getenv("FEED_FETCH_WORKERS", "8"))
+FEED_CACHE_FILE = os.getenv("FEED_CACHE_FILE", ".cache/feed_validators.json")
+
+# 유사도 중복 체크에 사용할 최근 제목 범위(일) / 최대 개수 / 기준값
+SIMILARITY_WINDOW_DAYS = int(os.getenv("SIMILARITY_WINDOW_DAYS", "30"))
+RECENT_TITLES_WINDOW = int(os.getenv("RECENT_TITLES_WINDOW", "50000"))
+SIMILARITY_THRESHOLD = 0.8  # 80% 이상 유사하면 중복
+
+# 스토리 묶기(gamenews/clustering.py) 사용 여부 / 비교할 최근 게시물 범위(일) / 최대 개수
+STORY_CLUSTERING = os.getenv("STORY_CLUSTERING", "1") != "0"    # 0이면 cluster_id를 저장하지 않음
+CLUSTER_WINDOW_DAYS = int(os.getenv("CLUSTER_WINDOW_DAYS", "3"))
+CLUSTER_WINDOW_SIZE = int(os.getenv("CLUSTER_WINDOW_SIZE", "20000"))
+
+# 일괄 중복 조회 / 저장 크기 (in_ 조회는 URL 길이 제한을 고려해 나눔)
+EXISTS_CHUNK_SIZE = 100
+INSERT_BATCH_SIZE = 500
+
+# 단계별 시간 / 카운터 (실행마다 초기화). METRICS_FILE이 .prom이면 Prometheus textfile, 그 외에는 JSON
+METRICS_FILE = os.getenv("METRICS_FILE")
+metrics = Metrics()
+
+# Supabase 요청 스케줄러: 토큰 버킷(AIMD) + 동시 요청 수 제한 + 재시도 + 서킷 브레이커 (SUPABASE_RATE 등)
+scheduler = RequestScheduler(metrics=metrics)
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# 데몬 모드(--daemon): 피드별 폴링 간격 범위(초), 최근 제목 인덱스를 DB에서 다시 읽는 주기(분)
+DAEMON_MIN_INTERVAL = int(os.getenv("DAEMON_MIN_INTERVAL", "60"))
+DAEMON_MAX_INTERVAL = int(os.getenv("DAEMON_MAX_INTERVAL", "1800"))
+DAEMON_INITIAL_INTERVAL = int(os.getenv("DAEMON_INITIAL_INTERVAL", "300"))
+DAEMON_REFRESH_MINUTES = int(os.getenv("DAEMON_REFRESH_MINUTES", "60"))
+POLL_STATE_FILE = os.getenv("POLL_STATE_FILE", ".cache/poll_schedule.json")
 
-# RSS 피드 목록 (한국 게임 뉴스만)
-RSS_FEEDS = [
-    # 한국 게임 뉴스 (Google News)
-    {
-        "url": "https://news.google.com/rss/search?q=게임산업+OR+넥슨+OR+엔씨소프트+OR+크래프톤+when:1d&hl=ko&gl=KR&ceid=KR:ko",
-        "category": "Industry",
-        "name": "게임 산업 (Industry)"
-    },
-    {
-        "url": "https://news.google.com/rss/search?q=게임개발+OR+언리얼엔진+OR+인디게임+when:1d&hl=ko&gl=KR&ceid=KR:ko",
-        "category": "Dev",
-        "name": "게임 개발 (Dev)"
-    },
-]
+# RSS 피드 목록 (config/feeds.json, FEEDS_FILE로 다른 파일 지정 가능)
+RSS_FEEDS = load_feeds(FEEDS_FILE)
 
-def clean_title(title: str) -> str:
+def get_post_store():
     """
-    Google News 제목에서 출처(Publisher) 부분을 제거합니다.
-    예: "기사 제목 - 언론사명" -> "기사 제목"
+    posts 저장소(gamenews/storage.py)를 처음 필요할 때 엽니다.
+    STORAGE_BACKEND=supabase(기본값)이면 supabase 패키지 import와 인증 정보 확인도 이때 하므로, clean_title /
+    extract_tags 같은 순수 함수만 쓰는 경우에는 인증 정보 없이 빠르게 import할 수 있습니다.
+    요청은 모두 요청 스케줄러를 거치고, DB 왕복 횟수 / 소요 시간은 db_round_trips / db_query로 기록됩니다.
     """
-    if not title:
-        return ""
+    global post_store
+    if post_store is None:
+        post_store = open_post_store(metrics=metrics, scheduler=scheduler)
+    return post_store
+
+def load_recent_titles(limit: int = RECENT_TITLES_WINDOW,
+                       days: int = SIMILARITY_WINDOW_DAYS,
+                       cache: TitleSignatureCache = None) -> NearDuplicateIndex:
+    """
+    유사도 비교에 사용할 최근 게시물 제목을 실행당 한 번만 불러와 인덱스로 만듭니다.
+    최근 days일 이내의 제목을 최대 limit개까지 페이지 단위로 읽으며,
+    이번 실행에서 추가한 제목도 같은 인덱스에 쌓입니다.
+    
+    cache(서명 캐시)를 주면 저장된 밴드 키를 재사용하므로 지난 실행 이후 새로 저장된 제목만 서명을 계산합니다.
+    """
+    index = NearDuplicateIndex(threshold=SIMILARITY_THRESHOLD, max_size=max(limit, 1), cache=cache)
+    if limit <= 0:
+        return index
     
-    # " - 언론사명" 패턴 제거
-    if " - " in title:
-        parts = title.rsplit(" - ", 1)
-        title = parts[0].strip()
+    since = datetime.now() - timedelta(days=days)
+    titles = [row.get('title') or '' for row in get_post_store().recent_rows('title', since, limit)]
     
-    return title
+    if cache is not None:
+        cache.purge_expired()
+    
+    # 오래된 것부터 넣어 max_size를 넘으면 가장 오래된 제목이 밀려나도록 함
+    index.extend(title for title in reversed(titles) if title)
+    if cache is not None:
+        cache.commit()
+    return index
 
-def clean_summary(text: str, max_length: int = 200) -> str:
-    """요약 텍스트를 정리하고 길이를 제한합니다."""
-    if not text:
-        return ""
+def load_recent_stories(limit: int = CLUSTER_WINDOW_SIZE, days: int = CLUSTER_WINDOW_DAYS):
+    """
+    스토리 묶기에 사용할 최근 게시물(id, 제목, 요약, cluster_id)을 실행당 한 번만 불러와 StoryIndex로 만듭니다.
+    cluster_id가 없는 게시물(마이그레이션 전에 저장된 행)은 자기 id를 cluster_id로 씁니다.
+    스토리 묶기를 껐거나 NumPy / SciPy가 없거나, posts에 cluster_id 열이 없으면
+    (supabase/add_cluster_id.sql 실행 전) None을 반환하고 스토리 묶기 없이 저장합니다.
+    """
+    if not STORY_CLUSTERING:
+        return None
     
-    # HTML 태그 제거
-    text = re.sub(r'<[^>]+>', '', text)
+    # NumPy / SciPy는 import가 무거우므로 스토리 묶기를 쓸 때만 불러옴
+    from gamenews.clustering import CLUSTERING_AVAILABLE, StoryIndex
+    if not CLUSTERING_AVAILABLE:
+        print("⚠️  Story clustering disabled: numpy / scipy are not installed")
+        return None
     
-    # 공백 정리
-    text = ' '.join(text.split())
+    index = StoryIndex(max_size=max(limit, 1))
+    if limit <= 0:
+        return index
     
-    # 길이 제한
-    if len(text) > max_length:
-        text = text[:max_length] + "..."
+    since = datetime.now() - timedelta(days=days)
+    try:
+        rows = get_post_store().recent_rows('id, title, summary, cluster_id', since, limit)
+    except Exception as e:
+        if not is_missing_column(e, 'cluster_id'):
+            raise
+        print("⚠️  Story clustering disabled: posts.cluster_id is missing (run supabase/add_cluster_id.sql)")
+        return None
     
-    return text
+    # 오래된 것부터 넣어 max_size를 넘으면 가장 오래된 게시물이 밀려나도록 함
+    index.extend(
+        (row.get('cluster_id') or row['id'], row.get('title') or '',
+         '' if row.get('summary') == EMPTY_SUMMARY else row.get('summary') or '')
+        for row in reversed(rows)
+    )
+    return index
+
+def find_similar_title(title: str, recent_titles: NearDuplicateIndex,
+                       threshold: float = SIMILARITY_THRESHOLD):
+    """
+    최근 제목 중 threshold 이상 유사한 제목을 찾습니다.
+    네트워크 요청 없이 LSH 인덱스가 돌려준 소수의 후보만 SequenceMatcher로 비교하며,
+    없으면 (None, 0.0)을 반환합니다.
+    """
+    return recent_titles.find_similar(title, threshold)
 
-def calculate_similarity(text1: str, text2: str) -> float:
+def open_seen_links(path: str = SEEN_LINKS_DB) -> SeenLinkStore:
     """
-    두 텍스트의 유사도를 계산합니다 (0.0 ~ 1.0).
-    0.8 이상이면 매우 유사한 것으로 판단합니다.
+    처리한 링크 저장소를 엽니다.
+    파일이 없거나 손상되어 새로 만든 경우 TTL 기간 안의 posts 링크로 다시 채웁니다.
     """
-    if not text1 or not text2:
-        return 0.0
+    store = SeenLinkStore(path)
     
-    # 소문자로 변환하고 공백 정리
-    text1 = ' '.join(text1.lower().split())
-    text2 = ' '.join(text2.lower().split())
+    if store.is_new:
+        print("🗂️  Rebuilding seen-link store from posts...")
+        since = datetime.now() - timedelta(seconds=store.ttl_seconds)
+        rows = get_post_store().recent_rows('original_link, created_at', since)
+        
+        for row in rows:
+            try:
+                seen_at = datetime.fromisoformat(row['created_at']).timestamp()
+            except (TypeError, ValueError):
+                seen_at = None
+            store.add(row['original_link'], seen_at)
+        
+        store.commit()
+        print(f"   {len(rows)}개 링크 복원 완료")
+    else:
+        store.purge_expired()
     
-    # SequenceMatcher로 유사도 계산
-    return SequenceMatcher(None, text1, text2).ratio()
+    return store
+
+def find_existing_links(links: list) -> set:
+    """
+    이미 posts 테이블에 있는 original_link를 한꺼번에 확인합니다.
+    Supabase는 in_ 조회 한 번(링크가 많으면 EXISTS_CHUNK_SIZE씩), SQLite는 original_link 유니크 인덱스를 씁니다.
+    """
+    return get_post_store().existing_links(links)
+
+def insert_posts(rows: list) -> set:
+    """
+    여러 게시물을 한 번에 저장하고, 실제로 추가된 original_link 집합을 반환합니다.
+    이미 있는 링크는 original_link 충돌로 무시되어 결과에 포함되지 않습니다.
+    """
+    return get_post_store().insert_posts(rows)
+
+def match_keywords(text: str):
+    """
+    텍스트를 한 번만 훑어서 (태그 목록, 스팸 키워드 목록)을 함께 반환합니다.
+    키워드는 config/keywords/*.txt에서 읽어 만든 Aho–Corasick 매처를 사용합니다 (처음 호출할 때 한 번만 생성).
+    """
+    return get_keyword_matcher().match(text)
 
 def extract_tags(text: str) -> list:
     """
     텍스트에서 주요 키워드(태그)를 추출합니다.
     회사명, 게임명, 기술 키워드 등을 자동으로 감지합니다.
+    키워드 목록: config/keywords/{companies,games,tech,genres}.txt
     """
     if not text:
         return []
     
-    tags = []
-    text_lower = text.lower()
-    
-    # 회사명 키워드
-    companies = [
-        '넥슨', '엔씨소프트', 'NC소프트', '크래프톤', '펄어비스', 
-        '넷마블', '컴투스', '스마일게이트', '카카오게임즈', '위메이드',
-        '블리자드', '라이엇게임즈', '밸브', '에픽게임즈'
-    ]
-    
-    # 게임명 키워드
-    games = [
-        '리니지', '메이플스토리', '던전앤파이터', '배틀그라운드', 'PUBG',
-        '검은사막', '로스트아크', '오버워치', '리그오브레전드', 'LOL',
-        '카트라이더', '서든어택', '피파온라인'
-    ]
-    
-    # 기술/엔진 키워드
-    tech = [
-        '언리얼엔진', 'Unreal Engine', 'Unity', '유니티',
-        'AI', '인공지능', '메타버스', 'VR', 'AR', 'NFT', '블록체인'
-    ]
-    
-    # 장르 키워드
-    genres = [
-        'MMORPG', 'RPG', 'FPS', 'AOS', 'MOBA', 
-        '배틀로얄', '시뮬레이션', '전략', '액션', '어드벤처'
-    ]
-    
-    # 모든 키워드 리스트 합치기
-    all_keywords = companies + games + tech + genres
-    
-    # 텍스트에서 키워드 찾기
-    for keyword in all_keywords:
-        if keyword.lower() in text_lower:
-            # 중복 방지
-            if keyword not in tags:
-                tags.append(keyword)
-    
-    return tags
+    return match_keywords(text)[0]
 
 def is_spam(text: str) -> bool:
     """
     스팸/저품질 뉴스인지 판단합니다.
-    블랙리스트 키워드가 포함되어 있으면 True를 반환합니다.
+    블랙리스트 키워드(config/keywords/spam.txt)가 포함되어 있으면 True를 반환합니다.
     """
     if not text:
         return False
     
-    text_lower = text.lower()
-    
-    # 스팸 키워드 블랙리스트
-    spam_keywords = [
-        # 광고성
-        '할인', '쿠폰', '이벤트 참여', '경품', '프로모션',
-        # 클릭베이트
-        '충격', '놀라운', '반전', '대박', '실화',
-        # 관련 없는 내용
-        '날씨', '주식', '부동산', '정치',
-        # 성인/도박
-        '카지노', '도박', '성인', '안마방 ', '동인지',
-        # 불법 코인/캄보디아 관련
-        '캄보디아', '코인', '가상화폐', '암호화폐', '비트코인',
-        '불법', '사기', '먹튀', '환전', '온라인카지노',
-        '베팅', '토토', '슬롯', '바카라', '포커',
-        '투자사기', '다단계', 'P2E', '리니지W코인',
-    ]
-    
-    # 블랙리스트 키워드 체크
-    for keyword in spam_keywords:
-        if keyword in text_lower:
-            return True
-    
-    return False
+    return bool(match_keywords(text)[1])
+
+def load_feed_cache(path: str = FEED_CACHE_FILE) -> dict:
+    """
+    피드별 ETag / Last-Modified 값을 저장한 캐시 파일을 읽습니다.
+    파일이 없거나 손상된 경우 빈 캐시로 시작합니다.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_feed_cache(cache: dict, path: str = FEED_CACHE_FILE):
+    """피드 캐시를 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def fetch_feed(feed_info: dict, validators: dict = None, snapshots: SnapshotStore = None,
+               run_id: str = None) -> dict:
+    """
+    하나의 RSS 피드를 공용 HTTP 세션(연결 재사용, gzip/br)으로 조건부 GET 한 뒤
+    받은 바이트를 feedparser에 넘겨 파싱합니다.
+    서버가 304 Not Modified를 응답하면 파싱하지 않고 not_modified=True를 반환합니다.
+    snapshots가 있으면 받은 바이트를 파싱 전에 스냅샷 저장소에 기록합니다 (리플레이용).
+    
+    Returns:
+        {'feed': 파싱 결과 또는 None, 'not_modified': bool,
+         'validators': 새 ETag/Last-Modified, 'error': 에러 메시지 또는 None}
+    """
+    from gamenews.http import get_session
+    
+    validators = validators or {}
+    
+    headers = {}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('modified'):
+        headers['If-Modified-Since'] = validators['modified']
+    
+    try:
+        with metrics.timer('fetch'):
+            response = get_session().get(feed_info['url'], headers=headers)
+            content = response.content
+        
+        if response.status_code != 304:
+            response.raise_for_status()
+    except Exception as e:
+        return {'feed': None, 'not_modified': False, 'validators': validators, 'error': str(e)}
+    
+    metrics.count('bytes_fetched', len(content))
+    
+    new_validators = {}
+    if response.headers.get('ETag'):
+        new_validators['etag'] = response.headers['ETag']
+    if response.headers.get('Last-Modified'):
+        new_validators['modified'] = response.headers['Last-Modified']
+    
+    if response.status_code == 304:
+        # 변경 없음: 기존 검증 값 유지
+        return {'feed': None, 'not_modified': True, 'validators': new_validators or validators, 'error': None}
+    
+    # 기준 URL / 인코딩 판단에 쓰도록 응답 헤더를 함께 넘김 (Content-Type이 없으면 XML 선언을 따름)
+    response_headers = {
+        'content-location': response.url,
+        'content-type': response.headers.get('Content-Type') or 'application/xml',
+    }
+    
+    if snapshots is not None:
+        try:
+            with metrics.timer('snapshot'):
+                snapshots.record(feed_info, content, response_headers, run_id)
+        except OSError as e:
+            # 기록 실패로 수집을 멈추지 않음
+            print(f"⚠️  Failed to record feed snapshot: {str(e)}")
+    
+    parsed = parse_feed(content, response_headers)
+    # 파싱에 실패하면 기존 검증 값을 유지해 다음 실행에서 다시 받음
+    parsed['validators'] = validators if parsed['error'] else new_validators
+    return parsed
+
+def parse_feed(content: bytes, response_headers: dict) -> dict:
+    """받은(또는 스냅샷에서 읽은) 피드 바이트를 feedparser로 파싱해 fetch_feed와 같은 형식으로 반환합니다."""
+    import feedparser
+    
+    try:
+        with metrics.timer('parse'):
+            feed = feedparser.parse(content, response_headers=response_headers)
+    except Exception as e:
+        return {'feed': None, 'not_modified': False, 'validators': {}, 'error': str(e)}
+    
+    return {'feed': feed, 'not_modified': False, 'validators': {}, 'error': None}
+
+class CrawlState:
+    """
+    실행 사이에 유지할 수 있는 상태 (피드 캐시, 최근 제목 인덱스, seen-link 저장소).
+    한 번만 실행할 때는 매번 새로 만들고, 데몬 모드에서는 하나를 계속 재사용합니다.
+    
+    state_dir을 주면 로컬 상태 파일을 모두 그 디렉토리에 두고, offline이면 링크 해제에 HTTP 요청을 보내지 않고
+    스냅샷도 기록하지 않습니다 (리플레이가 실제 .cache를 건드리지 않도록).
+    """
+    
+    def __init__(self, state_dir: str = None, offline: bool = False):
+        def state_path(name: str, default: str) -> str:
+            return os.path.join(state_dir, name) if state_dir else default
+        
+        self.feed_cache_path = state_path('feed_validators.json', FEED_CACHE_FILE)
+        self.feed_cache = load_feed_cache(self.feed_cache_path)
+        
+        # 유사도 비교용 최근 제목 인덱스 (DB에서 한 번만 조회, 밴드 키는 서명 캐시에서 재사용)
+        self.title_signatures = TitleSignatureCache(
+            state_path('title_signatures.sqlite', TITLE_SIGNATURES_DB), ttl_days=SIMILARITY_WINDOW_DAYS)
+        with metrics.timer('load_recent_titles'):
+            self.recent_titles = load_recent_titles(cache=self.title_signatures)
+        
+        # 스토리 묶기용 최근 게시물 (STORY_CLUSTERING=0이거나 NumPy / SciPy가 없으면 None)
+        with metrics.timer('load_recent_stories'):
+            self.stories = load_recent_stories()
+        
+        # 이미 posts에 있는 것으로 확인된 링크 (로컬 저장소)
+        with metrics.timer('open_seen_links'):
+            self.seen_links = open_seen_links(state_path('seen_links.sqlite', SEEN_LINKS_DB))
+        
+        # 피드별로 마지막으로 처리한 항목 (이보다 새로운 항목만 처리)
+        self.feed_cursors = FeedCursorStore(state_path('feed_cursors.json', FEED_CURSORS_FILE))
+        
+        # 리디렉션 래퍼(news.google.com) 링크 -> 원문 URL 캐시
+        self.canonicalizer = LinkCanonicalizer(
+            ResolvedLinkCache(state_path('resolved_links.sqlite', RESOLVED_LINKS_DB)),
+            resolve=RESOLVE_REDIRECTS and not offline,
+        )
+        
+        # 가져온 피드 원본 (FEED_SNAPSHOT_DIR이 비어 있으면 기록하지 않음)
+        self.snapshots = None
+        if FEED_SNAPSHOT_DIR and not offline:
+            try:
+                self.snapshots = SnapshotStore()
+                self.snapshots.purge_expired()
+            except OSError as e:
+                print(f"⚠️  Feed snapshots disabled: {str(e)}")
+                self.snapshots = None
+        self.loaded_at = time.time()
+    
+    def refresh(self):
+        """다른 실행이 저장한 제목을 반영하고 오래된 항목을 정리합니다."""
+        self.recent_titles = load_recent_titles(cache=self.title_signatures)
+        self.stories = load_recent_stories()
+        self.seen_links.purge_expired()
+        self.seen_links.commit()
+        self.canonicalizer.cache.purge_expired()
+        self.canonicalizer.cache.commit()
+        if self.snapshots is not None:
+            self.snapshots.purge_expired()
+        self.loaded_at = time.time()
+    
+    def save(self):
+        """seen-link 저장소와 링크 / 서명 캐시를 커밋하고, 다음 실행을 위해 피드 캐시와 커서를 저장합니다."""
+        self.seen_links.commit()
+        self.title_signatures.commit()
+        self.canonicalizer.cache.commit()
+        try:
+            save_feed_cache(self.feed_cache, self.feed_cache_path)
+        except OSError as e:
+            print(f"⚠️  Failed to save feed cache: {str(e)}")
+        try:
+            self.feed_cursors.save()
+        except OSError as e:
+            print(f"⚠️  Failed to save feed cursors: {str(e)}")
+    
+    def close(self):
+        self.save()
+        self.seen_links.close()
+        self.title_signatures.close()
+        self.canonicalizer.cache.close()
+
+def get_notifier():
+    """Discord 알림 큐를 처음 필요할 때 만듭니다 (웹훅 URL이 없으면 None)."""
+    global notifier
+    if notifier is None and DISCORD_WEBHOOK_URL:
+        from gamenews.notifier import DiscordNotifier
+        notifier = DiscordNotifier(DISCORD_WEBHOOK_URL)
+    return notifier
 
 def send_discord_notification(stats: dict, error: str = None):
     """
-    Discord 웹훅으로 크롤링 결과를 전송합니다.
+    Discord 웹훅으로 보낼 크롤링 결과를 백그라운드 큐에 넣고 바로 반환합니다.
+    DISCORD_COALESCE_SECONDS 동안 들어온 결과는 임베드 하나로 합쳐 보내며 (gamenews/notifier.py),
+    남은 알림은 close_notifier()가 종료 전에 보냅니다.
     
     Args:
         stats: 크롤링 통계 정보 딕셔너리
         error: 에러 메시지 (선택적)
     """
-    if not DISCORD_WEBHOOK_URL:
+    queue = get_notifier()
+    if queue is None:
         return  # 웹훅 URL이 없으면 조용히 스킵
     
-    try:
-        # 성공/실패에 따라 색상 결정
-        color = 0xFF0000 if error else 0x00FF00  # 빨강(에러) 또는 초록(성공)
-        
-        # 임베드 메시지 구성
-        embed = {
-            "title": "🎮 게임 뉴스 크롤러 실행 완료" if not error else "❌ 크롤러 실행 실패",
-            "color": color,
-            "timestamp": datetime.utcnow().isoformat(),
-            "fields": []
-        }
+    queue.notify(stats, error)
+
+def close_notifier():
+    """대기 중인 Discord 알림을 DISCORD_FLUSH_TIMEOUT초 안에 보내고 알림 스레드를 멈춥니다."""
+    global notifier
+    if notifier is not None:
+        notifier.close()
+        notifier = None
+
+class CrawlRun:
+    """한 번의 fetch_and_store_news 실행에서 파이프라인 단계들이 함께 쓰는 상태와 집계"""
+    
+    def __init__(self, state: 'CrawlState', cpu: CpuPool, run_id: str = None):
+        self.state = state
+        self.cpu = cpu
+        self.run_id = run_id        # 스냅샷 기록에서 같은 실행의 피드를 묶는 id (시작 시각)
+        self.added = 0
+        self.skipped = 0
+        self.spam = 0
+        self.seen = 0
+        self.all_tags = []
+        self.feed_new = {}          # 피드 URL -> 커서보다 새로운 항목 수 (데몬 모드의 폴링 간격 조정용)
+        self.pending_cursors = {}   # 피드 URL -> 이번 실행이 성공하면 저장할 커서
+        self.failed_feeds = set()   # 처리에 실패해 커서 / 캐시를 전진시키지 않을 피드 URL
+        self.collected_links = set()  # 이번 실행에서 이미 후보가 된 링크 (여러 피드에 같은 기사가 있는 경우)
+    
+    def fail(self, feed_infos):
+        """처리하지 못한 피드는 다음 실행에서 전체를 다시 받도록 캐시를 지우고 커서를 전진시키지 않음"""
+        for feed_info in feed_infos:
+            self.state.feed_cache.pop(feed_info['url'], None)
+            self.failed_feeds.add(feed_info['url'])
+
+def fetch_stage(feeds: list, run: CrawlRun):
+    """
+    피드를 스레드 풀에서 동시에 가져와 feeds 순서대로 (feed_info, 파싱 결과)를 내보냅니다.
+    동시에 진행하거나 처리를 기다리는 피드는 FEED_FETCH_WORKERS의 두 배까지만 두며,
+    변경 없는(304) 피드와 가져오지 못한 피드는 여기서 걸러집니다.
+    """
+    if not feeds:
+        return
+    
+    cache = run.state.feed_cache
+    snapshots = run.state.snapshots
+    workers = max(1, min(FEED_FETCH_WORKERS, len(feeds)))
+    
+    for feed_info, fetched in bounded_imap(
+        lambda feed_info: fetch_feed(feed_info, cache.get(feed_info['url']), snapshots, run.run_id), feeds, workers
+    ):
+        run.feed_new[feed_info['url']] = 0
+        print(f"\n📰 Fetching from {feed_info['name']}...")
         
-        if error:
-            # 에러 발생 시
-            embed["fields"].append({
-                "name": "❌ 에러",
-                "value": f"```{error[:1000]}```",
-                "inline": False
-            })
+        if fetched['validators']:
+            cache[feed_info['url']] = fetched['validators']
         else:
-            # 정상 실행 시 통계 정보
-            embed["fields"] = [
-                {
-                    "name": "✅ 새 기사",
-                    "value": f"**{stats.get('added', 0)}개**",
-                    "inline": True
-                },
-                {
-                    "name": "⏭️ 중복 스킵",
-                    "value": f"{stats.get('skipped', 0)}개",
-                    "inline": True
-                },
-                {
-                    "name": "🚫 스팸 차단",
-                    "value": f"{stats.get('spam', 0)}개",
-                    "inline": True
-                },
-                {
-                    "name": "📊 총 처리",
-                    "value": f"{stats.get('total_processed', 0)}개",
-                    "inline": True
-                },
-                {
-                    "name": "🏷️ 태그 생성",
-                    "value": f"{stats.get('total_tags', 0)}개",
-                    "inline": True
-                },
-                {
-                    "name": "⏱️ 소요 시간",
-                    "value": f"{stats.get('duration', 0):.1f}초",
-                    "inline": True
-                }
-            ]
+            cache.pop(feed_info['url'], None)
+        
+        if fetched['error']:
+            print(f"❌ Error fetching feed {feed_info['name']}: {fetched['error']}")
+            run.fail([feed_info])
+            continue
+        
+        if fetched['not_modified']:
+            print("  💤 Not modified since last run, skipping")
+            metrics.count('feeds_not_modified')
+            continue
+        
+        yield feed_info, fetched['feed']
+
+def replay_stage(store: SnapshotStore, records: list, run: CrawlRun):
+    """
+    fetch_stage 대신 스냅샷 기록의 피드 바이트를 읽어 파싱하고 (feed_info, 파싱 결과)를 내보냅니다.
+    피드 설정(카테고리, max_entries)은 현재 config/feeds.json을 따르고, 목록에 없는 피드는 기록의 값을 씁니다.
+    """
+    feeds_by_url = {feed_info['url']: feed_info for feed_info in RSS_FEEDS}
+    
+    # 기록은 피드를 다 받은 순서로 남으므로, 실제 실행처럼 피드 목록 순서대로 처리 (중복 중 무엇이 남는지가 같도록)
+    position = {url: index for index, url in enumerate(feeds_by_url)}
+    records = sorted(records, key=lambda record: position.get(record['feed'], len(position)))
+    
+    for record in records:
+        feed_info = feeds_by_url.get(record['feed']) or {
+            'name': record.get('name') or record['feed'],
+            'url': record['feed'],
+            'category': record.get('category') or '',
+            'max_entries': None,
+        }
+        run.feed_new[feed_info['url']] = 0
+        print(f"\n📼 Replaying {feed_info['name']} ({record['at']})...")
+        
+        try:
+            content = store.get(record['sha256'])
+        except OSError as e:
+            print(f"❌ Missing snapshot for {feed_info['name']}: {str(e)}")
+            run.fail([feed_info])
+            continue
+        
+        metrics.count('bytes_fetched', len(content))
+        parsed = parse_feed(content, {
+            'content-location': record.get('location') or feed_info['url'],
+            'content-type': record.get('content_type') or 'application/xml',
+        })
+        if parsed['error']:
+            print(f"❌ Error parsing snapshot {feed_info['name']}: {parsed['error']}")
+            run.fail([feed_info])
+            continue
+        
+        yield feed_info, parsed['feed']
+
+def entry_stage(fetched, run: CrawlRun):
+    """
+    피드마다 커서보다 새로운 항목만 오래된 것부터 골라 Article로 내보냅니다.
+    링크가 없는 항목과 이전 실행에서 저장된 링크(seen-link)는 링크를 정규화하기 전에 여기서 걸러집니다.
+    Article에는 필요한 필드만 복사하므로, feedparser 결과는 다음 피드를 꺼낼 때 놓아 줍니다.
+    """
+    seen_links = run.state.seen_links
+    
+    for feed_info, feed in fetched:
+        try:
+            if feed.bozo:
+                print(f"⚠️  Warning: Feed parsing error for {feed_info['name']}")
+            
+            cursor = run.state.feed_cursors.get(feed_info['url'])
+            entries, new_count = select_new_entries(feed.entries, cursor, feed_info.get('max_entries'))
+            run.feed_new[feed_info['url']] = new_count
+            run.pending_cursors[feed_info['url']] = advance_cursor(cursor, entries)
+            articles = [Article.from_entry(feed_info, entry) for entry in entries]
+        except Exception as e:
+            print(f"❌ Error reading feed {feed_info['name']}: {str(e)}")
+            run.fail([feed_info])
+            continue
+        
+        if not articles:
+            print("  💤 No new entries since last run")
+        elif new_count > len(articles):
+            print(f"  ⏸️  {new_count - len(articles)} newer entries deferred to next run "
+                  f"(max_entries={feed_info['max_entries']})")
+        
+        feed_seen = 0
+        for article in articles:
+            metrics.count('entries')
+            run.cpu.record()
             
-            # 상위 태그 정보 추가 (있는 경우)
-            if stats.get('top_tags'):
-                top_tags_str = ", ".join([f"`{tag}`" for tag in stats['top_tags'][:10]])
-                embed["fields"].append({
-                    "name": "🔥 주요 태그",
-                    "value": top_tags_str,
-                    "inline": False
-                })
+            if not article.link:
+                print(f"  ⏭️  Skipping entry without link: {article.title}")
+                continue
             
-            # 웹사이트 링크 추가 (환경 변수가 설정된 경우만)
-            website_url = os.getenv("WEBSITE_URL")
-            if website_url:
-                embed["fields"].append({
-                    "name": "🌐 웹사이트",
-                    "value": website_url,
-                    "inline": False
-                })
-        
-        # 푸터 추가
-        embed["footer"] = {
-            "text": f"실행 시간: {stats.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))}"
-        }
+            # 이전 실행에서 이미 저장된 링크는 링크 해제 / 텍스트 처리 / 네트워크 요청 없이 스킵
+            if article.link in seen_links:
+                feed_seen += 1
+                continue
+            
+            yield article
         
-        # Discord 웹훅으로 전송
-        payload = {
-            "embeds": [embed]
-        }
+        if feed_seen:
+            print(f"  ⏭️  {feed_seen} entries already stored (seen-link store)")
+            run.seen += feed_seen
+            run.skipped += feed_seen
+
+def canonicalize_stage(articles, run: CrawlRun):
+    """
+    링크에서 추적 파라미터를 지우고 리디렉션 래퍼(news.google.com)를 원문 URL로 해제합니다.
+    캐시에 없는 래퍼 링크만 PIPELINE_CHUNK_SIZE개씩 묶어 동시에 해제하며,
+    정규화한 링크로 seen-link 저장소와 이번 실행에서 모은 링크를 확인하므로
+    다른 래퍼 링크로 들어온 같은 기사는 유사도 검사 없이 걸러집니다.
+    """
+    seen_links = run.state.seen_links
+    canonicalizer = run.state.canonicalizer
+    
+    for chunk in chunked(articles, PIPELINE_CHUNK_SIZE):
+        requests_before = canonicalizer.requests
+        with metrics.timer('canonicalize'):
+            canonical = canonicalizer.canonicalize_many([article.source_link for article in chunk])
+        metrics.count('resolve_requests', canonicalizer.requests - requests_before)
+        
+        for article in chunk:
+            article.link = canonical.get(article.source_link) or article.source_link
+            
+            # 원문 URL로 이미 저장된 기사 (다른 래퍼 링크로 저장된 경우)
+            if article.link != article.source_link and article.link in seen_links:
+                print(f"  ⏭️  Already stored (canonical link): {clean_title(article.title)[:50]}...")
+                run.seen += 1
+                run.skipped += 1
+                continue
+            
+            # 같은 실행에서 이미 후보가 된 기사 (다른 피드와 겹치는 경우)
+            if article.link in run.collected_links:
+                print(f"  ⏭️  Already collected in this run: {clean_title(article.title)[:50]}...")
+                run.skipped += 1
+                continue
+            
+            run.collected_links.add(article.link)
+            yield article
+
+def normalize_stage(articles, run: CrawlRun):
+    """
+    제목(출처 제거)과 요약(HTML 제거, 길이 제한)을 PIPELINE_CHUNK_SIZE개씩 정리합니다.
+    항목이 많은 실행에서는 요약 정리를 프로세스 풀에서 나눠 처리합니다.
+    """
+    for chunk in chunked(articles, PIPELINE_CHUNK_SIZE):
+        with metrics.timer('normalize'):
+            summaries = run.cpu.map(clean_summary, [article.summary for article in chunk])
+            for article, summary in zip(chunk, summaries):
+                article.title = clean_title(article.title)
+                article.summary = summary
         
-        response = requests.post(DISCORD_WEBHOOK_URL, json=payload, timeout=10)
-        response.raise_for_status()
+        yield from chunk
+
+def classify_stage(articles, run: CrawlRun):
+    """태그를 붙이고 스팸을 걸러냅니다 (제목 + 요약을 키워드 매처로 한 번에 검사)."""
+    for article in articles:
+        classify_start = time.perf_counter()
+        article.tags, spam_hits = match_keywords(f"{article.title} {article.summary}")
+        metrics.observe('classify', time.perf_counter() - classify_start)
         
-        print("\n📨 Discord 알림 전송 완료!")
+        # 스팸이면 저장하지 않고 스킵
+        if spam_hits:
+            run.spam += 1
+            print(f"  🚫 Spam detected: {article.title[:50]}...")
+            continue
         
-    except Exception as e:
-        print(f"\n⚠️  Discord 알림 전송 실패: {str(e)}")
-        # 알림 실패는 크롤러 전체 실패로 이어지지 않도록 조용히 처리
+        yield article
 
-def fetch_and_store_news():
-    """RSS 피드에서 뉴스를 가져와 Supabase의 posts_pending 테이블에 저장합니다."""
-    start_time = datetime.now()
-    total_added = 0
-    total_skipped = 0
-    total_spam = 0
-    total_tags_count = 0
-    all_tags = []
+def find_similar_articles(articles: list, recent_titles: NearDuplicateIndex, cpu: CpuPool):
+    """
+    기사마다 SIMILARITY_THRESHOLD 이상 유사한 최근 제목을 찾아 (기사, 유사한 제목, 유사도)를 차례로 내보냅니다.
+    호출한 쪽이 통과한 제목을 recent_titles에 추가하므로, 뒤 기사는 앞에서 통과한 제목과도 비교됩니다.
     
-    print(f"🚀 Starting news crawler at {start_time}")
+    프로세스 풀을 쓰는 실행에서는 후보 목록을 먼저 뽑아 SequenceMatcher 점수 계산을 worker에 나누고,
+    같은 묶음 안에서 앞서 통과한 제목과의 비교만 작은 인덱스로 따로 합니다.
+    """
+    if not cpu.parallel:
+        for article in articles:
+            similarity_start = time.perf_counter()
+            similar_title, similarity = find_similar_title(article.title, recent_titles)
+            metrics.observe('similarity', time.perf_counter() - similarity_start)
+            yield article, similar_title, similarity
+        return
     
-    for feed_info in RSS_FEEDS:
-        print(f"\n📰 Fetching from {feed_info['name']}...")
+    with metrics.timer('similarity'):
+        jobs = [(normalize_title(article.title), recent_titles.candidate_pairs(article.title), SIMILARITY_THRESHOLD)
+                for article in articles]
+        matches = cpu.map(best_match, jobs)
+    
+    in_chunk = NearDuplicateIndex(threshold=SIMILARITY_THRESHOLD)
+    for article, (similar_title, similarity) in zip(articles, matches):
+        if similar_title is None:
+            similar_title, similarity = in_chunk.find_similar(article.title)
+            if similar_title is None:
+                in_chunk.add(article.title)
+        yield article, similar_title, similarity
+
+def dedup_stage(articles, run: CrawlRun):
+    """
+    EXISTS_CHUNK_SIZE개씩 이미 저장된 링크(in_ 조회)와 유사한 제목(80% 이상)을 걸러냅니다.
+    """
+    recent_titles = run.state.recent_titles
+    seen_links = run.state.seen_links
+    
+    for chunk in chunked(articles, EXISTS_CHUNK_SIZE):
+        print(f"\n🔍 Checking {len(chunk)} candidates for duplicates...")
         
         try:
-            feed = feedparser.parse(feed_info['url'])
-            
-            if feed.bozo:
-                print(f"⚠️  Warning: Feed parsing error for {feed_info['name']}")
+            # 1. 정확한 일치 확인 (링크) - 묶음 전체를 in_ 조회로 한 번에
+            with metrics.timer('find_existing_links'):
+                existing_links = find_existing_links([article.link for article in chunk])
+        except Exception as e:
+            # 중복 여부를 알 수 없으면 저장하지 않고 다음 실행에서 다시 시도
+            print(f"❌ Error checking existing posts: {str(e)}")
+            run.fail(article.feed for article in chunk)
+            continue
+        
+        fresh = []
+        for article in chunk:
+            if article.link in existing_links:
+                seen_links.add_many((article.link, article.source_link))
+                print(f"  ⏭️  Already exists (exact match): {article.title[:50]}...")
+                run.skipped += 1
+            else:
+                fresh.append(article)
+        
+        # 2. 유사도 체크 (제목만 비교, 80% 이상 유사하면 중복으로 간주)
+        # 실행 시작 시 불러온 최근 제목 + 이번 실행에서 저장할 제목과 비교
+        for article, similar_title, similarity in find_similar_articles(fresh, recent_titles, run.cpu):
+            if similar_title is not None:
+                print(f"  ⏭️  Similar to existing ({similarity:.0%}): {article.title[:50]}...")
+                print(f"      Existing: {similar_title[:50]}...")
+                run.skipped += 1
+                continue
             
-            for entry in feed.entries[:10]:  # 최근 10개만 가져오기
-                try:
-                    # 원본 데이터 추출
-                    raw_title = entry.get('title', 'No Title')
-                    link = entry.get('link', '')
-                    raw_summary = entry.get('summary', entry.get('description', ''))
-                    
-                    if not link:
-                        print(f"  ⏭️  Skipping entry without link: {raw_title}")
-                        continue
-                    
-                    # 제목 정리 (Google News의 경우 출처 제거)
-                    title = clean_title(raw_title)
-                    
-                    # 요약 정리
-                    summary = clean_summary(raw_summary)
-                    
-                    # 태그 추출 (제목 + 요약에서)
-                    tags = extract_tags(f"{title} {summary}")
-                    
-                    # 스팸 필터링 체크
-                    spam_check_text = f"{title} {summary}"
-                    is_spam_content = is_spam(spam_check_text)
-                    
-                    # 스팸이면 저장하지 않고 스킵
-                    if is_spam_content:
-                        total_spam += 1
-                        print(f"  🚫 Spam detected: {title[:50]}...")
-                        continue
-                    
-                    # 카테고리 설정
-                    category = feed_info['category']
-                    
-                    # 중복 확인 (정확한 일치 + 유사도 체크)
-                    # 1. 정확한 일치 확인 (제목 + 링크)
-                    existing_posts = supabase.table('posts').select('id')\
-                        .eq('title', title)\
-                        .eq('original_link', link)\
-                        .execute()
-                    
-                    if existing_posts.data:
-                        print(f"  ⏭️  Already exists (exact match): {title[:50]}...")
-                        total_skipped += 1
-                        continue
-                    
-                    # 2. 유사도 체크 (제목만 비교, 80% 이상 유사하면 중복으로 간주)
-                    # 최근 100개 뉴스와 비교
-                    recent_posts = supabase.table('posts').select('title')\
-                        .order('created_at', desc=True)\
-                        .limit(100)\
-                        .execute()
-                    
-                    is_similar = False
-                    similarity_threshold = 0.8  # 80% 이상 유사하면 중복
-                    
-                    # 기존 뉴스와 비교
-                    for existing in recent_posts.data:
-                        similarity = calculate_similarity(title, existing['title'])
-                        if similarity >= similarity_threshold:
-                            print(f"  ⏭️  Similar to existing ({similarity:.0%}): {title[:50]}...")
-                            print(f"      Existing: {existing['title'][:50]}...")
-                            is_similar = True
-                            break
-                    
-                    if is_similar:
-                        total_skipped += 1
-                        continue
-                    
-                    # posts 테이블에 직접 저장
-                    data = {
-                        'title': title,
-                        'summary': summary or '요약 정보가 없습니다.',
-                        'original_link': link,
-                        'category': category,
-                        'tags': tags,  # 자동 추출된 태그
-                    }
-                    
-                    result = supabase.table('posts').insert(data).execute()
-                    
-                    if result.data:
-                        tags_str = f" [Tags: {', '.join(tags)}]" if tags else ""
-                        print(f"  ✅ Added to posts: {title[:50]}... [{category}]{tags_str}")
-                        total_added += 1
-                        
-                        # 태그 통계 수집
-                        if tags:
-                            total_tags_count += len(tags)
-                            all_tags.extend(tags)
-                    else:
-                        print(f"  ❌ Failed to add: {title[:50]}...")
-                        
-                except Exception as e:
-                    print(f"  ❌ Error processing entry: {str(e)}")
-                    continue
-                    
+            # 이후 후보(다른 피드 포함)의 유사도 체크에 반영
+            recent_titles.add(article.title)
+            yield article
+
+def cluster_stage(articles, run: CrawlRun):
+    """
+    저장할 기사를 INSERT_BATCH_SIZE개씩 최근 게시물 + 이번 실행의 앞 기사와 비교해 cluster_id를 붙입니다.
+    같은 사건을 다룬 기사는 제목이 달라도 같은 cluster_id로 저장됩니다 (gamenews/clustering.py).
+    """
+    stories = run.state.stories
+    if stories is None:
+        yield from articles
+        return
+    
+    for batch in chunked(articles, INSERT_BATCH_SIZE):
+        known = set(stories)
+        with metrics.timer('cluster'):
+            cluster_ids = stories.assign((article.title, article.summary) for article in batch)
+        
+        joined = 0
+        for article, cluster_id in zip(batch, cluster_ids):
+            article.cluster_id = cluster_id
+            joined += cluster_id in known
+            known.add(cluster_id)
+        metrics.count('story_joined', joined)
+        if joined:
+            print(f"  🧩 {joined}/{len(batch)} articles joined an existing story")
+        
+        yield from batch
+
+def write_stage(articles, run: CrawlRun):
+    """남은 기사를 INSERT_BATCH_SIZE개씩 한 번의 upsert로 저장합니다 (original_link 충돌은 무시)."""
+    seen_links = run.state.seen_links
+    
+    for batch in chunked(articles, INSERT_BATCH_SIZE):
+        try:
+            with metrics.timer('insert'):
+                inserted_links = insert_posts([article.to_row() for article in batch])
         except Exception as e:
-            print(f"❌ Error fetching feed {feed_info['name']}: {str(e)}")
+            print(f"❌ Error inserting {len(batch)} posts: {str(e)}")
+            run.fail(article.feed for article in batch)
             continue
+        
+        # 추가되었거나 이미 있던 링크 모두 다음 실행부터 바로 건너뜀 (래퍼 링크도 함께 기록해 다시 해제하지 않음)
+        seen_links.add_many(link for article in batch for link in (article.link, article.source_link))
+        
+        for article in batch:
+            if article.link in inserted_links:
+                tags_str = f" [Tags: {', '.join(article.tags)}]" if article.tags else ""
+                print(f"  ✅ Added to posts: {article.title[:50]}... [{article.feed['category']}]{tags_str}")
+                run.added += 1
+                
+                # 태그 통계 수집
+                run.all_tags.extend(article.tags)
+            else:
+                # 조회 이후 다른 실행이 먼저 저장한 경우 (on_conflict로 무시됨)
+                print(f"  ⏭️  Already exists (conflict): {article.title[:50]}...")
+                run.skipped += 1
+
+def fetch_and_store_news(feeds: list = None, state: CrawlState = None, source=None):
+    """
+    RSS 피드에서 뉴스를 가져와 Supabase의 posts_pending 테이블에 저장합니다.
+    
+    항목은 단계별 제너레이터를 따라 흐릅니다:
+        fetch_stage → entry_stage → canonicalize_stage → normalize_stage → classify_stage → dedup_stage
+        → cluster_stage → write_stage
+    
+    Args:
+        feeds: 가져올 피드 목록 (기본값: RSS_FEEDS 전체)
+        state: 재사용할 CrawlState (데몬 모드). 없으면 이번 실행용으로 만들고 끝나면 닫습니다.
+        source: fetch_stage 대신 (feed_info, 파싱 결과)를 내보낼 함수 source(run) (리플레이용)
+    """
+    feeds = RSS_FEEDS if feeds is None else feeds
+    start_time = datetime.now()
+    
+    metrics.reset()
+    
+    print(f"🚀 Starting news crawler at {start_time}")
+    
+    owns_state = state is None
+    if owns_state:
+        state = CrawlState()
+    
+    with CpuPool() as cpu:
+        run = CrawlRun(state, cpu, start_time.isoformat(timespec='seconds'))
+        
+        fetched = source(run) if source is not None else fetch_stage(feeds, run)
+        articles = entry_stage(fetched, run)
+        articles = canonicalize_stage(articles, run)
+        articles = normalize_stage(articles, run)
+        articles = classify_stage(articles, run)
+        articles = dedup_stage(articles, run)
+        articles = cluster_stage(articles, run)
+        write_stage(articles, run)
+    
+    # 모든 단계를 마친 피드만 커서 전진 (실패한 피드는 다음 실행에서 같은 항목을 다시 처리)
+    for url, cursor in run.pending_cursors.items():
+        if url not in run.failed_feeds:
+            state.feed_cursors.set(url, cursor)
+    
+    # seen-link 저장소 커밋 + 다음 실행을 위해 피드 캐시 / 커서 저장
+    if owns_state:
+        state.close()
+    else:
+        state.save()
     
     # 실행 시간 계산
     end_time = datetime.now()
     duration = (end_time - start_time).total_seconds()
     
     print(f"\n✨ Crawler finished!")
-    print(f"📊 Summary: {total_added} added, {total_skipped} skipped, {total_spam} spam blocked")
+    print(f"📊 Summary: {run.added} added, {run.skipped} skipped, {run.spam} spam blocked")
     
     # 상위 태그 추출 (빈도순)
     from collections import Counter
-    tag_counter = Counter(all_tags)
+    tag_counter = Counter(run.all_tags)
     top_tags = [tag for tag, count in tag_counter.most_common(10)]
     
     # 통계 정보 구성
     stats = {
-        'added': total_added,
-        'skipped': total_skipped,
-        'spam': total_spam,
-        'total_processed': total_added + total_skipped,
-        'total_tags': total_tags_count,
+        'added': run.added,
+        'skipped': run.skipped,
+        'spam': run.spam,
+        'seen': run.seen,
+        'feed_new': run.feed_new,
+        'total_processed': run.added + run.skipped,
+        'total_tags': len(run.all_tags),
         'top_tags': top_tags,
         'duration': duration,
         'timestamp': start_time.strftime('%Y-%m-%d %H:%M:%S')
     }
     
+    # 단계별 시간 / 카운터
+    metrics.count('posts_added', run.added)
+    metrics.count('posts_skipped', run.skipped)
+    metrics.count('posts_spam', run.spam)
+    stats['metrics'] = metrics.summary()
+    stats['metrics_summary'] = metrics.format_summary()
+    
+    if METRICS_FILE:
+        try:
+            metrics.write(METRICS_FILE)
+        except OSError as e:
+            print(f"⚠️  Failed to write metrics file: {str(e)}")
+    
     return stats
 
-if __name__ == "__main__":
+def copy_resolved_links(target: str):
+    """실제 링크 해제 캐시를 target으로 복사합니다 (리플레이가 원본에 쓰지 않도록). 없거나 손상되었으면 건너뜁니다."""
+    if not os.path.exists(RESOLVED_LINKS_DB):
+        return
+    try:
+        source = sqlite3.connect(RESOLVED_LINKS_DB)
+        destination = sqlite3.connect(target)
+        with destination:
+            source.backup(destination)
+        source.close()
+        destination.close()
+    except sqlite3.DatabaseError as e:
+        print(f"⚠️  Failed to copy resolved-link cache: {str(e)}")
+
+def write_replay_output(database, output: str):
+    """
+    리플레이로 저장된 포스트를 (저장 시각, 링크) 순서로 JSONL에 씁니다.
+    한 번에 저장한 배치는 저장 시각이 같으므로 링크 순서로 정렬해, 같은 입력이면 항상 같은 파일이 나옵니다.
+    cluster_id는 실행마다 새로 만드는 UUID이므로, 비교할 수 있도록 스토리의 첫 게시물 링크로 바꿔 씁니다.
+    """
+    columns = 'title, summary, original_link, category, tags, cluster_id, created_at'
+    rows = [row for page in database.iter_pages(columns) for row in page]
+    rows.sort(key=lambda row: (row['created_at'], row['original_link']))
+    
+    story_links = {}
+    with open(output, 'w', encoding='utf-8') as f:
+        for row in rows:
+            post = {key: row.get(key) for key in ('title', 'summary', 'original_link', 'category', 'tags')}
+            if row.get('cluster_id'):
+                post['story'] = story_links.setdefault(row['cluster_id'], row['original_link'])
+            f.write(json.dumps(post, ensure_ascii=False) + '\n')
+
+def replay_snapshots(since=None, until=None, feed_urls: list = None, output: str = None,
+                     verbose: bool = False) -> dict:
+    """
+    스냅샷 저장소(gamenews/snapshots.py)의 since ~ until 기록을 네트워크 없이 파이프라인에 다시 흘려 보냅니다.
+    
+    기록된 실행마다 fetch_and_store_news를 한 번씩 실행하므로 피드 커서, seen-link, 유사도 인덱스가
+    실제 실행처럼 이어집니다. posts는 임시 디렉토리의 빈 SQLite 저장소(gamenews/storage.py)에 저장하고,
+    로컬 상태도 같은 임시 디렉토리에, 링크 해제는 실제 캐시의 복사본에서만 찾습니다 (HTTP 요청 없음).
+    output을 주면 저장된 포스트를 JSONL로 써서, 코드를 바꾸기 전후의 결과를 비교할 수 있습니다.
+    
+    Returns:
+        {'runs', 'feeds', 'added', 'skipped', 'spam', 'seconds'}
+    """
+    global post_store
+    
+    store = SnapshotStore()
+    runs = list(store.iter_runs(since, until, feed_urls))
+    totals = {'runs': 0, 'feeds': 0, 'added': 0, 'skipped': 0, 'spam': 0, 'seconds': 0.0}
+    
+    if not runs:
+        print("📭 No feed snapshots in the given range")
+        return totals
+    
+    print(f"📼 Replaying {len(runs)} runs ({sum(len(records) for records in runs)} feed snapshots)...")
+    
+    previous = post_store
+    state_dir = tempfile.mkdtemp(prefix='gamenews-replay-')
+    post_store = database = open_post_store('sqlite', metrics=metrics, path=os.path.join(state_dir, 'posts.sqlite'))
+    start = time.perf_counter()
+    
+    try:
+        copy_resolved_links(os.path.join(state_dir, 'resolved_links.sqlite'))
+        state = CrawlState(state_dir, offline=True)
+        try:
+            for records in runs:
+                quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+                with quiet:
+                    stats = fetch_and_store_news(
+                        state=state, source=lambda run, records=records: replay_stage(store, records, run)
+                    )
+                
+                totals['runs'] += 1
+                totals['feeds'] += len(records)
+                for key in ('added', 'skipped', 'spam'):
+                    totals[key] += stats[key]
+                print(f"  {records[0]['at']}: {len(records)} feeds, {stats['added']} added, "
+                      f"{stats['skipped']} skipped, {stats['spam']} spam")
+        finally:
+            state.close()
+        
+        if output:
+            write_replay_output(database, output)
+    finally:
+        database.close()
+        post_store = previous
+        shutil.rmtree(state_dir, ignore_errors=True)
+    
+    totals['seconds'] = time.perf_counter() - start
+    processed = totals['added'] + totals['skipped'] + totals['spam']
+    rate = processed / totals['seconds'] if totals['seconds'] > 0 else 0
+    print(f"\n✨ Replay finished in {totals['seconds']:.2f}s ({rate:,.0f} items/s)")
+    print(f"📊 Summary: {totals['added']} added, {totals['skipped']} skipped, {totals['spam']} spam blocked")
+    
+    if output:
+        print(f"💾 Stored posts written to {output}")
+    
+    return totals
+
+def run_daemon():
+    """
+    프로세스를 계속 띄워 두고 피드마다 자신의 간격으로 폴링합니다.
+    Supabase 클라이언트, 최근 제목 인덱스, seen-link 저장소, 피드 캐시를 메모리에 유지하며,
+    새 항목이 자주 나오는 피드는 더 자주, 조용한 피드는 점점 드물게 가져옵니다.
+    SIGTERM / SIGINT를 받으면 진행 중인 주기를 마치고 상태를 저장한 뒤 종료합니다.
+    """
+    stop = threading.Event()
+    
+    def handle_signal(signum, frame):
+        print(f"\n🛑 Received signal {signum}, finishing current cycle...")
+        stop.set()
+    
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    
+    feeds_by_url = {feed_info['url']: feed_info for feed_info in RSS_FEEDS}
+    poller = AdaptivePoller(
+        feeds_by_url,
+        min_interval=DAEMON_MIN_INTERVAL,
+        max_interval=DAEMON_MAX_INTERVAL,
+        initial_interval=DAEMON_INITIAL_INTERVAL,
+        state_path=POLL_STATE_FILE,
+    )
+    
+    print(f"👀 Starting crawler daemon ({len(feeds_by_url)} feeds, "
+          f"interval {DAEMON_MIN_INTERVAL}-{DAEMON_MAX_INTERVAL}s)")
+    get_post_store()
+    state = CrawlState()
+    
+    try:
+        while not stop.is_set():
+            if time.time() - state.loaded_at >= DAEMON_REFRESH_MINUTES * 60:
+                print("\n🔄 Refreshing recent titles and seen-link store...")
+                state.refresh()
+            
+            due = poller.due()
+            if due:
+                try:
+                    stats = fetch_and_store_news([feeds_by_url[url] for url in due], state)
+                except Exception as e:
+                    print(f"\n💥 Cycle failed: {str(e)}")
+                    send_discord_notification(
+                        {'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')},
+                        error=str(e)
+                    )
+                    stats = {'feed_new': {}}
+                else:
+                    # 새 기사가 있을 때만 알림
+                    if stats['added']:
+                        send_discord_notification(stats)
+                
+                for url in due:
+                    interval = poller.record(url, stats['feed_new'].get(url, 0))
+                    print(f"  ⏲️  {feeds_by_url[url]['name']}: next poll in {interval:.0f}s")
+                
+                try:
+                    poller.save()
+                except OSError as e:
+                    print(f"⚠️  Failed to save poll schedule: {str(e)}")
+            
+            stop.wait(max(1.0, poller.seconds_until_next()))
+    finally:
+        state.close()
+        try:
+            poller.save()
+        except OSError as e:
+            print(f"⚠️  Failed to save poll schedule: {str(e)}")
+        close_notifier()
+        print("👋 Crawler daemon stopped")
+
+def run_once() -> int:
+    """한 번 실행하고 결과를 Discord로 알립니다. 종료 코드를 반환합니다."""
     try:
         stats = fetch_and_store_news()
         
@@ -427,6 +1048,7 @@ if __name__ == "__main__":
         send_discord_notification(stats)
         
         print(f"\n🎉 Success! Added {stats['added']} new posts.")
+        return 0
     except Exception as e:
         error_msg = str(e)
         print(f"\n💥 Fatal error: {error_msg}")
@@ -437,4 +1059,44 @@ if __name__ == "__main__":
             error=error_msg
         )
         
-        exit(1)
+        return 1
+    finally:
+        close_notifier()
+
+def main(argv: list = None) -> int:
+    """
+    명령줄 진입점
+    
+        python crawler.py            # 한 번 실행 (run과 같음)
+        python crawler.py run        # 한 번 실행
+        python crawler.py daemon     # 계속 실행하며 피드별 적응형 간격으로 폴링 (--daemon과 같음)
+        python crawler.py replay --from 2024-05-01 --to 2024-05-07 --output replay.jsonl
+                                     # 저장된 피드 스냅샷을 네트워크 없이 다시 처리
+    """
+    parser = argparse.ArgumentParser(description="게임 뉴스 크롤러")
+    parser.add_argument('--daemon', action='store_true', help="daemon 명령과 같음")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('run', help="모든 피드를 한 번 수집하고 종료 (기본값)")
+    subparsers.add_parser('daemon', help="계속 실행하면서 피드별 적응형 간격으로 폴링")
+    replay_parser = subparsers.add_parser('replay', help="저장된 피드 스냅샷을 네트워크 없이 다시 처리")
+    replay_parser.add_argument('--from', dest='since', help="시작 시각 (YYYY-MM-DD 또는 ISO 8601, UTC)")
+    replay_parser.add_argument('--to', dest='until', help="끝 시각 (YYYY-MM-DD면 그 날 포함)")
+    replay_parser.add_argument('--feed', action='append', dest='feeds', help="이 피드 URL만 (여러 번 지정 가능)")
+    replay_parser.add_argument('--output', help="저장된 포스트를 JSONL로 쓸 파일")
+    replay_parser.add_argument('--verbose', action='store_true', help="기사별 로그 출력")
+    args = parser.parse_args(argv)
+    
+    command = args.command or ('daemon' if args.daemon else 'run')
+    
+    if command == 'daemon':
+        run_daemon()
+        return 0
+    
+    if command == 'replay':
+        replay_snapshots(args.since, args.until, args.feeds, args.output, args.verbose)
+        return 0
+    
+    return run_once()
+
+if __name__ == "__main__":
+    exit(main())
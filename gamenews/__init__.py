@@ -0,0 +1,3 @@
+"""
+게임 뉴스 크롤러와 유지보수 스크립트가 함께 사용하는 모듈 모음입니다.
+"""
@@ -0,0 +1,283 @@
+"""
+월별로 나눈 gzip CSV 아카이브
+
+아카이브는 실행마다 하나의 디렉토리에 만들어집니다:
+
+    archives/20250101_020000/
+        posts_2024-05.csv.gz
+        posts_2024-06.csv.gz
+        manifest.json
+
+manifest.json에는 파일별 행 수, created_at 범위, SHA-256 체크섬이 기록됩니다.
+행은 created_at 오름차순으로 들어온다고 가정하며, 한 번에 한 파일만 열어 두므로
+아카이빙하는 행 수와 관계없이 메모리 사용량이 일정합니다.
+
+flush()할 때마다 지금까지 쓴 행을 완결된 gzip 멤버(트레일러 포함)로 닫고 manifest.json도 갱신하므로,
+프로세스가 강제 종료되어도 flush한 행은 모두 읽을 수 있습니다 (gzip은 여러 멤버를 이어서 읽음).
+"""
+import ast
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+from datetime import datetime
+
+MANIFEST_FILE = "manifest.json"
+
+# 파일 열(column) 순서. 이 목록에 없는 컬럼은 뒤에 이어 붙입니다.
+DEFAULT_FIELDS = ['id', 'title', 'summary', 'original_link', 'category', 'tags', 'cluster_id', 'created_at']
+
+
+def encode_value(value):
+    """CSV에 쓸 값으로 변환합니다. list/dict(tags 등)는 JSON 문자열로 저장합니다."""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def decode_row(row: dict) -> dict:
+    """
+    아카이브에서 읽은 행을 저장 가능한 형태로 되돌립니다.
+    tags는 JSON 문자열(현재 형식) 또는 파이썬 리스트 표기(이전 CSV 형식) 모두 읽습니다.
+    CSV에 빈 문자열로 저장된 cluster_id는 열에서 뺍니다 (NULL과 같고, cluster_id 열이 없는 데이터베이스에도 복원 가능).
+    """
+    tags = row.get('tags')
+    if isinstance(tags, str):
+        if not tags.strip():
+            row['tags'] = []
+        else:
+            try:
+                row['tags'] = json.loads(tags)
+            except ValueError:
+                try:
+                    row['tags'] = ast.literal_eval(tags)
+                except (ValueError, SyntaxError):
+                    row['tags'] = []
+    if row.get('cluster_id') == '':
+        del row['cluster_id']
+    return row
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MonthlyArchiveWriter:
+    """
+    행을 created_at의 월별 gzip CSV 파일로 나누어 씁니다.
+
+    사용 예:
+        with MonthlyArchiveWriter('archives/20250101_020000', cutoff=cutoff) as writer:
+            for row in rows:
+                writer.write(row)
+        # 종료 시 manifest.json 작성
+    """
+
+    def __init__(self, directory: str, cutoff: str = None, fields: list = None):
+        self.directory = directory
+        self.cutoff = cutoff
+        self.fields = list(fields) if fields else None
+        self.files = []          # manifest에 기록할 파일 정보
+        self.total_rows = 0
+
+        self._month = None
+        self._raw = None
+        self._gzip = None
+        self._text = None
+        self._csv = None
+        self._current = None
+
+        os.makedirs(directory, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+    def _resolve_fields(self, row: dict):
+        if self.fields is None:
+            self.fields = [f for f in DEFAULT_FIELDS if f in row]
+            self.fields += [f for f in row if f not in self.fields]
+
+    def _open_month(self, month: str):
+        filename = f"posts_{month}.csv.gz"
+        path = os.path.join(self.directory, filename)
+        if os.path.exists(path):
+            raise ValueError(f"아카이브 파일이 이미 있습니다 (행이 created_at 순서가 아님?): {path}")
+
+        self._raw = open(path, 'wb')
+        self._open_member(filename)
+        self._csv.writeheader()
+
+        self._month = month
+        self._current = {
+            'file': filename,
+            'month': month,
+            'rows': 0,
+            'min_created_at': None,
+            'max_created_at': None,
+        }
+
+    def _open_member(self, filename: str):
+        """열린 파일 뒤에 새 gzip 멤버를 시작합니다."""
+        self._gzip = gzip.GzipFile(filename=filename, mode='wb', fileobj=self._raw)
+        self._text = io.TextIOWrapper(self._gzip, encoding='utf-8', newline='')
+        self._csv = csv.DictWriter(self._text, fieldnames=self.fields, extrasaction='ignore')
+
+    def _close_member(self):
+        """현재 gzip 멤버를 트레일러까지 씁니다 (fileobj로 넘긴 원본 파일은 열린 채로 남음)."""
+        self._text.close()   # gzip까지 함께 닫힘
+
+    def _close_month(self):
+        if self._csv is None:
+            return
+
+        self._close_member()
+        self._raw.close()
+        path = os.path.join(self.directory, self._current['file'])
+        self._current['bytes'] = os.path.getsize(path)
+        self._current['sha256'] = file_sha256(path)
+        self.files.append(self._current)
+
+        self._month = self._raw = self._gzip = self._text = self._csv = self._current = None
+
+    def write(self, row: dict):
+        """행 하나를 해당 월의 파일에 씁니다."""
+        created_at = str(row.get('created_at') or '')
+        month = created_at[:7] or 'unknown'
+
+        if month != self._month:
+            self._close_month()
+            self._resolve_fields(row)
+            self._open_month(month)
+
+        self._csv.writerow({key: encode_value(value) for key, value in row.items()})
+
+        current = self._current
+        current['rows'] += 1
+        if current['min_created_at'] is None or created_at < current['min_created_at']:
+            current['min_created_at'] = created_at
+        if current['max_created_at'] is None or created_at > current['max_created_at']:
+            current['max_created_at'] = created_at
+        self.total_rows += 1
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        """
+        지금까지 쓴 행을 완결된 gzip 멤버로 닫아 디스크까지 내려 쓰고, 쓰는 중인 파일을 포함한
+        manifest.json(complete=False)을 남깁니다.
+        반환 후에는 프로세스가 강제 종료되어도 쓴 행을 gzip 파일에서 끝까지 읽을 수 있습니다.
+        """
+        if self._csv is None:
+            return
+        self._close_member()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._open_member(self._current['file'])
+        # 쓰는 중인 파일은 체크섬 없이 기록 (닫을 때 확정)
+        self.write_manifest(complete=False, files=self.files + [dict(self._current)])
+
+    def write_manifest(self, complete: bool = True, files: list = None):
+        manifest = {
+            'created_at': datetime.now().isoformat(),
+            'complete': complete,
+            'cutoff': self.cutoff,
+            'total_rows': self.total_rows,
+            'fields': self.fields,
+            'files': self.files if files is None else files,
+        }
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return path
+
+    def close(self, complete: bool = True):
+        """
+        열린 파일을 닫고 manifest.json을 작성합니다.
+        중간에 실패한 경우 complete=False로 닫아 일부만 기록된 아카이브임을 남깁니다.
+        """
+        self._close_month()
+        return self.write_manifest(complete)
+
+
+def read_manifest(directory: str) -> dict:
+    """아카이브 디렉토리의 manifest.json을 읽습니다. 없으면 None을 반환합니다."""
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def overlaps(info: dict, date_from: str = None, date_to: str = None) -> bool:
+    """
+    manifest의 파일 정보가 [date_from, date_to] (YYYY-MM-DD, 양 끝 포함) 범위와 겹치는지 확인합니다.
+    """
+    if date_from and (info.get('max_created_at') or '')[:10] < date_from:
+        return False
+    if date_to and (info.get('min_created_at') or '9999')[:10] > date_to:
+        return False
+    return True
+
+
+def select_archive_files(directory: str, date_from: str = None, date_to: str = None) -> list:
+    """
+    아카이브 디렉토리에서 날짜 범위와 겹치는 파일 정보(manifest 항목)만 골라 반환합니다.
+    각 항목에는 전체 경로가 'path'로 추가됩니다.
+    """
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"{MANIFEST_FILE}이 없습니다: {directory}")
+
+    selected = []
+    for info in manifest.get('files', []):
+        if overlaps(info, date_from, date_to):
+            selected.append(dict(info, path=os.path.join(directory, info['file'])))
+    return selected
+
+
+def open_archive_text(path: str):
+    """.csv 또는 .csv.gz 파일을 텍스트 모드로 엽니다."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def iter_archive_rows(path: str, date_from: str = None, date_to: str = None):
+    """
+    아카이브 파일을 한 행씩 읽어 decode_row()한 결과를 yield합니다.
+    날짜 범위를 주면 created_at이 범위 밖인 행은 건너뜁니다.
+
+    아카이빙 중 강제 종료되어 gzip 파일 끝이 잘려 있으면, 잘리기 전까지의 행만 읽고 멈춥니다
+    (flush()한 행은 완결된 gzip 멤버에 있으므로 모두 읽힘).
+    """
+    with open_archive_text(path) as f:
+        reader = csv.DictReader(f)
+        while True:
+            try:
+                row = next(reader)
+            except StopIteration:
+                return
+            except EOFError:
+                # 마지막 gzip 멤버의 트레일러가 없음 (잘린 꼬리의 불완전한 행은 버림)
+                return
+            day = (row.get('created_at') or '')[:10]
+            if date_from and day < date_from:
+                continue
+            if date_to and day > date_to:
+                continue
+            yield decode_row(row)
@@ -0,0 +1,333 @@
+"""
+기사 링크 정규화 (추적 파라미터 제거 + 리디렉션 래퍼 해제)
+
+두 Google News 검색 피드는 같은 기사를 서로 다른 news.google.com 링크로 돌려줍니다.
+링크를 언론사 원문 URL로 바꾸어 두면, 같은 기사인지 링크 비교(키 조회)만으로 알 수 있습니다.
+
+    1. utm_* 같은 추적 파라미터와 앵커용 #fragment 제거(해시 라우팅 #/... 는 유지), scheme / host 소문자화
+    2. 래퍼 호스트(REDIRECT_WRAPPER_HOSTS) 링크는 원문 URL로 해제
+       - Google News의 예전 형식 기사 id는 base64 안에 원문 URL이 들어 있어 요청 없이 해제
+       - 그 외에는 공용 HTTP 세션으로 래퍼 호스트를 벗어날 때까지 리디렉션을 따라가고,
+         HTML 응답이면 meta refresh / data-n-au(Google News의 원문 링크 속성)에서 원문 URL을 찾음
+    3. 해제 결과는 SQLite 캐시(RESOLVED_LINKS_DB)에 TTL과 함께 저장해 링크마다 한 번만 요청
+"""
+import base64
+import binascii
+import html
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import unquote, urljoin, urlsplit, urlunsplit
+
+from gamenews.seen_links import link_key, route_fragment
+
+RESOLVED_LINKS_DB = os.getenv("RESOLVED_LINKS_DB", ".cache/resolved_links.sqlite")
+RESOLVED_LINKS_TTL_DAYS = int(os.getenv("RESOLVED_LINKS_TTL_DAYS", "30"))
+RESOLVE_RETRY_HOURS = int(os.getenv("RESOLVE_RETRY_HOURS", "6"))   # 해제에 실패한 링크를 다시 시도할 때까지
+RESOLVE_WORKERS = int(os.getenv("RESOLVE_WORKERS", "8"))
+RESOLVE_REDIRECTS = os.getenv("RESOLVE_REDIRECTS", "1") != "0"    # 0이면 HTTP 요청 없이 base64 해제만
+REDIRECT_WRAPPER_HOSTS = frozenset(
+    host.strip().lower()
+    for host in os.getenv("REDIRECT_WRAPPER_HOSTS", "news.google.com").split(",")
+    if host.strip()
+)
+
+# 추적용으로만 쓰이는 쿼리 파라미터
+TRACKING_PARAMS = frozenset({
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    'ocid', 'cmpid', 'ref_src', 'spm', '_ga', '_gl', 'oc',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+# HTML 본문에서 원문 URL을 찾을 때 읽는 최대 바이트
+_MAX_BODY_BYTES = 256 * 1024
+_GOOGLE_ARTICLE_PATH = re.compile(r'^/(?:rss/)?articles/([A-Za-z0-9_-]+)')
+_META_REFRESH = re.compile(
+    r'<meta[^>]+http-equiv=["\']?refresh["\']?[^>]+content=["\'][^"\']*url=([^"\'>]+)', re.IGNORECASE)
+_DATA_N_AU = re.compile(r'data-n-au=["\']([^"\']+)["\']')
+
+
+def is_tracking_param(name: str) -> bool:
+    """쿼리 파라미터 이름(퍼센트 인코딩 해제 전)이 추적용인지 확인합니다."""
+    name = unquote(name).lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def strip_tracking(url: str) -> str:
+    """
+    추적 파라미터와 문서 안 위치만 가리키는 #fragment를 제거하고 scheme / host를 소문자로 바꿉니다.
+    해시 라우팅 사이트의 #/article/123 같은 fragment는 기사를 구분하므로 남깁니다.
+
+    쿼리는 &로 나눈 조각 중 추적 파라미터만 빼고 나머지를 바이트 그대로 이어 붙입니다.
+    parse_qsl + urlencode로 다시 만들면 %20이 +로, 값 없는 flag가 flag=로 바뀌어 다른 URL이 됩니다.
+    """
+    if not url:
+        return ""
+
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+
+    query = parts.query
+    if query:
+        query = '&'.join(
+            segment for segment in query.split('&')
+            if not is_tracking_param(segment.split('=', 1)[0])
+        )
+
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query,
+                       route_fragment(parts.fragment)))
+
+
+def decode_google_news_url(url: str):
+    """
+    예전 형식의 Google News 기사 링크(id가 "CBMi..."로 시작)에서 원문 URL을 꺼냅니다.
+    id는 base64로 인코딩된 protobuf이고 첫 문자열 필드(0x22)가 원문 URL입니다.
+    원문 URL이 들어 있지 않은 새 형식이면 None을 반환합니다.
+    """
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    if parts.netloc.lower() != 'news.google.com':
+        return None
+
+    match = _GOOGLE_ARTICLE_PATH.match(parts.path)
+    if not match:
+        return None
+
+    article_id = match.group(1)
+    try:
+        raw = base64.urlsafe_b64decode(article_id + '=' * (-len(article_id) % 4))
+    except (binascii.Error, ValueError):
+        return None
+
+    # 0x08 0x13 (필드 1) 뒤에 0x22(필드 4, 문자열) + varint 길이 + URL
+    if not raw.startswith(b'\x08\x13\x22'):
+        return None
+
+    length = 0
+    shift = 0
+    position = 3
+    while position < len(raw):
+        byte = raw[position]
+        position += 1
+        length |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            break
+
+    try:
+        decoded = raw[position:position + length].decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+    return decoded if decoded.startswith(('http://', 'https://')) else None
+
+
+def find_target_in_html(body: str):
+    """래퍼 페이지 HTML에서 원문 URL(data-n-au 속성, meta refresh)을 찾습니다."""
+    for pattern in (_DATA_N_AU, _META_REFRESH):
+        match = pattern.search(body)
+        if match:
+            target = html.unescape(match.group(1)).strip()
+            if target.startswith(('http://', 'https://')):
+                return target
+    return None
+
+
+class ResolvedLinkCache:
+    """
+    래퍼 링크 -> 원문 URL을 SQLite에 저장합니다.
+    성공한 결과는 ttl_days, 실패한 결과는 retry_hours 동안 유효합니다.
+    """
+
+    def __init__(self, path: str = RESOLVED_LINKS_DB, ttl_days: int = RESOLVED_LINKS_TTL_DAYS,
+                 retry_hours: int = RESOLVE_RETRY_HOURS):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.retry_seconds = retry_hours * 3600
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        try:
+            self._conn = self._open()
+        except sqlite3.DatabaseError:
+            # 손상된 캐시는 버리고 새로 만듦
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            self._conn = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS resolved_links ("
+            " key INTEGER PRIMARY KEY,"
+            " target TEXT,"
+            " resolved_at INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_resolved_links_at ON resolved_links(resolved_at)")
+        return conn
+
+    def get_many(self, links) -> dict:
+        """
+        캐시에 있는 링크만 {링크: 원문 URL 또는 None(최근에 실패)}으로 반환합니다.
+        만료된 항목은 없는 것으로 취급합니다.
+        """
+        now = time.time()
+        found = {}
+        keys = {link_key(link): link for link in links}
+        items = list(keys.items())
+
+        # SQLite 변수 개수 제한을 넘지 않도록 나눠서 조회
+        for i in range(0, len(items), 500):
+            chunk = items[i:i + 500]
+            rows = self._conn.execute(
+                f"SELECT key, target, resolved_at FROM resolved_links WHERE key IN ({','.join('?' * len(chunk))})",
+                [key for key, _ in chunk],
+            ).fetchall()
+            for key, target, resolved_at in rows:
+                ttl = self.ttl_seconds if target else self.retry_seconds
+                if resolved_at >= now - ttl:
+                    found[keys[key]] = target
+        return found
+
+    def put_many(self, resolved: dict):
+        """{링크: 원문 URL 또는 None(실패)}을 저장합니다."""
+        timestamp = int(time.time())
+        self._conn.executemany(
+            "INSERT INTO resolved_links (key, target, resolved_at) VALUES (?, ?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET target = excluded.target, resolved_at = excluded.resolved_at",
+            [(link_key(link), target, timestamp) for link, target in resolved.items()],
+        )
+
+    def purge_expired(self) -> int:
+        """성공 결과 TTL이 지난 항목을 삭제하고 삭제한 개수를 반환합니다."""
+        cursor = self._conn.execute(
+            "DELETE FROM resolved_links WHERE resolved_at < ?", (int(time.time() - self.ttl_seconds),)
+        )
+        return cursor.rowcount
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+class LinkCanonicalizer:
+    """
+    사용 예:
+        canonicalizer = LinkCanonicalizer(ResolvedLinkCache())
+        canonical = canonicalizer.canonicalize_many(links)   # {원래 링크: 정규화한 링크}
+        canonicalizer.cache.commit()
+
+    resolve=False이면 HTTP 요청 없이 추적 파라미터 제거와 base64 해제만 합니다.
+    """
+
+    def __init__(self, cache: ResolvedLinkCache = None, wrapper_hosts=REDIRECT_WRAPPER_HOSTS,
+                 resolve: bool = RESOLVE_REDIRECTS, max_workers: int = RESOLVE_WORKERS, session=None):
+        self.cache = cache
+        self.wrapper_hosts = frozenset(host.lower() for host in wrapper_hosts)
+        self.resolve = resolve
+        self.max_workers = max_workers
+        self._session = session
+        self.requests = 0        # 이번 인스턴스가 보낸 HTTP 해제 요청 수
+        self._requests_lock = threading.Lock()    # resolve_over_http는 RESOLVE_WORKERS 스레드에서 동시에 실행됨
+
+    @property
+    def session(self):
+        if self._session is None:
+            from gamenews.http import get_session
+            self._session = get_session()
+        return self._session
+
+    def is_wrapper(self, url: str) -> bool:
+        try:
+            return (urlsplit(url).hostname or '') in self.wrapper_hosts
+        except ValueError:
+            return False
+
+    def resolve_over_http(self, url: str, max_hops: int = 5):
+        """
+        래퍼 링크의 리디렉션(Location)을 직접 따라가다가 래퍼 호스트를 벗어나는 순간의 URL을 반환합니다.
+        언론사 페이지 자체는 요청하지 않습니다. 래퍼 페이지가 200으로 HTML을 돌려주면 본문에서 원문 URL을 찾고,
+        그래도 없거나 요청이 실패하면 None을 반환합니다.
+        """
+        for _ in range(max_hops):
+            with self._requests_lock:
+                self.requests += 1
+            try:
+                with self.session.get(url, allow_redirects=False, stream=True) as response:
+                    location = response.headers.get('Location')
+                    if response.is_redirect and location:
+                        url = urljoin(url, location)
+                        if not self.is_wrapper(url):
+                            return url
+                        continue
+
+                    if response.status_code >= 400 or 'html' not in response.headers.get('Content-Type', ''):
+                        return None
+                    body = response.raw.read(_MAX_BODY_BYTES, decode_content=True)
+                    return find_target_in_html(body.decode(response.encoding or 'utf-8', errors='replace'))
+            except Exception:
+                return None
+        return None
+
+    def _resolve_wrapper(self, url: str):
+        return decode_google_news_url(url) or (self.resolve_over_http(url) if self.resolve else None)
+
+    def canonicalize(self, url: str) -> str:
+        return self.canonicalize_many([url]).get(url, strip_tracking(url))
+
+    def canonicalize_many(self, urls) -> dict:
+        """
+        링크들을 정규화해 {원래 링크: 정규화한 링크}로 반환합니다.
+        래퍼 링크는 캐시를 먼저 보고, 없는 것만 스레드 풀에서 동시에 해제합니다.
+        해제하지 못한 래퍼 링크는 추적 파라미터만 제거한 링크를 그대로 씁니다.
+        """
+        result = {}
+        wrappers = []
+        for url in dict.fromkeys(url for url in urls if url):
+            stripped = strip_tracking(url)
+            result[url] = stripped
+            if self.is_wrapper(stripped):
+                wrappers.append(url)
+
+        if not wrappers:
+            return result
+
+        cached = self.cache.get_many(wrappers) if self.cache is not None else {}
+        missing = [url for url in wrappers if url not in cached]
+
+        resolved = {}
+        if missing:
+            workers = max(1, min(self.max_workers, len(missing)))
+            if workers == 1:
+                resolved = {url: self._resolve_wrapper(url) for url in missing}
+            else:
+                from concurrent.futures import ThreadPoolExecutor
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    resolved = dict(zip(missing, executor.map(self._resolve_wrapper, missing)))
+
+            # HTTP로 해제하지 않는 설정에서 base64로도 못 푼 링크는 실패로 기록하지 않음 (설정을 바꾸면 다시 시도)
+            to_cache = resolved if self.resolve else {url: target for url, target in resolved.items() if target}
+            if self.cache is not None and to_cache:
+                self.cache.put_many(to_cache)
+
+        for url in wrappers:
+            target = cached.get(url) or resolved.get(url)
+            if target:
+                result[url] = strip_tracking(target)
+
+        return result
@@ -0,0 +1,148 @@
+"""
+데이터베이스 용량 기록과 증가 추세 예측
+
+check_db_capacity.py는 실행할 때마다 용량 스냅샷을 JSON Lines 파일에 한 줄씩 남깁니다.
+
+    {"taken_at": 1735689600, "source": "rpc", "rows": 152340, "posts_mb": 96.1, "total_mb": 131.8, ...}
+
+쌓인 스냅샷에 최소제곱 직선을 맞춰 하루 증가량을 구하고, 경고 / 위험 기준에 도달하는 날짜와
+사용량을 기준 아래로 유지하는 ARCHIVE_MONTHS 값을 계산합니다.
+"""
+import json
+import os
+import time
+
+CAPACITY_HISTORY_FILE = os.getenv("CAPACITY_HISTORY_FILE", ".cache/capacity_history.jsonl")
+HISTORY_MAX_SNAPSHOTS = 1000
+FORECAST_WINDOW_DAYS = 90       # 추세 계산에 사용할 최근 스냅샷 범위
+
+# JSON으로 직렬화한 행 크기 -> 실제 저장 크기 (튜플 헤더, 인덱스, 페이지 여유 공간, TOAST 등) 보정 배수
+STORAGE_OVERHEAD = 1.6
+DEFAULT_ROW_BYTES = 600         # 표본이 없을 때 가정하는 행 크기
+
+SECONDS_PER_DAY = 86400
+DAYS_PER_MONTH = 30             # archive_old_posts.py와 같은 기준 (ARCHIVE_MONTHS * 30일)
+
+
+class CapacityHistory:
+    """용량 스냅샷을 JSON Lines 파일에 추가하고 읽습니다."""
+
+    def __init__(self, path: str = CAPACITY_HISTORY_FILE, max_snapshots: int = HISTORY_MAX_SNAPSHOTS):
+        self.path = path
+        self.max_snapshots = max_snapshots
+
+    def load(self) -> list:
+        """저장된 스냅샷을 오래된 것부터 반환합니다. 손상된 줄은 건너뜁니다."""
+        snapshots = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        snapshot = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(snapshot, dict) and 'taken_at' in snapshot:
+                        snapshots.append(snapshot)
+        except OSError:
+            return []
+        snapshots.sort(key=lambda snapshot: snapshot['taken_at'])
+        return snapshots
+
+    def append(self, snapshot: dict):
+        """
+        스냅샷을 한 줄 추가합니다. max_snapshots를 넘으면 오래된 줄을 지우고
+        임시 파일에 다시 쓴 뒤 교체합니다.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        line = json.dumps(snapshot, ensure_ascii=False) + '\n'
+        snapshots = self.load()
+        if len(snapshots) < self.max_snapshots:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+            return
+
+        kept = snapshots[-(self.max_snapshots - 1):]
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for old in kept:
+                f.write(json.dumps(old, ensure_ascii=False) + '\n')
+            f.write(line)
+        os.replace(tmp_path, self.path)
+
+
+def estimate_row_bytes(rows: list, overhead: float = STORAGE_OVERHEAD) -> float:
+    """
+    표본 행의 JSON 크기 평균에 저장 오버헤드를 곱해 행 하나가 차지하는 바이트를 추정합니다.
+    표본이 없으면 DEFAULT_ROW_BYTES를 반환합니다.
+    """
+    if not rows:
+        return float(DEFAULT_ROW_BYTES)
+
+    total = sum(len(json.dumps(row, ensure_ascii=False, default=str).encode('utf-8')) for row in rows)
+    return total / len(rows) * overhead
+
+
+def linear_fit(points: list):
+    """
+    (x, y) 점들에 최소제곱 직선을 맞춰 (기울기, 절편)을 반환합니다.
+    점이 두 개 미만이거나 x가 모두 같으면 None을 반환합니다.
+    """
+    if len(points) < 2:
+        return None
+
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    variance = sum((x - mean_x) ** 2 for x, _ in points)
+    if variance == 0:
+        return None
+
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / variance
+    return slope, mean_y - slope * mean_x
+
+
+def growth_per_day(snapshots: list, key: str, window_days: int = FORECAST_WINDOW_DAYS, now: float = None):
+    """
+    최근 window_days 안의 스냅샷에서 key 값(예: 'total_mb', 'rows')의 하루 증가량을 구합니다.
+    스냅샷이 하루 이상 떨어진 두 개 이상 없으면 None을 반환합니다.
+    """
+    now = time.time() if now is None else now
+    points = [
+        (snapshot['taken_at'] / SECONDS_PER_DAY, float(snapshot[key]))
+        for snapshot in snapshots
+        if snapshot.get(key) is not None and snapshot['taken_at'] >= now - window_days * SECONDS_PER_DAY
+    ]
+    if len(points) < 2 or points[-1][0] - points[0][0] < 1:
+        return None
+
+    fit = linear_fit(points)
+    return fit[0] if fit else None
+
+
+def days_until(current: float, limit: float, per_day: float):
+    """current가 하루 per_day씩 늘어 limit에 도달하기까지 남은 일수 (이미 넘었으면 0, 줄고 있으면 None)"""
+    if current >= limit:
+        return 0.0
+    if not per_day or per_day <= 0:
+        return None
+    return (limit - current) / per_day
+
+
+def recommend_archive_months(limit_mb: float, other_mb: float, rows_per_day: float, row_bytes: float,
+                             max_months: int = 24):
+    """
+    오래된 게시물을 ARCHIVE_MONTHS개월마다 정리할 때 posts에 남는 행은 약 rows_per_day * months * 30개입니다.
+    posts 외 크기(other_mb)와 합쳐 limit_mb 아래에 머무는 가장 큰 개월 수(1 ~ max_months)를 반환합니다.
+    1개월로도 넘으면 0, 증가량을 모르면 None을 반환합니다.
+    """
+    if not rows_per_day or rows_per_day <= 0:
+        return None
+
+    mb_per_month = rows_per_day * DAYS_PER_MONTH * row_bytes / 1024 / 1024
+    budget = limit_mb - other_mb
+    if budget < mb_per_month:
+        return 0
+    return min(max_months, int(budget // mb_per_month))
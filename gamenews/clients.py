@@ -0,0 +1,25 @@
+"""
+Supabase 클라이언트 생성
+
+crawler.py와 scripts/*.py는 모두 이 함수로 클라이언트를 만들어
+같은 타임아웃 / 연결 풀 설정(gamenews/http.py)을 사용합니다.
+"""
+import os
+
+from supabase import Client, create_client
+from supabase.lib.client_options import SyncClientOptions
+
+from gamenews.http import create_httpx_client
+
+
+def create_supabase_client(url: str = None, key: str = None) -> Client:
+    """
+    Supabase 클라이언트를 만듭니다. url / key를 주지 않으면 SUPABASE_URL / SUPABASE_KEY를 사용합니다.
+    """
+    url = url or os.getenv("SUPABASE_URL")
+    key = key or os.getenv("SUPABASE_KEY")
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in environment variables")
+
+    options = SyncClientOptions(httpx_client=create_httpx_client())
+    return create_client(url, key, options=options)
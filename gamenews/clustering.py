@@ -0,0 +1,255 @@
+"""
+제목 + 요약의 문자 n-gram TF-IDF 벡터로 같은 사건을 다룬 기사를 하나의 스토리로 묶는 인덱스
+
+유사 제목 검사(near_duplicate.py)는 제목끼리 SequenceMatcher 80% 이상인 거의 같은 기사만 걸러내므로,
+언론사마다 제목을 다르게 쓴 같은 소식은 서로 다른 게시물로 저장됩니다.
+이 인덱스는 게시물을 지우지 않고, 같은 소식으로 보이는 게시물에 같은 cluster_id를 붙입니다.
+
+    - 제목 / 요약을 각각 문자 2~3-gram으로 나눠 2^20 차원에 해싱하고 (NumPy로 문서 전체를 한 번에 계산)
+      sublinear TF x IDF 희소 행렬(SciPy CSR)을 만든 뒤, 제목 60% : 요약 40%로 한 벡터에 이어 붙입니다.
+    - 코사인 유사도는 (최근 윈도우 + 새 항목) 행렬 x 새 항목 행렬의 희소 행렬 곱 한 번으로 계산합니다.
+    - 새 항목마다 자기보다 앞선 항목 중 가장 유사한 것이 CLUSTER_THRESHOLD 이상이면 그 스토리에 들어가고,
+      없으면 새 스토리를 시작합니다. 이미 저장된 게시물의 cluster_id는 바뀌지 않습니다.
+
+NumPy / SciPy가 설치되어 있지 않으면 CLUSTERING_AVAILABLE이 False이고 크롤러는 스토리 묶기를 건너뜁니다.
+"""
+import os
+import re
+import uuid
+from collections import deque
+
+try:
+    import numpy as np
+    from scipy import sparse
+    CLUSTERING_AVAILABLE = True
+except ImportError:
+    CLUSTERING_AVAILABLE = False
+
+CLUSTER_THRESHOLD = float(os.getenv("CLUSTER_THRESHOLD", "0.3"))
+
+TITLE_WEIGHT = 0.6          # 코사인 유사도에서 제목이 차지하는 비중 (나머지는 요약)
+NGRAM_RANGE = (2, 3)        # 한국어는 음절 2-gram, 영어는 3-gram이 주로 겹침
+HASH_BITS = 20              # 제목 / 요약 n-gram을 각각 해싱할 차원 수 (2^20)
+MAX_DF = 0.05               # 이 비율보다 많은 문서에 나오는 n-gram은 무시
+MIN_DF_CUTOFF = 20          # 문서가 적을 때는 이 수까지는 무시하지 않음
+SIMILARITY_BLOCK = 2048     # 유사도 행렬을 한 번에 계산할 새 항목 수 (메모리 상한)
+IDF_REFRESH = 0.25          # IDF를 계산한 뒤 항목이 이 비율만큼 늘면 IDF와 윈도우 벡터를 다시 계산
+
+_PRIME = 0x100000001B3      # 문자 코드를 이어 붙이는 곱 (FNV prime)
+_MIX = 0x9E3779B97F4A7C15   # 해시 값을 고르게 섞는 곱 (golden ratio)
+
+# 문장 부호를 공백으로 (문서 구분자 \0은 남김)
+_NON_WORD = re.compile(r'[^\w\0]+|_+')
+
+
+def hash_ngrams(texts: list, ngram_range: tuple = NGRAM_RANGE, bits: int = HASH_BITS):
+    """
+    문자열 목록의 문자 n-gram을 (문서 번호, 해시 열 번호) 배열 쌍으로 만듭니다.
+    문서를 구분자(\\0)로 이어 붙여 한 번에 소문자 / 문장 부호 정리를 하고, 코드 포인트 배열에서
+    모든 위치의 n-gram 해시를 한 번에 계산한 뒤 문서 경계를 넘는 n-gram만 마스크로 버립니다
+    (문서마다 Python 루프를 돌지 않음).
+    """
+    texts = _NON_WORD.sub(' ', '\0'.join(text.replace('\0', ' ') for text in texts).lower()).split('\0')
+
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer('\0'.join(texts).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    starts = np.zeros(len(texts), dtype=np.int64)
+    np.cumsum(lengths[:-1] + 1, out=starts[1:])
+    doc_of = np.repeat(np.arange(len(texts)), lengths + 1)[:len(codes)]
+    room = lengths[doc_of] - (np.arange(len(codes)) - starts[doc_of])    # 위치부터 문서 끝까지 남은 문자 수
+
+    rows, cols = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.int64)]
+    shift = np.uint64(64 - bits)
+    for n in range(ngram_range[0], ngram_range[1] + 1):
+        count = len(codes) - n + 1
+        if count <= 0:
+            continue
+        hashes = codes[:count].copy()
+        for k in range(1, n):
+            hashes *= np.uint64(_PRIME)
+            hashes += codes[k:k + count]
+        hashes ^= np.uint64(n)
+        hashes *= np.uint64(_MIX)
+
+        valid = room[:count] >= n
+        rows.append(doc_of[:count][valid])
+        cols.append((hashes[valid] >> shift).astype(np.int64))
+    return np.concatenate(rows), np.concatenate(cols)
+
+
+def term_frequencies(items: list, bits: int = HASH_BITS):
+    """
+    (제목, 요약) 목록을 (문서 수 x 2^(bits+1)) sublinear TF(1 + log tf) CSR 행렬로 만듭니다.
+    앞 2^bits 열은 제목 n-gram, 뒤 2^bits 열은 요약 n-gram입니다.
+    """
+    shape = (len(items), 2 << bits)
+    if not items:
+        return sparse.csr_matrix(shape, dtype=np.float32)
+
+    title_rows, title_cols = hash_ngrams([item[0] or '' for item in items], bits=bits)
+    summary_rows, summary_cols = hash_ngrams([item[1] or '' for item in items], bits=bits)
+    rows = np.concatenate([title_rows, summary_rows])
+    cols = np.concatenate([title_cols, summary_cols + (1 << bits)])
+
+    # COO -> CSR 변환에서 같은 (문서, n-gram)의 1이 더해져 빈도가 됨
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=shape)
+    matrix.sum_duplicates()
+    np.log(matrix.data, out=matrix.data)
+    matrix.data += 1
+    return matrix
+
+
+def document_frequencies(matrix):
+    """n-gram마다 나온 문서 수"""
+    return np.bincount(matrix.indices, minlength=matrix.shape[1])
+
+
+def inverse_document_frequency(df, n_docs: int, max_df: float = MAX_DF):
+    """
+    smooth IDF. 문서의 max_df 비율(최소 MIN_DF_CUTOFF개)보다 많은 문서에 나오는 n-gram('게임', ' th' 등)은 0입니다.
+    이런 n-gram은 IDF가 낮아 유사도에 거의 기여하지 않지만, 남겨 두면 거의 모든 문서 쌍이 곱에 들어가
+    희소 행렬 곱이 사실상 밀집 행렬 곱이 됩니다.
+    """
+    idf = np.log1p(df, dtype=np.float32)
+    np.subtract(np.float32(np.log1p(n_docs) + 1), idf, out=idf)
+    idf[df > max(max_df * n_docs, MIN_DF_CUTOFF)] = 0
+    return idf
+
+
+def story_vectors(frequencies, idf, title_weight: float = TITLE_WEIGHT, bits: int = HASH_BITS):
+    """
+    TF 행렬에 IDF를 곱하고, 제목 / 요약 부분을 각각 L2 정규화해 [√w·제목, √(1-w)·요약]으로 만든 뒤 다시 정규화합니다.
+    두 문서 모두 요약이 있으면 코사인 = w·제목 코사인 + (1-w)·요약 코사인이고,
+    요약이 비어 있는 문서는 제목만으로 비교됩니다. IDF가 0인 n-gram은 행렬에서 뺍니다.
+    """
+    matrix = sparse.csr_matrix((frequencies.data * idf[frequencies.indices], frequencies.indices,
+                                frequencies.indptr), shape=frequencies.shape)
+    matrix.eliminate_zeros()
+
+    n_docs = matrix.shape[0]
+    rows = np.repeat(np.arange(n_docs, dtype=np.int32), np.diff(matrix.indptr))
+    is_summary = matrix.indices >= (1 << bits)
+    squares = matrix.data * matrix.data
+    summary_norms = np.sqrt(np.bincount(rows, weights=squares * is_summary, minlength=n_docs))
+    title_norms = np.sqrt(np.maximum(np.bincount(rows, weights=squares, minlength=n_docs) - summary_norms ** 2, 0))
+
+    # 비어 있지 않은 부분의 비중 합으로 다시 나눠 행 노름을 1로 맞춤
+    totals = np.sqrt(title_weight * (title_norms > 0) + (1 - title_weight) * (summary_norms > 0))
+    title_norms[title_norms == 0] = 1
+    summary_norms[summary_norms == 0] = 1
+    totals[totals == 0] = 1
+    scales = np.stack([np.sqrt(title_weight) / (title_norms * totals),
+                       np.sqrt(1 - title_weight) / (summary_norms * totals)], axis=1).astype(np.float32)
+    matrix.data *= scales[rows, is_summary.view(np.int8)]
+    return matrix
+
+
+def best_earlier_match(similarity, offset: int, threshold: float):
+    """
+    similarity[i, j]는 corpus의 offset + i번째 항목과 j번째 항목의 코사인 유사도입니다 (COO).
+    i마다 자기보다 앞선(j < offset + i) 항목 중 threshold 이상으로 가장 유사한 j를, 없으면 -1을 반환합니다.
+    """
+    keep = (similarity.col < similarity.row + offset) & (similarity.data >= threshold)
+    rows, cols, scores = similarity.row[keep], similarity.col[keep], similarity.data[keep]
+
+    best = np.full(similarity.shape[0], -1, dtype=np.int64)
+    if len(rows):
+        # 행마다 점수가 가장 높은 것 (같으면 더 최근 항목)
+        order = np.lexsort((-cols, -scores, rows))
+        first = np.unique(rows[order], return_index=True)[1]
+        best[rows[order][first]] = cols[order][first]
+    return best
+
+
+class StoryIndex:
+    """
+    최근 게시물의 n-gram TF 행렬과 cluster_id를 들고, 새 기사 묶음에 cluster_id를 붙이는 인덱스입니다.
+
+    사용 예:
+        index = StoryIndex(threshold=0.3, max_size=20000)
+        index.extend([(cluster_id, title, summary), ...])        # 최근 윈도우 (오래된 것부터)
+        index.assign([(title, summary), ...])                   # -> [cluster_id, ...] (새 항목도 인덱스에 추가)
+
+    IDF는 윈도우 + 새 항목 전체의 n-gram별 문서 수로 계산하고, 그 IDF로 만든 윈도우 벡터를 재사용합니다.
+    실행 중 저장하는 500개 묶음마다 윈도우 전체를 다시 가중하지 않도록, IDF를 계산한 뒤 항목이
+    IDF_REFRESH 비율만큼 늘었을 때만 다시 계산합니다 (그 사이 새 항목은 기존 IDF로 가중).
+    max_size를 넘으면 가장 오래된 항목부터 제거합니다.
+    """
+
+    def __init__(self, threshold: float = CLUSTER_THRESHOLD, max_size: int = None,
+                 title_weight: float = TITLE_WEIGHT):
+        self.threshold = threshold
+        self.max_size = max_size
+        self.title_weight = title_weight
+        self._cluster_ids = deque()
+        self._frequencies = term_frequencies([])
+        self._df = document_frequencies(self._frequencies)
+        self._vectors = None        # 항목별 story_vectors (IDF를 다시 계산해야 하면 None)
+        self._idf = None
+        self._idf_docs = 0          # IDF를 계산할 때의 항목 수
+
+    def __len__(self) -> int:
+        return len(self._cluster_ids)
+
+    def __iter__(self):
+        """인덱스에 있는 항목의 cluster_id (오래된 것부터)"""
+        return iter(self._cluster_ids)
+
+    def _append(self, cluster_ids: list, frequencies, vectors=None):
+        self._cluster_ids.extend(cluster_ids)
+        self._frequencies = sparse.vstack([self._frequencies, frequencies], format='csr')
+        self._df += document_frequencies(frequencies)
+        self._vectors = vectors
+
+        excess = len(self._cluster_ids) - self.max_size if self.max_size is not None else 0
+        if excess > 0:
+            for _ in range(excess):
+                self._cluster_ids.popleft()
+            self._df -= document_frequencies(self._frequencies[:excess])
+            self._frequencies = self._frequencies[excess:]
+            if self._vectors is not None:
+                self._vectors = self._vectors[excess:]
+
+    def extend(self, items):
+        """(cluster_id, 제목, 요약)을 비교 없이 추가합니다 (DB에서 읽은 최근 게시물)."""
+        items = list(items)
+        if items:
+            self._append([item[0] for item in items], term_frequencies([item[1:] for item in items]))
+
+    def assign(self, items) -> list:
+        """
+        (제목, 요약) 목록에 cluster_id를 붙여 반환하고 인덱스에 추가합니다.
+        앞선 항목(윈도우 + 같은 목록의 앞 항목) 중 가장 유사한 것이 threshold 이상이면 그 cluster_id를,
+        아니면 새 UUID를 씁니다.
+        """
+        items = list(items)
+        if not items:
+            return []
+
+        frequencies = term_frequencies(items)
+        offset = len(self._cluster_ids)
+        n_docs = offset + len(items)
+        if self._vectors is None or n_docs > self._idf_docs * (1 + IDF_REFRESH):
+            self._idf = inverse_document_frequency(self._df + document_frequencies(frequencies), n_docs)
+            self._idf_docs = n_docs
+            self._vectors = story_vectors(self._frequencies, self._idf, self.title_weight)
+        corpus = sparse.vstack([self._vectors, story_vectors(frequencies, self._idf, self.title_weight)],
+                               format='csr')
+
+        best = np.empty(len(items), dtype=np.int64)
+        for start in range(offset, n_docs, SIMILARITY_BLOCK):
+            end = min(start + SIMILARITY_BLOCK, n_docs)
+            # (전체 x 새 항목) 곱은 큰 전체 행렬을 전치하지 않고 작은 새 항목 행렬만 전치함
+            similarity = (corpus @ corpus[start:end].T).T.tocoo()
+            best[start - offset:end - offset] = best_earlier_match(similarity, start, self.threshold)
+
+        # 가장 유사한 항목은 항상 앞선 항목이므로, 순서대로 채우면 같은 목록 안의 연결도 이어짐
+        cluster_ids = list(self._cluster_ids)
+        assigned = []
+        for match in best.tolist():
+            cluster_id = cluster_ids[match] if match >= 0 else str(uuid.uuid4())
+            cluster_ids.append(cluster_id)
+            assigned.append(cluster_id)
+
+        self._append(assigned, frequencies, corpus)
+        return assigned
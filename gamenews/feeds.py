@@ -0,0 +1,172 @@
+"""
+피드 목록(config/feeds.json)과 피드별 커서
+
+피드 목록 형식:
+
+    [
+      {"name": "게임 산업 (Industry)", "url": "https://...", "category": "Industry"},
+      {"name": "조용한 피드", "url": "https://...", "category": "Dev", "max_entries": 50, "enabled": false}
+    ]
+
+    - name, category: 생략하면 url / "Industry"
+    - max_entries: 한 번에 처리할 최대 항목 수 (선택). 넘는 항목은 다음 실행에서 이어서 처리
+    - enabled: false면 건너뜀
+
+커서는 피드마다 "마지막으로 처리한 항목의 발행 시각"과 "최근에 처리한 항목 id(guid)"를 저장합니다.
+다음 실행에서는 처리한 적 없는 id의 항목만 처리하므로, 바쁜 피드의 새 기사를 놓치지 않고
+조용한 피드의 오래된 기사를 다시 처리하지 않습니다. 발행 시각은 여유 시간(FEED_CURSOR_SLACK_HOURS)을 두고
+그보다 훨씬 오래된 항목만 거르므로, 관련도 순으로 정렬되는 피드(Google News 검색)에 늦게 올라온
+이전 날짜의 기사도 놓치지 않습니다.
+"""
+import calendar
+import json
+import os
+
+FEEDS_FILE = os.getenv(
+    "FEEDS_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "feeds.json"),
+)
+FEED_CURSORS_FILE = os.getenv("FEED_CURSORS_FILE", ".cache/feed_cursors.json")
+DEFAULT_CATEGORY = "Industry"
+CURSOR_MAX_IDS = 200    # 피드별로 기억할 최근 항목 id 수 (처리 여부 판단용)
+# 커서의 발행 시각보다 이만큼 이전까지의 항목은 id로만 판단 (늦게 색인되는 기사용)
+FEED_CURSOR_SLACK_HOURS = float(os.getenv("FEED_CURSOR_SLACK_HOURS", "72"))
+
+
+def load_feeds(path: str = FEEDS_FILE) -> list:
+    """
+    피드 목록 파일을 읽어 {'url', 'name', 'category', 'max_entries'} 목록으로 반환합니다.
+    enabled가 false인 피드와 중복 URL은 제외합니다.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    if not isinstance(entries, list):
+        raise ValueError(f"피드 목록은 JSON 배열이어야 합니다: {path}")
+
+    feeds = []
+    seen_urls = set()
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get('url'):
+            raise ValueError(f"{path}의 {i + 1}번째 피드에 url이 없습니다")
+        if entry.get('enabled', True) is False or entry['url'] in seen_urls:
+            continue
+
+        max_entries = entry.get('max_entries')
+        if max_entries is not None and (not isinstance(max_entries, int) or max_entries <= 0):
+            raise ValueError(f"{path}의 {entry['url']}: max_entries는 양의 정수여야 합니다")
+
+        seen_urls.add(entry['url'])
+        feeds.append({
+            'url': entry['url'],
+            'name': entry.get('name') or entry['url'],
+            'category': entry.get('category') or DEFAULT_CATEGORY,
+            'max_entries': max_entries,
+        })
+
+    return feeds
+
+
+def entry_id(entry) -> str:
+    """항목 식별자: guid(id)가 있으면 guid, 없으면 링크"""
+    return entry.get('id') or entry.get('link') or ''
+
+
+def entry_timestamp(entry):
+    """항목의 발행(없으면 수정) 시각을 UTC epoch 초로 반환합니다. 없으면 None."""
+    parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+    if not parsed:
+        return None
+    try:
+        return calendar.timegm(parsed)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def select_new_entries(entries, cursor: dict = None, max_entries: int = None,
+                       slack_hours: float = FEED_CURSOR_SLACK_HOURS):
+    """
+    처리한 적 없는 항목만 골라 오래된 것부터 반환합니다.
+
+    - 커서가 없으면(처음 보는 피드) 모든 항목
+    - 커서의 id 목록에 없는 항목. 피드가 날짜순이 아니어도(관련도 순) 이전 날짜의 새 항목을 처리
+    - 단, 발행 시각이 커서의 발행 시각 - slack_hours보다 이전인 항목은 오래된 항목으로 보고 건너뜀
+      (id 목록은 최근 CURSOR_MAX_IDS개만 기억하므로, 훨씬 오래된 항목이 다시 처리되지 않도록)
+
+    max_entries를 넘으면 가장 오래된 max_entries개만 반환하고, 나머지는 커서가 그만큼만
+    전진하므로 다음 실행에서 처리됩니다.
+
+    Returns:
+        (처리할 항목 목록, 커서보다 새로운 전체 항목 수)
+    """
+    cursor = cursor or {}
+    published = cursor.get('published')
+    known_ids = set(cursor.get('ids') or [])
+    oldest = published - slack_hours * 3600 if published is not None else None
+
+    new_entries = []
+    for position, entry in enumerate(entries):
+        ident = entry_id(entry)
+        if ident in known_ids:
+            continue
+        timestamp = entry_timestamp(entry)
+        if oldest is not None and timestamp is not None and timestamp < oldest:
+            continue
+        new_entries.append((timestamp, position, entry))
+
+    # 오래된 것부터. 발행 시각이 같거나 없는 항목(없는 항목은 마지막에)은 피드의 역순으로 정렬하는데,
+    # 피드는 보통 최신 항목이 위에 있으므로 역순이 곧 오래된 순서임.
+    # 오래된 것부터 처리해야 max_entries로 잘렸을 때 커서가 처리한 범위까지만 전진하고 남은 최신 항목이 다음 실행에서 처리됨
+    new_entries.sort(key=lambda item: (item[0] is None, item[0] or 0, -item[1]))
+    selected = [entry for _, _, entry in new_entries]
+
+    if max_entries is not None:
+        selected = selected[:max_entries]
+
+    return selected, len(new_entries)
+
+
+def advance_cursor(cursor: dict, processed) -> dict:
+    """처리한 항목을 반영한 새 커서를 반환합니다 (원래 커서는 바꾸지 않음)."""
+    cursor = cursor or {}
+    published = cursor.get('published')
+    ids = list(cursor.get('ids') or [])
+
+    for entry in processed:
+        timestamp = entry_timestamp(entry)
+        if timestamp is not None and (published is None or timestamp > published):
+            published = timestamp
+        ident = entry_id(entry)
+        if ident:
+            ids.append(ident)
+
+    return {'published': published, 'ids': list(dict.fromkeys(ids))[-CURSOR_MAX_IDS:]}
+
+
+class FeedCursorStore:
+    """피드 URL -> 커서를 JSON 파일에 저장합니다."""
+
+    def __init__(self, path: str = FEED_CURSORS_FILE):
+        self.path = path
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cursors = json.load(f)
+            self.cursors = cursors if isinstance(cursors, dict) else {}
+        except (OSError, ValueError):
+            self.cursors = {}
+
+    def get(self, url: str) -> dict:
+        return self.cursors.get(url)
+
+    def set(self, url: str, cursor: dict):
+        self.cursors[url] = cursor
+
+    def save(self):
+        """임시 파일에 쓴 뒤 교체하여 저장합니다."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.cursors, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,85 @@
+"""
+공용 HTTP 계층
+
+피드 수집과 Discord 알림은 하나의 requests.Session을, Supabase 클라이언트는 하나의 httpx.Client를
+사용해 연결을 재사용(keep-alive)합니다. 타임아웃, 호스트별 연결 수, 압축 설정은 이 파일에서만 조정합니다.
+
+    - Accept-Encoding: gzip, deflate (brotli 패키지가 설치되어 있으면 br 포함)
+    - 호스트별 최대 연결 수: HTTP_MAX_PER_HOST (초과 요청은 연결이 반납될 때까지 대기)
+    - 타임아웃: 연결 HTTP_CONNECT_TIMEOUT초, 읽기 HTTP_READ_TIMEOUT초
+"""
+import os
+import threading
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from gamenews.ratelimit import record_response
+
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "4"))
+HTTP_MAX_HOSTS = 16         # 연결 풀을 유지할 호스트 수
+SUPABASE_MAX_CONNECTIONS = int(os.getenv("SUPABASE_MAX_CONNECTIONS", "10"))
+
+USER_AGENT = "gameNews-crawler/1.0 (+https://github.com/bottlesun/gameNews)"
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """호스트별 연결 풀과 기본 타임아웃을 적용한 requests.Session"""
+
+    def __init__(self, timeout=(HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT),
+                 max_per_host: int = HTTP_MAX_PER_HOST):
+        super().__init__()
+        self.timeout = timeout
+
+        # pool_block=True: 호스트별 연결이 max_per_host개를 넘으면 새 연결을 만들지 않고 대기
+        adapter = HTTPAdapter(pool_connections=HTTP_MAX_HOSTS, pool_maxsize=max_per_host,
+                              pool_block=True, max_retries=0)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+        self.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept-Encoding': ACCEPT_ENCODING,
+        })
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def get_session() -> requests.Session:
+    """프로세스 전체에서 공유하는 HTTP 세션 (스레드 간 공유 가능)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = PooledSession()
+    return _session
+
+
+def create_httpx_client(max_connections: int = SUPABASE_MAX_CONNECTIONS) -> httpx.Client:
+    """
+    Supabase(PostgREST) 요청용 httpx.Client. h2 패키지가 있으면 HTTP/2로 요청을 다중화합니다.
+    응답마다 상태 / Retry-After를 기록해 gamenews/ratelimit.py가 재시도 여부를 판단합니다.
+    """
+    return httpx.Client(
+        timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=max_connections,
+                            max_keepalive_connections=max_connections),
+        http2=HTTP2_AVAILABLE,
+        follow_redirects=True,
+        event_hooks={'response': [record_response]},
+    )
@@ -0,0 +1,182 @@
+"""
+태그 / 스팸 키워드를 한 번에 찾는 Aho–Corasick 매처
+
+키워드 목록은 config/keywords/*.txt에서 읽어 모듈을 처음 사용할 때 한 번만 자동자(automaton)로 만듭니다.
+텍스트를 한 번만 훑어서 태그와 스팸 키워드를 함께 찾으므로, 키워드 수가 늘어나도
+검사 비용은 텍스트 길이에만 비례합니다.
+
+매칭 규칙은 기존 검사와 같습니다 (부분 문자열 일치, 텍스트는 소문자로 바꿔 비교).
+
+    - 태그: `keyword.lower() in text.lower()` ('Unity'/'AI' 같은 라틴 문자 키워드는 대소문자 무시)
+    - 스팸: `keyword in text.lower()` (키워드는 그대로 비교하므로 대문자가 들어간 키워드는 일치하지 않음)
+"""
+import hashlib
+import os
+from collections import deque
+
+KEYWORDS_DIR = os.getenv(
+    "KEYWORDS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "keywords"),
+)
+
+# 태그 파일 순서 = extract_tags 결과 순서
+TAG_FILES = ["companies.txt", "games.txt", "tech.txt", "genres.txt"]
+SPAM_FILE = "spam.txt"
+
+TAG = 0
+SPAM = 1
+
+
+def load_keyword_file(path: str) -> list:
+    """
+    키워드 파일을 읽습니다. '#'으로 시작하는 줄과 빈 줄은 무시하고,
+    줄 끝 공백은 키워드의 일부로 유지합니다 (예: '안마방 ').
+    """
+    keywords = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            keyword = line.rstrip('\r\n')
+            if not keyword.strip() or keyword.startswith('#'):
+                continue
+            keywords.append(keyword)
+    return keywords
+
+
+class AhoCorasick:
+    """
+    여러 패턴을 한 번의 순회로 찾는 Aho–Corasick 자동자입니다.
+    add()로 (패턴, 값)을 넣은 뒤 build()를 호출하면, find_all()이 텍스트에
+    나타난 모든 패턴(겹치는 경우 포함)의 값을 돌려줍니다.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self._built = False
+
+    def add(self, pattern: str, value):
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = nxt
+        self._output[node] = self._output[node] + (value,)
+        self._built = False
+
+    def build(self):
+        """실패 링크를 계산하고, 각 노드의 출력에 실패 경로의 출력을 합쳐 둡니다."""
+        goto, fail, output = self._goto, self._fail, self._output
+        queue = deque()
+        for child in goto[0].values():
+            fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                fail[child] = goto[state].get(ch, 0)
+                output[child] = output[child] + output[fail[child]]
+
+        self._built = True
+
+    def find_all(self, text: str) -> set:
+        """텍스트에 나타난 모든 패턴의 값을 집합으로 반환합니다."""
+        if not self._built:
+            self.build()
+
+        goto, fail, output = self._goto, self._fail, self._output
+        root = goto[0]
+        found = set()
+        node = 0
+        for ch in text:
+            if node:
+                while node and ch not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(ch, 0)
+            else:
+                # 루트에서 시작하지 못하는 문자는 바로 건너뜀 (대부분의 문자)
+                node = root.get(ch, 0)
+            if output[node]:
+                found.update(output[node])
+        return found
+
+
+class KeywordMatcher:
+    """
+    태그 키워드와 스팸 키워드를 하나의 자동자에 담아 한 번에 검사합니다.
+
+    match(text)는 (태그 목록, 스팸 키워드 목록)을 반환합니다.
+    태그는 키워드 파일에 적힌 순서대로, 중복 없이 원래 표기로 돌려줍니다.
+    """
+
+    def __init__(self, tag_keywords: list, spam_keywords: list):
+        self.tag_keywords = list(dict.fromkeys(tag_keywords))
+        self.spam_keywords = list(dict.fromkeys(spam_keywords))
+
+        self._automaton = AhoCorasick()
+        for order, keyword in enumerate(self.tag_keywords):
+            self._automaton.add(keyword.lower(), (TAG, order))
+        for order, keyword in enumerate(self.spam_keywords):
+            # 스팸 키워드는 기존 is_spam()처럼 소문자로 바꾸지 않고 비교
+            self._automaton.add(keyword, (SPAM, order))
+        self._automaton.build()
+
+    @classmethod
+    def from_directory(cls, directory: str = KEYWORDS_DIR):
+        tag_keywords = []
+        for filename in TAG_FILES:
+            tag_keywords.extend(load_keyword_file(os.path.join(directory, filename)))
+        spam_keywords = load_keyword_file(os.path.join(directory, SPAM_FILE))
+        return cls(tag_keywords, spam_keywords)
+
+    def match(self, text: str):
+        if not text:
+            return [], []
+
+        hits = sorted(self._automaton.find_all(text.lower()))
+        tags = [self.tag_keywords[order] for kind, order in hits if kind == TAG]
+        spam = [self.spam_keywords[order] for kind, order in hits if kind == SPAM]
+        return tags, spam
+
+
+_default_matcher = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """config/keywords의 키워드로 만든 기본 매처 (프로세스당 한 번만 생성)"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = KeywordMatcher.from_directory()
+    return _default_matcher
+
+
+def keywords_fingerprint(directory: str = KEYWORDS_DIR) -> str:
+    """키워드 파일 내용의 SHA-256 (키워드 목록이 바뀌었는지 확인용)"""
+    digest = hashlib.sha256()
+    for filename in TAG_FILES + [SPAM_FILE]:
+        digest.update(filename.encode('utf-8'))
+        with open(os.path.join(directory, filename), 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def classify_post(post: tuple) -> tuple:
+    """
+    (id, 제목, 요약)을 받아 (id, 태그 목록, 스팸 여부)를 반환합니다.
+    크롤러와 같은 텍스트(제목 + 공백 + 요약)를 검사하며, 프로세스 풀에서 실행할 수 있도록 최상위 함수로 둡니다.
+    """
+    post_id, title, summary = post
+    tags, spam = get_keyword_matcher().match(f"{title} {summary}")
+    return post_id, tags, bool(spam)
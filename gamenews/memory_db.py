@@ -0,0 +1,299 @@
+"""
+인프로세스 Supabase 대역 (메모리 기반 저장소)
+
+Supabase 저장소(gamenews/storage.py의 SupabasePostStore)가 사용하는 supabase-py 쿼리 빌더 호출
+(table().select/insert/upsert/delete, eq/lt/gte/in_/or_, order/limit/range, rpc)을
+메모리의 리스트로 흉내 냅니다. 벤치마크(benchmarks/bench_crawler.py, bench_storage.py)가 실제와 같은
+쿼리로 네트워크 없이 파이프라인 전체를 실행할 때 쓰며, execute() 호출 수로 데이터베이스 왕복 횟수를 셉니다.
+"""
+import re
+import uuid
+from datetime import datetime, timezone
+
+
+class MemoryResponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+def _parse_value(raw: str):
+    if len(raw) >= 2 and raw[0] == '"' and raw[-1] == '"':
+        return raw[1:-1]
+    return raw
+
+
+def _split_top_level(text: str) -> list:
+    """쉼표로 나누되 괄호 / 따옴표 안의 쉼표는 무시합니다."""
+    parts, depth, quoted, current = [], 0, False, []
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == '(':
+            depth += 1
+        elif not quoted and ch == ')':
+            depth -= 1
+        if ch == ',' and depth == 0 and not quoted:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(ch)
+    if current:
+        parts.append(''.join(current))
+    return parts
+
+
+_OPERATORS = {
+    'eq': lambda a, b: a == b,
+    'neq': lambda a, b: a != b,
+    'gt': lambda a, b: a is not None and a > b,
+    'gte': lambda a, b: a is not None and a >= b,
+    'lt': lambda a, b: a is not None and a < b,
+    'lte': lambda a, b: a is not None and a <= b,
+}
+
+
+def _compile_logic(expression: str):
+    """PostgREST or/and 필터 문자열을 행 -> bool 함수로 바꿉니다."""
+    conditions = []
+    for part in _split_top_level(expression):
+        match = re.fullmatch(r'(and|or)\((.*)\)', part)
+        if match:
+            inner = _compile_logic(match.group(2))
+            if match.group(1) == 'and':
+                conditions.append(lambda row, fs=inner: all(f(row) for f in fs))
+            else:
+                conditions.append(lambda row, fs=inner: any(f(row) for f in fs))
+            continue
+        column, op, raw = part.split('.', 2)
+        value = _parse_value(raw)
+        conditions.append(lambda row, c=column, o=_OPERATORS[op], v=value: o(_as_comparable(row.get(c), v), v))
+    return conditions
+
+
+def _as_comparable(value, other):
+    if isinstance(other, str) and value is not None and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+class MemoryQuery:
+    def __init__(self, client, table: str):
+        self.client = client
+        self.table_name = table
+        self.action = 'select'
+        self.columns = '*'
+        self.filters = []
+        self.orders = []
+        self.limit_count = None
+        self.offset = 0
+        self.payload = None
+        self.on_conflict = None
+        self.ignore_duplicates = False
+        self.count_mode = None
+        self.returning = 'representation'
+
+    # --- 동작 ---
+    def select(self, columns='*', count=None):
+        self.action = 'select'
+        self.columns = columns
+        self.count_mode = count
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.action = 'insert'
+        self.payload = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, on_conflict=None, ignore_duplicates=False, **kwargs):
+        self.action = 'upsert'
+        self.payload = rows if isinstance(rows, list) else [rows]
+        self.on_conflict = on_conflict or 'id'
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values, **kwargs):
+        self.action = 'update'
+        self.payload = values
+        return self
+
+    def delete(self, count=None, returning='representation'):
+        self.action = 'delete'
+        self.count_mode = count
+        self.returning = returning
+        return self
+
+    # --- 필터 ---
+    def _filter(self, column, op, value):
+        self.filters.append(lambda row: _OPERATORS[op](_as_comparable(row.get(column), value), value))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, 'eq', value)
+
+    def neq(self, column, value):
+        return self._filter(column, 'neq', value)
+
+    def gt(self, column, value):
+        return self._filter(column, 'gt', value)
+
+    def gte(self, column, value):
+        return self._filter(column, 'gte', value)
+
+    def lt(self, column, value):
+        return self._filter(column, 'lt', value)
+
+    def lte(self, column, value):
+        return self._filter(column, 'lte', value)
+
+    def in_(self, column, values):
+        allowed = set(values)
+        self.filters.append(lambda row: row.get(column) in allowed)
+        return self
+
+    def or_(self, expression):
+        conditions = _compile_logic(expression)
+        self.filters.append(lambda row: any(f(row) for f in conditions))
+        return self
+
+    def order(self, column, desc=False, **kwargs):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def range(self, start, end):
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    # --- 실행 ---
+    def _matching(self):
+        rows = [row for row in self.client.tables.setdefault(self.table_name, [])
+                if all(f(row) for f in self.filters)]
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        return rows
+
+    def _project(self, row):
+        if self.columns.strip() == '*':
+            return dict(row)
+        columns = [c.strip() for c in self.columns.split(',')]
+        return {c: row.get(c) for c in columns}
+
+    def execute(self):
+        self.client.round_trips += 1
+        table = self.client.tables.setdefault(self.table_name, [])
+
+        if self.action == 'select':
+            rows = self._matching()
+            total = len(rows)
+            end = None if self.limit_count is None else self.offset + self.limit_count
+            rows = rows[self.offset:end]
+            return MemoryResponse([self._project(r) for r in rows], total if self.count_mode else None)
+
+        if self.action in ('insert', 'upsert'):
+            inserted = []
+            key = self.on_conflict
+            index = {row.get(key): row for row in table} if self.action == 'upsert' else {}
+            for new_row in self.payload:
+                existing = index.get(new_row.get(key)) if key else None
+                if existing is not None:
+                    if not self.ignore_duplicates:
+                        existing.update(new_row)
+                        inserted.append(dict(existing))
+                    continue
+                row = dict(new_row)
+                row.setdefault('id', str(uuid.uuid4()))
+                row.setdefault('created_at', datetime.now(timezone.utc).isoformat())
+                table.append(row)
+                if key:
+                    index[row.get(key)] = row
+                inserted.append(dict(row))
+            return MemoryResponse(inserted)
+
+        if self.action == 'update':
+            rows = self._matching()
+            for row in rows:
+                row.update(self.payload)
+            return MemoryResponse([dict(r) for r in rows])
+
+        if self.action == 'delete':
+            doomed = {id(r) for r in self._matching()}
+            deleted = [r for r in table if id(r) in doomed]
+            table[:] = [r for r in table if id(r) not in doomed]
+            data = [] if self.returning == 'minimal' else deleted
+            return MemoryResponse(data, len(deleted) if self.count_mode else None)
+
+        raise ValueError(f"지원하지 않는 동작: {self.action}")
+
+
+class MemoryRPC:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params or {}
+
+    def execute(self):
+        self.client.round_trips += 1
+        handler = self.client.rpc_handlers.get(self.name)
+        if handler is None:
+            raise RuntimeError(f"function {self.name} does not exist")
+        return MemoryResponse(handler(self.client, **self.params))
+
+
+def _delete_old_posts_step(client, cutoff_at, batch_size=1000):
+    """sql/maintenance_functions.sql의 delete_old_posts_step()"""
+    cutoff = datetime.fromisoformat(cutoff_at.replace('Z', '+00:00'))
+    if cutoff.tzinfo is None:
+        cutoff = cutoff.replace(tzinfo=timezone.utc)
+
+    def created_at(row):
+        value = datetime.fromisoformat(str(row['created_at']).replace('Z', '+00:00'))
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+    posts = client.tables.setdefault('posts', [])
+    doomed = {id(row) for row in sorted((r for r in posts if created_at(r) < cutoff), key=created_at)[:batch_size]}
+    posts[:] = [row for row in posts if id(row) not in doomed]
+    return len(doomed)
+
+
+def _update_post_tags(client, updates):
+    """sql/maintenance_functions.sql의 update_post_tags()"""
+    tags = {update['id']: update['tags'] for update in updates}
+    updated = 0
+    for row in client.tables.get('posts', []):
+        if row.get('id') in tags:
+            row['tags'] = tags[row['id']]
+            updated += 1
+    return updated
+
+
+class MemorySupabase:
+    """
+    supabase.Client 대신 쓸 수 있는 메모리 기반 대역입니다.
+    rpc는 delete_old_posts_step / update_post_tags만 기본으로 흉내 내며, rpc_handlers에 더 넣을 수 있습니다.
+
+    사용 예:
+        database = MemorySupabase()
+        database.tables['posts'] = [...]
+        crawler.post_store = SupabasePostStore(database)
+        crawler.fetch_and_store_news()
+        print(database.round_trips)
+    """
+
+    def __init__(self, tables: dict = None):
+        self.tables = tables if tables is not None else {}
+        self.round_trips = 0
+        self.rpc_handlers = {
+            'delete_old_posts_step': _delete_old_posts_step,
+            'update_post_tags': _update_post_tags,
+        }
+
+    def table(self, name: str) -> MemoryQuery:
+        return MemoryQuery(self, name)
+
+    def rpc(self, name: str, params: dict = None) -> MemoryRPC:
+        return MemoryRPC(self, name, params)
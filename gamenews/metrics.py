@@ -0,0 +1,131 @@
+"""
+크롤러 실행 단계별 시간 / 카운터 수집
+
+사용 예:
+    metrics = Metrics()
+    with metrics.timer('fetch'):
+        ...
+    metrics.count('db_round_trips')
+    metrics.summary()        # {'stages': {...p50/p90/p99...}, 'counters': {...}}
+    metrics.write('metrics.prom')   # .prom이면 Prometheus textfile, 그 외에는 JSON
+
+여러 스레드(피드 동시 수집)에서 함께 기록해도 안전합니다.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+PERCENTILES = (50, 90, 99)
+PROMETHEUS_PREFIX = "gamenews_crawler"
+
+
+def percentile(sorted_values: list, p: float) -> float:
+    """정렬된 값에서 nearest-rank 방식으로 p 백분위수를 구합니다."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """새 실행을 위해 기록을 비웁니다."""
+        with self._lock:
+            self.durations = {}   # 단계 이름 -> 소요 시간(초) 목록
+            self.counters = {}
+            self.started_at = time.time()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            self.durations.setdefault(stage, []).append(seconds)
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def summary(self) -> dict:
+        """단계별 횟수 / 합계 / 백분위수와 카운터를 딕셔너리로 반환합니다."""
+        with self._lock:
+            durations = {stage: sorted(values) for stage, values in self.durations.items()}
+            counters = dict(self.counters)
+
+        stages = {}
+        for stage, values in durations.items():
+            stats = {'count': len(values), 'total': sum(values)}
+            for p in PERCENTILES:
+                stats[f'p{p}'] = percentile(values, p)
+            stats['max'] = values[-1] if values else 0.0
+            stages[stage] = stats
+
+        return {'started_at': self.started_at, 'stages': stages, 'counters': counters}
+
+    def format_summary(self, limit: int = 1000) -> str:
+        """Discord 필드 등에 넣을 짧은 텍스트 요약 (단계별 합계 / p50 / p99)"""
+        summary = self.summary()
+        lines = []
+        for stage, s in sorted(summary['stages'].items(), key=lambda item: -item[1]['total']):
+            lines.append(f"{stage}: {s['total']:.2f}s ×{s['count']} "
+                         f"(p50 {s['p50'] * 1000:.1f}ms, p99 {s['p99'] * 1000:.1f}ms)")
+        for name, value in sorted(summary['counters'].items()):
+            lines.append(f"{name}: {value:,}")
+
+        text = '\n'.join(lines)
+        if len(text) > limit:
+            text = text[:limit - 3] + '...'
+        return text
+
+    def to_prometheus(self, prefix: str = PROMETHEUS_PREFIX) -> str:
+        """node_exporter textfile collector 형식으로 변환합니다."""
+        summary = self.summary()
+        lines = [
+            f"# HELP {prefix}_stage_seconds Duration of crawler stages in the last run.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for stage, s in sorted(summary['stages'].items()):
+            for p in PERCENTILES:
+                lines.append(f'{prefix}_stage_seconds{{stage="{stage}",quantile="{p / 100}"}} {s[f"p{p}"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{stage}"}} {s["total"]:.6f}')
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{stage}"}} {s["count"]}')
+
+        for name, value in sorted(summary['counters'].items()):
+            lines.append(f"# HELP {prefix}_{name} Value of {name} in the last run.")
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {value}")
+
+        lines.append(f"# HELP {prefix}_last_run_timestamp_seconds Start time of the last run.")
+        lines.append(f"# TYPE {prefix}_last_run_timestamp_seconds gauge")
+        lines.append(f"{prefix}_last_run_timestamp_seconds {summary['started_at']:.0f}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """
+        .prom 파일이면 Prometheus textfile, 그 외에는 JSON으로 저장합니다.
+        수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        """
+        if path.endswith('.prom'):
+            content = self.to_prometheus()
+        else:
+            content = json.dumps(self.summary(), ensure_ascii=False, indent=2)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,347 @@
+"""
+문자 n-gram MinHash + LSH 기반 유사 제목 인덱스
+
+최근 제목 전체를 SequenceMatcher로 비교하면 제목 수에 비례해 느려집니다.
+이 인덱스는 제목을 n-gram 집합의 MinHash 서명으로 만들고, 서명을 여러 밴드로 나누어
+같은 밴드 값을 가진 제목만 후보로 돌려줍니다. 정확한 점수 계산은 소수의 후보에만 수행합니다.
+
+MinHash의 해시 함수는 서로 독립인 범용 해시 h(x) = (a*x + b) mod p (p = 2^61 - 1, 행마다 무작위 a, b)입니다.
+제목의 밴드 키는 TitleSignatureCache(.cache/title_signatures.sqlite)에 저장해 두면
+다음 실행에서는 새 제목의 서명만 계산합니다.
+"""
+import gc
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import time
+import zlib
+from array import array
+from collections import deque
+from difflib import SequenceMatcher
+
+TITLE_SIGNATURES_DB = os.getenv("TITLE_SIGNATURES_DB", ".cache/title_signatures.sqlite")
+
+# 기본 LSH 파라미터: 문자 2-gram, 48개 밴드 x 4행 = 192개 해시
+# 후보가 되는 2-gram Jaccard 기준은 약 (1/48)^(1/4) = 0.38입니다.
+# 합성 벤치마크에서 SequenceMatcher 0.8 이상인 제목 쌍 중 가장 가까운 쌍의 2-gram Jaccard는 0.5 이상이고
+# (0.5인 쌍이 후보가 될 확률 약 95%, 0.6이면 99.9%), 0.8 미만인 쌍은 대부분 0.3~0.5에 있습니다.
+# 3-gram은 단어 하나가 빠지면 Jaccard가 0.45까지 내려가 같은 재현율에 후보가 더 많이 필요했습니다.
+DEFAULT_NGRAM = 2
+DEFAULT_BANDS = 48
+DEFAULT_ROWS = 4
+
+# 범용 해시의 소수 (메르센 소수 2^61 - 1)
+_HASH_PRIME = (1 << 61) - 1
+
+# n-gram별 해시 벡터 캐시 크기 (제목의 n-gram은 많이 반복되므로 재사용)
+_GRAM_CACHE_LIMIT = 200_000
+
+
+def normalize_title(text: str) -> str:
+    """비교용으로 소문자 변환 후 공백을 정리합니다 (calculate_similarity와 동일)."""
+    if not text:
+        return ""
+    return ' '.join(text.lower().split())
+
+
+def similarity_ratio(text1: str, text2: str) -> float:
+    """정규화된 두 문자열의 SequenceMatcher 유사도 (0.0 ~ 1.0)"""
+    if not text1 or not text2:
+        return 0.0
+    return SequenceMatcher(None, text1, text2).ratio()
+
+
+def shingles(text: str, ngram: int = DEFAULT_NGRAM) -> set:
+    """정규화된 문자열의 문자 n-gram 집합을 만듭니다. n보다 짧으면 문자열 전체를 사용합니다."""
+    if len(text) <= ngram:
+        return {text} if text else set()
+    return {text[i:i + ngram] for i in range(len(text) - ngram + 1)}
+
+
+def best_match(job):
+    """
+    job = (정규화 제목, [(후보 제목, 후보 정규화 제목), ...], threshold)
+    threshold 이상 유사한 첫 후보의 (제목, 유사도)를, 없으면 (None, 0.0)을 반환합니다.
+    프로세스 풀에서도 실행할 수 있도록 인덱스 없이 후보 목록만 받습니다.
+    """
+    normalized, candidates, threshold = job
+    if not normalized:
+        return None, 0.0
+
+    # similarity_ratio(normalized, candidate)와 같은 인자 순서로 계산하고,
+    # ratio()의 상한인 real_quick_ratio() / quick_ratio()가 threshold 미만인 후보는 건너뜀 (결과는 같음)
+    matcher = SequenceMatcher(None, normalized)
+    for title, candidate in candidates:
+        if not candidate:
+            continue
+        matcher.set_seq2(candidate)
+        if matcher.real_quick_ratio() < threshold or matcher.quick_ratio() < threshold:
+            continue
+        score = matcher.ratio()
+        if score >= threshold:
+            return title, score
+    return None, 0.0
+
+
+def title_key(normalized: str) -> int:
+    """정규화 제목의 64비트 해시 (SQLite INTEGER 키)"""
+    digest = hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class TitleSignatureCache:
+    """
+    정규화 제목별 LSH 밴드 키를 저장하는 로컬 SQLite 캐시입니다.
+
+    인덱스 구축 시간의 대부분은 MinHash 서명 계산이므로, 한 번 계산한 밴드 키를 저장해 두고
+    다음 실행에서는 새로 들어온 제목만 계산합니다. 해시 파라미터(n-gram, 밴드, 행, seed)나
+    Python 버전(밴드 키는 hash(tuple))이 바뀌면 저장된 키를 모두 버립니다.
+    ttl_days보다 오래 전에 저장한 항목은 purge_expired()에서 지워집니다.
+
+    캐시일 뿐이므로 파일이 없거나 손상되면 새로 만듭니다.
+    """
+
+    def __init__(self, path: str = TITLE_SIGNATURES_DB, ttl_days: int = 30):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        try:
+            self._conn = self._open()
+        except sqlite3.DatabaseError:
+            # 손상된 파일은 버리고 새로 만듦
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            self._conn = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS title_signatures ("
+            " key INTEGER PRIMARY KEY,"
+            " band_keys BLOB NOT NULL,"
+            " added_at INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_title_signatures_added_at ON title_signatures(added_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return conn
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM title_signatures").fetchone()[0]
+
+    def bind(self, params: str):
+        """저장된 밴드 키를 만든 파라미터가 params와 다르면 모두 지웁니다."""
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'params'").fetchone()
+        if row is not None and row[0] == params:
+            return
+        self._conn.execute("DELETE FROM title_signatures")
+        self._conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('params', ?)", (params,))
+        self._conn.commit()
+
+    def load(self) -> dict:
+        """저장된 {제목 키: 밴드 키 bytes}를 모두 읽습니다."""
+        return dict(self._conn.execute("SELECT key, band_keys FROM title_signatures"))
+
+    def add_many(self, items):
+        """(제목 키, 밴드 키 목록)들을 저장합니다. 이미 있는 제목은 그대로 둡니다."""
+        added_at = int(time.time())
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO title_signatures (key, band_keys, added_at) VALUES (?, ?, ?)",
+            [(key, array('q', band_keys).tobytes(), added_at) for key, band_keys in items],
+        )
+
+    def purge_expired(self) -> int:
+        """TTL이 지난 항목을 삭제하고 삭제한 개수를 반환합니다."""
+        cursor = self._conn.execute(
+            "DELETE FROM title_signatures WHERE added_at < ?", (int(time.time() - self.ttl_seconds),)
+        )
+        return cursor.rowcount
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+
+class NearDuplicateIndex:
+    """
+    유사 제목 후보를 거의 상수 시간에 찾는 MinHash LSH 인덱스입니다.
+
+    사용 예:
+        index = NearDuplicateIndex(threshold=0.8)
+        index.add("넥슨, 신작 MMORPG 공개")
+        index.find_similar("넥슨 신작 MMORPG 공개")  # -> ("넥슨, 신작 MMORPG 공개", 0.95)
+
+    max_size를 지정하면 가장 오래 전에 추가된 제목부터 인덱스에서 제거합니다.
+    cache(TitleSignatureCache)를 주면 add() / extend()가 저장된 밴드 키를 재사용하고, 새로 계산한 키를 저장합니다.
+    """
+
+    def __init__(self, threshold: float = 0.8, ngram: int = DEFAULT_NGRAM,
+                 bands: int = DEFAULT_BANDS, rows: int = DEFAULT_ROWS,
+                 max_size: int = None, seed: int = 1, cache: TitleSignatureCache = None):
+        self.threshold = threshold
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = rows
+        self.max_size = max_size
+        self.cache = cache
+
+        rng = random.Random(seed)
+        self._hash_params = [(rng.randrange(1, _HASH_PRIME), rng.randrange(_HASH_PRIME))
+                             for _ in range(bands * rows)]
+        self._buckets = [dict() for _ in range(bands)]
+        self._gram_cache = {}
+        # 추가 순서대로 (원본 제목, 정규화 제목, 밴드 키) 보관
+        self._entries = deque()
+
+        if cache is not None:
+            cache.bind(f"ngram={ngram} bands={bands} rows={rows} seed={seed} "
+                       f"python={sys.version_info[0]}.{sys.version_info[1]}")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return (entry[0] for entry in self._entries)
+
+    def _band_keys(self, normalized: str) -> list:
+        grams = shingles(normalized, self.ngram)
+        if not grams:
+            return []
+
+        # 각 해시 함수에 대한 n-gram의 값 중 최솟값이 MinHash 서명
+        signature = list(map(min, zip(*[self._gram_vector(gram) for gram in grams])))
+
+        rows = self.rows
+        return [hash(tuple(signature[b * rows:(b + 1) * rows])) for b in range(self.bands)]
+
+    def _gram_vector(self, gram: str) -> tuple:
+        """n-gram 하나의 해시 함수별 값 (crc32에 행마다 다른 범용 해시 (a*x + b) mod p를 적용)"""
+        vector = self._gram_cache.get(gram)
+        if vector is None:
+            base = zlib.crc32(gram.encode('utf-8'))
+            vector = tuple([(a * base + b) % _HASH_PRIME for a, b in self._hash_params])
+            if len(self._gram_cache) >= _GRAM_CACHE_LIMIT:
+                self._gram_cache.clear()
+            self._gram_cache[gram] = vector
+        return vector
+
+    def add(self, title: str):
+        """제목을 인덱스에 추가합니다."""
+        normalized = normalize_title(title)
+        keys = self._band_keys(normalized)
+        if self.cache is not None and keys:
+            self.cache.add_many([(title_key(normalized), keys)])
+        self._insert(title, normalized, keys)
+
+    def extend(self, titles):
+        """
+        제목들을 차례로 추가합니다.
+        cache가 있으면 저장된 밴드 키를 한 번에 읽어 재사용하고, 없는 제목만 서명을 계산해 저장합니다.
+        """
+        # 제목 수만 개 x 밴드 수만큼 버킷 항목을 만드는 동안 순환 GC가 커지는 인덱스를 반복해서 훑지 않도록 잠시 끔
+        # (5만 개 기준 구축 시간의 절반 정도가 GC였음)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._extend(titles)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _extend(self, titles):
+        if self.cache is None:
+            for title in titles:
+                self.add(title)
+            return
+
+        stored = self.cache.load()
+        computed = []
+        for title in titles:
+            normalized = normalize_title(title)
+            key = title_key(normalized)
+            band_keys = stored.get(key)
+            if band_keys is not None:
+                keys = array('q', band_keys).tolist()
+            else:
+                keys = self._band_keys(normalized)
+                if keys:
+                    computed.append((key, keys))
+            self._insert(title, normalized, keys)
+        self.cache.add_many(computed)
+
+    def _insert(self, title: str, normalized: str, keys: list):
+        entry = (title, normalized, keys)
+        # 밴드 키 대부분은 제목 하나에만 있으므로, 버킷에 항목이 하나면 리스트 없이 항목을 그대로 둠
+        # (제목마다 밴드 수만큼 리스트를 만들지 않음)
+        for buckets, key in zip(self._buckets, keys):
+            bucket = buckets.get(key)
+            if bucket is None:
+                buckets[key] = entry
+            elif type(bucket) is list:
+                bucket.append(entry)
+            else:
+                buckets[key] = [bucket, entry]
+        self._entries.append(entry)
+
+        if self.max_size is not None:
+            while len(self._entries) > self.max_size:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        entry = self._entries.popleft()
+        for buckets, key in zip(self._buckets, entry[2]):
+            bucket = buckets.get(key)
+            if bucket is entry:
+                del buckets[key]
+            elif type(bucket) is list:
+                try:
+                    bucket.remove(entry)
+                except ValueError:
+                    pass
+                if not bucket:
+                    del buckets[key]
+
+    def _candidates(self, normalized: str) -> list:
+        seen = set()
+        candidates = []
+        for buckets, key in zip(self._buckets, self._band_keys(normalized)):
+            bucket = buckets.get(key)
+            if bucket is None:
+                continue
+            for entry in (bucket if type(bucket) is list else (bucket,)):
+                if id(entry) not in seen:
+                    seen.add(id(entry))
+                    candidates.append(entry)
+        return candidates
+
+    def candidates(self, title: str) -> list:
+        """LSH 버킷이 겹치는 후보 제목 목록 (정확한 점수 계산 전)"""
+        return [entry[0] for entry in self._candidates(normalize_title(title))]
+
+    def candidate_pairs(self, title: str) -> list:
+        """후보의 (원본 제목, 정규화 제목) 목록 (best_match에 넘길 형태)"""
+        return [(entry[0], entry[1]) for entry in self._candidates(normalize_title(title))]
+
+    def find_similar(self, title: str, threshold: float = None):
+        """
+        threshold 이상 유사한 제목을 찾아 (제목, 유사도)를 반환합니다.
+        후보에만 SequenceMatcher를 적용하며, 없으면 (None, 0.0)을 반환합니다.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        normalized = normalize_title(title)
+        if not normalized:
+            return None, 0.0
+
+        return best_match((normalized, [(entry[0], entry[1]) for entry in self._candidates(normalized)],
+                           threshold))
@@ -0,0 +1,309 @@
+"""
+백그라운드 Discord 알림 큐
+
+notify()는 이벤트를 큐에 넣고 바로 반환하며, 별도 스레드가 전송합니다.
+
+    - 묶기: 첫 이벤트부터 window초 동안 들어온 이벤트를 임베드 하나로 합쳐 보냄 (데몬 모드에서 주기마다 보내지 않음)
+    - 레이트 리밋: 응답의 X-RateLimit-Remaining이 0이면 X-RateLimit-Reset-After만큼, 429면 retry_after만큼
+      (최소 RATE_LIMIT_MIN_WAIT초) 기다린 뒤 보냄. 기다리는 동안 들어온 이벤트는 다음 메시지에 합쳐짐.
+      메시지 하나가 429를 DISCORD_MAX_RATE_LIMITS번 넘게 받으면 포기
+    - 종료: close(timeout)을 부르면 남은 이벤트를 window를 기다리지 않고 바로 보내고, timeout 안에 끝나지 않으면 포기
+
+5xx / 연결 오류는 지수 백오프로 DISCORD_MAX_RETRIES번까지 다시 보냅니다.
+알림 실패는 크롤러 실패로 이어지지 않도록 출력만 합니다.
+"""
+import os
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+DISCORD_COALESCE_SECONDS = float(os.getenv("DISCORD_COALESCE_SECONDS", "60"))
+DISCORD_FLUSH_TIMEOUT = float(os.getenv("DISCORD_FLUSH_TIMEOUT", "15"))
+DISCORD_MAX_RETRIES = 5
+DISCORD_MAX_RATE_LIMITS = 10    # 메시지 하나당 429 재시도 한도 (5xx 재시도와 따로 셈)
+RATE_LIMIT_MIN_WAIT = 1.0       # retry_after가 없거나 0인 429도 최소 이만큼 기다림
+DISCORD_REQUEST_TIMEOUT = 10
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+FIELD_VALUE_LIMIT = 1000    # Discord 필드 값 최대 1024자
+MAX_ERROR_LINES = 5
+
+
+class NotifyEvent:
+    """크롤링 한 번의 결과 (stats) 또는 실패 (error)"""
+
+    __slots__ = ('stats', 'error', 'at')
+
+    def __init__(self, stats: dict, error: str = None):
+        self.stats = stats or {}
+        self.error = error
+        self.at = time.monotonic()
+
+
+def merge_stats(events: list) -> dict:
+    """성공한 실행들의 stats를 하나로 합칩니다 (개수는 합, 단계별 시간 요약은 마지막 실행 기준)."""
+    merged = {key: 0 for key in ('added', 'skipped', 'spam', 'total_processed', 'total_tags')}
+    merged['duration'] = 0.0
+    tags = Counter()
+
+    for event in events:
+        for key in merged:
+            merged[key] += event.stats.get(key, 0)
+        # 실행별 상위 태그 순위를 점수로 합산 (1위 10점 ... 10위 1점)
+        for rank, tag in enumerate(event.stats.get('top_tags', [])[:10]):
+            tags[tag] += 10 - rank
+        if event.stats.get('metrics_summary'):
+            merged['metrics_summary'] = event.stats['metrics_summary']
+
+    merged['top_tags'] = [tag for tag, _ in tags.most_common(10)]
+    return merged
+
+
+def build_embed(events: list) -> dict:
+    """
+    이벤트 목록을 Discord 임베드 하나로 만듭니다.
+    이벤트가 하나면 예전과 같은 모양이고, 여러 개면 개수를 합치고 실행 횟수 / 실패 목록을 덧붙입니다.
+    """
+    errors = [event for event in events if event.error]
+    runs = [event for event in events if not event.error]
+    stats = merge_stats(runs)
+    timestamps = [event.stats.get('timestamp') for event in events if event.stats.get('timestamp')]
+
+    if len(events) == 1:
+        title = "❌ 크롤러 실행 실패" if errors else "🎮 게임 뉴스 크롤러 실행 완료"
+    else:
+        title = f"🎮 게임 뉴스 크롤러 {len(events)}회 실행 요약" + (f" (실패 {len(errors)}회)" if errors else "")
+
+    embed = {
+        "title": title,
+        "color": 0xFF0000 if errors else 0x00FF00,  # 빨강(에러) 또는 초록(성공)
+        "timestamp": datetime.utcnow().isoformat(),
+        "fields": [],
+    }
+
+    if errors:
+        lines = [event.error[:FIELD_VALUE_LIMIT // MAX_ERROR_LINES] for event in errors[-MAX_ERROR_LINES:]]
+        if len(errors) > MAX_ERROR_LINES:
+            lines.insert(0, f"... 외 {len(errors) - MAX_ERROR_LINES}건")
+        embed["fields"].append({
+            "name": "❌ 에러",
+            "value": f"```{chr(10).join(lines)[:FIELD_VALUE_LIMIT]}```",
+            "inline": False
+        })
+
+    if runs:
+        embed["fields"].extend([
+            {"name": "✅ 새 기사", "value": f"**{stats['added']}개**", "inline": True},
+            {"name": "⏭️ 중복 스킵", "value": f"{stats['skipped']}개", "inline": True},
+            {"name": "🚫 스팸 차단", "value": f"{stats['spam']}개", "inline": True},
+            {"name": "📊 총 처리", "value": f"{stats['total_processed']}개", "inline": True},
+            {"name": "🏷️ 태그 생성", "value": f"{stats['total_tags']}개", "inline": True},
+            {"name": "⏱️ 소요 시간", "value": f"{stats['duration']:.1f}초", "inline": True},
+        ])
+
+        if len(runs) > 1:
+            embed["fields"].append({"name": "🔁 실행 횟수", "value": f"{len(runs)}회", "inline": True})
+
+        # 단계별 소요 시간 요약 (있는 경우)
+        if stats.get('metrics_summary'):
+            embed["fields"].append({
+                "name": "⏱️ 단계별 시간",
+                "value": f"```{stats['metrics_summary'][:FIELD_VALUE_LIMIT]}```",
+                "inline": False
+            })
+
+        # 상위 태그 정보 추가 (있는 경우)
+        if stats['top_tags']:
+            embed["fields"].append({
+                "name": "🔥 주요 태그",
+                "value": ", ".join(f"`{tag}`" for tag in stats['top_tags']),
+                "inline": False
+            })
+
+        # 웹사이트 링크 추가 (환경 변수가 설정된 경우만)
+        website_url = os.getenv("WEBSITE_URL")
+        if website_url:
+            embed["fields"].append({"name": "🌐 웹사이트", "value": website_url, "inline": False})
+
+    # 푸터: 실행 시간 (여러 번이면 처음 ~ 마지막)
+    if not timestamps:
+        timestamps = [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
+    period = timestamps[0] if len(set(timestamps)) == 1 else f"{timestamps[0]} ~ {timestamps[-1]}"
+    embed["footer"] = {"text": f"실행 시간: {period}"}
+
+    return embed
+
+
+def rate_limit_wait(response) -> float:
+    """
+    응답에서 다음 요청까지 기다릴 초를 읽습니다.
+    429면 본문의 retry_after(없으면 Retry-After 헤더, 최소 RATE_LIMIT_MIN_WAIT초),
+    남은 요청이 0이면 X-RateLimit-Reset-After.
+    """
+    headers = response.headers
+    if response.status_code == 429:
+        try:
+            return max(RATE_LIMIT_MIN_WAIT, float(response.json().get('retry_after')))
+        except (ValueError, TypeError, AttributeError):
+            pass
+        try:
+            return max(RATE_LIMIT_MIN_WAIT, float(headers.get('Retry-After')))
+        except (TypeError, ValueError):
+            return RATE_LIMIT_MIN_WAIT
+
+    if headers.get('X-RateLimit-Remaining') == '0':
+        try:
+            return float(headers.get('X-RateLimit-Reset-After'))
+        except (TypeError, ValueError):
+            return 0.0
+    return 0.0
+
+
+class DiscordNotifier:
+    """
+    사용 예:
+        notifier = DiscordNotifier(webhook_url)
+        notifier.notify(stats)              # 바로 반환
+        notifier.notify({}, error="...")
+        notifier.close()                    # 남은 알림을 DISCORD_FLUSH_TIMEOUT초 안에 보내고 종료
+    """
+
+    def __init__(self, webhook_url: str, window: float = DISCORD_COALESCE_SECONDS,
+                 max_retries: int = DISCORD_MAX_RETRIES, max_rate_limits: int = DISCORD_MAX_RATE_LIMITS,
+                 session=None):
+        self.webhook_url = webhook_url
+        self.window = window
+        self.max_retries = max_retries
+        self.max_rate_limits = max_rate_limits
+        self.session = session
+        self.sent = 0           # 보낸 메시지 수
+        self.delivered = 0      # 보낸 메시지에 담긴 이벤트 수
+        self.dropped = 0        # 보내지 못한 이벤트 수
+        self.rate_limited = 0   # 받은 429 수
+        self._events = []
+        self._cond = threading.Condition()
+        self._closing = False
+        self._deadline = None
+        self._blocked_until = 0.0
+        self._thread = None
+
+    def notify(self, stats: dict, error: str = None):
+        """이벤트를 큐에 넣습니다. 전송을 기다리지 않습니다."""
+        with self._cond:
+            if self._closing:
+                return
+            self._events.append(NotifyEvent(stats, error))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='discord-notifier', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def close(self, timeout: float = DISCORD_FLUSH_TIMEOUT) -> bool:
+        """
+        남은 이벤트를 바로 보내고 스레드를 멈춥니다. timeout초 안에 모두 보냈으면 True.
+        """
+        with self._cond:
+            self._closing = True
+            self._deadline = time.monotonic() + timeout
+            self._cond.notify_all()
+            thread = self._thread
+
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                with self._cond:
+                    pending = len(self._events)
+                print(f"⚠️  Discord 알림 전송이 {timeout:.0f}초 안에 끝나지 않아 중단합니다 (대기 중인 이벤트 {pending}개)")
+                return False
+        return self.dropped == 0
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._events and not self._closing:
+                    self._cond.wait()
+                if not self._events:
+                    return
+
+                # 첫 이벤트부터 window초 동안 더 모음 (종료 중이면 바로 보냄)
+                flush_at = self._events[0].at + self.window
+                while not self._closing and time.monotonic() < flush_at:
+                    self._cond.wait(flush_at - time.monotonic())
+
+                events, self._events = self._events, []
+
+            self._deliver(events)
+
+    def _sleep(self, seconds: float) -> bool:
+        """seconds 동안 기다립니다. 종료 기한 안에 끝낼 수 없으면 바로 False를 반환합니다."""
+        end = time.monotonic() + seconds
+        with self._cond:
+            while True:
+                if self._deadline is not None and end > self._deadline:
+                    return False
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return True
+                # close()가 불리면 깨어나 기한을 다시 확인
+                self._cond.wait(remaining)
+
+    def _request_timeout(self) -> float:
+        with self._cond:
+            if self._deadline is None:
+                return DISCORD_REQUEST_TIMEOUT
+            return max(0.1, min(DISCORD_REQUEST_TIMEOUT, self._deadline - time.monotonic()))
+
+    def _deliver(self, events: list):
+        if self.session is None:
+            from gamenews.http import get_session
+            self.session = get_session()
+
+        payload = {"embeds": [build_embed(events)]}
+        attempt = 0
+        rate_limited = 0
+
+        while True:
+            # 이전 응답이 알려 준 레이트 리밋이 풀릴 때까지 대기
+            wait = self._blocked_until - time.monotonic()
+            if wait > 0 and not self._sleep(wait):
+                return self._drop(events, "레이트 리밋 대기가 종료 기한을 넘음")
+
+            try:
+                response = self.session.post(self.webhook_url, json=payload, timeout=self._request_timeout())
+            except Exception as e:
+                reason = str(e)
+            else:
+                wait = rate_limit_wait(response)
+                if wait:
+                    self._blocked_until = time.monotonic() + wait
+
+                if response.status_code == 429:
+                    # 레이트 리밋은 5xx 재시도 횟수와 따로 셈 (다음 반복에서 retry_after만큼 기다림)
+                    self.rate_limited += 1
+                    rate_limited += 1
+                    if rate_limited > self.max_rate_limits:
+                        return self._drop(events, f"HTTP 429 {rate_limited}회")
+                    continue
+                if response.ok:
+                    self.sent += 1
+                    self.delivered += len(events)
+                    suffix = f" (이벤트 {len(events)}개)" if len(events) > 1 else ""
+                    print(f"\n📨 Discord 알림 전송 완료!{suffix}")
+                    return
+                if response.status_code < 500:
+                    return self._drop(events, f"HTTP {response.status_code}")
+                reason = f"HTTP {response.status_code}"
+
+            attempt += 1
+            if attempt > self.max_retries:
+                return self._drop(events, reason)
+            delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+            if not self._sleep(delay):
+                return self._drop(events, reason)
+
+    def _drop(self, events: list, reason: str):
+        self.dropped += len(events)
+        print(f"\n⚠️  Discord 알림 전송 실패: {reason}")
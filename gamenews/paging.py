@@ -0,0 +1,60 @@
+"""
+(created_at, id) 키셋 페이지네이션
+
+offset/range 방식은 뒤 페이지로 갈수록 느려지고, 읽는 도중 행이 삭제되면 건너뛰는 행이 생깁니다.
+마지막으로 읽은 (created_at, id) 다음부터 읽으면 페이지 위치와 관계없이 인덱스로 바로 찾아갑니다.
+"""
+from gamenews.ratelimit import execute as default_execute
+
+DEFAULT_PAGE_SIZE = 1000  # PostgREST 기본 최대 행 수
+
+
+def keyset_filter(created_at: str, row_id: str, op: str = 'gt') -> str:
+    """
+    (created_at, id) > (created_at, row_id) 조건을 PostgREST or 필터 문자열로 만듭니다.
+    op='lt'이면 (created_at, id) < (created_at, row_id) (내림차순 페이지용)
+    """
+    return (
+        f'created_at.{op}."{created_at}",'
+        f'and(created_at.eq."{created_at}",id.{op}."{row_id}")'
+    )
+
+
+def iter_keyset_pages(supabase, table: str = 'posts', columns: str = '*',
+                      page_size: int = DEFAULT_PAGE_SIZE, filters=None, after: tuple = None,
+                      execute=default_execute, descending: bool = False):
+    """
+    테이블을 (created_at, id) 오름차순으로 한 페이지씩 읽어 행 목록을 yield합니다.
+    descending=True면 최신순(내림차순)으로 읽으며, after 다음이 아니라 이전부터 읽습니다.
+
+    Args:
+        supabase: Supabase 클라이언트
+        columns: select할 컬럼 (created_at, id는 반드시 포함)
+        filters: 쿼리에 추가 조건을 붙이는 함수 (예: lambda q: q.lt('created_at', cutoff))
+        after: 이 (created_at, id) 다음부터 읽기 (이어서 읽기용 커서)
+        execute: 쿼리를 실행할 함수 (기본값: 기본 요청 스케줄러)
+
+    메모리에는 한 페이지만 유지됩니다.
+    """
+    cursor = after
+
+    while True:
+        query = supabase.table(table).select(columns)
+        if filters:
+            query = filters(query)
+        if cursor:
+            query = query.or_(keyset_filter(*cursor, op='lt' if descending else 'gt'))
+
+        query = query.order('created_at', desc=descending).order('id', desc=descending)
+        result = execute(query.limit(page_size))
+        rows = result.data or []
+
+        if not rows:
+            return
+
+        yield rows
+
+        if len(rows) < page_size:
+            return
+
+        cursor = (rows[-1]['created_at'], rows[-1]['id'])
@@ -0,0 +1,182 @@
+"""
+스트리밍 처리 파이프라인 도구
+
+크롤러는 피드 항목을 단계별 제너레이터로 흘려 보냅니다.
+
+    수집(fetch) → 항목 선택(entries) → 링크 정규화(canonicalize) → 정리(normalize) → 태그/스팸(classify) → 중복 확인(dedup) → 저장(write)
+
+각 단계는 앞 단계에서 필요한 만큼만 꺼내 가므로, 한 번에 메모리에 있는 항목 수는
+동시에 가져오는 피드 수(bounded_imap)와 단계별 묶음 크기(chunked)로 제한됩니다.
+단계 사이에는 feedparser 항목 대신 필요한 필드만 담은 Article을 넘깁니다.
+
+CPU를 많이 쓰는 작업(요약 HTML 제거, 유사도 점수)은 CpuPool.map으로 실행하며,
+한 실행에서 처리한 항목이 PROCESS_POOL_THRESHOLD개를 넘으면 프로세스 풀로 여러 코어에 나눕니다.
+"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+PIPELINE_CHUNK_SIZE = int(os.getenv("PIPELINE_CHUNK_SIZE", "200"))
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", str(os.cpu_count() or 1)))
+PROCESS_POOL_THRESHOLD = int(os.getenv("PROCESS_POOL_THRESHOLD", "2000"))
+
+EMPTY_SUMMARY = '요약 정보가 없습니다.'
+
+
+class Article:
+    """
+    단계 사이에 넘기는 기사 한 건.
+    link는 canonicalize 단계에서 원문 URL로, title / summary는 normalize 단계에서 정리된 값으로 바뀝니다.
+    """
+
+    __slots__ = ('feed', 'source_link', 'link', 'title', 'summary', 'tags', 'cluster_id')
+
+    def __init__(self, feed: dict, link: str, title: str, summary: str):
+        self.feed = feed          # 피드 정보 (feeds.json 항목, 여러 기사가 같은 dict를 공유)
+        self.source_link = link   # 피드에 적힌 링크 그대로
+        self.link = link
+        self.title = title
+        self.summary = summary
+        self.tags = []
+        self.cluster_id = None    # 스토리 묶기 단계에서 정함 (gamenews/clustering.py)
+
+    @classmethod
+    def from_entry(cls, feed: dict, entry) -> 'Article':
+        """feedparser 항목에서 필요한 필드만 복사합니다."""
+        return cls(
+            feed,
+            entry.get('link', ''),
+            entry.get('title', 'No Title'),
+            entry.get('summary', entry.get('description', '')),
+        )
+
+    def to_row(self) -> dict:
+        """posts 테이블에 저장할 행 (스토리 묶기를 끈 경우 cluster_id 열은 보내지 않음)"""
+        row = {
+            'title': self.title,
+            'summary': self.summary or EMPTY_SUMMARY,
+            'original_link': self.link,
+            'category': self.feed['category'],
+            'tags': self.tags,
+        }
+        if self.cluster_id is not None:
+            row['cluster_id'] = self.cluster_id
+        return row
+
+
+def chunked(iterable, size: int):
+    """iterable을 최대 size개씩 묶은 리스트로 내보냅니다."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bounded_imap(fn, items, max_workers: int, max_pending: int = None):
+    """
+    items를 스레드 풀에서 fn으로 처리하고, items와 같은 순서로 (item, 결과)를 내보냅니다.
+    진행 중이거나 아직 꺼내 가지 않은 결과는 max_pending개(기본값: max_workers의 두 배)까지만 두므로,
+    소비하는 쪽이 느리면 새 작업을 시작하지 않고 기다립니다.
+    순서를 지키므로 같은 입력이면 어느 피드의 기사가 먼저 저장되는지(중복 중 무엇이 남는지)가 항상 같습니다.
+    """
+    items = iter(items)
+    max_pending = max_pending or max_workers * 2
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+
+        def submit_next():
+            for item in items:
+                pending.append((item, executor.submit(fn, item)))
+                return
+
+        for _ in range(max_pending):
+            submit_next()
+
+        while pending:
+            item, future = pending.popleft()
+            result = future.result()
+            submit_next()
+            yield item, result
+
+
+def prefetch(iterable, depth: int = 1):
+    """
+    iterable의 다음 항목 depth개를 백그라운드 스레드에서 미리 꺼내 둡니다.
+    소비하는 쪽이 현재 항목을 처리하는 동안 다음 페이지 요청 같은 I/O가 진행됩니다.
+    꺼내는 스레드는 하나이므로 제너레이터를 넘겨도 됩니다.
+    """
+    iterator = iter(iterable)
+    done = object()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = deque(executor.submit(next, iterator, done) for _ in range(depth))
+        while True:
+            item = pending.popleft().result()
+            if item is done:
+                return
+            pending.append(executor.submit(next, iterator, done))
+            yield item
+
+
+class CpuPool:
+    """
+    CPU 작업 실행기
+
+    record()로 알린 항목 수가 threshold 이상이고 workers가 2 이상이면 map()을 프로세스 풀에서 실행하고,
+    그 전에는 현재 프로세스에서 바로 실행합니다. 항목이 적을 때는 프로세스 시작과 직렬화 비용이 더 크기 때문입니다.
+    map()에 넘기는 함수는 프로세스 간에 전달할 수 있도록 모듈 최상위 함수여야 합니다.
+
+    worker는 spawn으로 시작하므로, 실행한 스크립트(crawler.py)를 __mp_main__으로 다시 import합니다.
+    따라서 스크립트의 모듈 최상위에는 부작용 없는 코드만 두고, 실행은 if __name__ == "__main__" 아래에 둡니다.
+    """
+
+    def __init__(self, workers: int = PROCESS_POOL_WORKERS, threshold: int = PROCESS_POOL_THRESHOLD):
+        self.workers = workers
+        self.threshold = threshold
+        self.items = 0
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, count: int = 1):
+        self.items += count
+
+    @property
+    def parallel(self) -> bool:
+        return self.workers > 1 and self.items >= self.threshold
+
+    def map(self, fn, items: list) -> list:
+        if not self.parallel or len(items) < 2:
+            return [fn(item) for item in items]
+
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            if self._executor is None:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+
+                # 피드 수집 스레드가 도는 중에 fork하지 않도록 spawn으로 worker를 시작
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            chunksize = max(1, len(items) // (self.workers * 4))
+            return list(self._executor.map(fn, items, chunksize=chunksize))
+        except (OSError, BrokenProcessPool):
+            # 프로세스를 만들 수 없는 환경이면 이후로는 현재 프로세스에서 처리
+            self.close()
+            self.workers = 1
+            return [fn(item) for item in items]
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -0,0 +1,138 @@
+"""
+피드별 적응형 폴링 간격
+
+피드마다 새 항목이 나타나는 속도(항목/초)를 지수 이동 평균으로 추정하고,
+한 번 가져올 때 새 항목이 target_new개 정도 쌓이도록 다음 폴링 시각을 정합니다.
+
+    - 새 항목이 없으면 간격을 backoff배로 늘림 (최대 max_interval)
+    - 새 항목이 많으면 간격을 줄임 (최소 min_interval)
+
+학습한 간격은 JSON 파일에 저장해 재시작 후에도 이어서 사용합니다.
+"""
+import json
+import os
+import random
+import time
+
+DEFAULT_MIN_INTERVAL = 60
+DEFAULT_MAX_INTERVAL = 1800
+DEFAULT_INITIAL_INTERVAL = 300
+
+
+class FeedSchedule:
+    """피드 하나의 폴링 간격과 새 항목 발생 속도"""
+
+    def __init__(self, interval: float, next_at: float = 0.0, rate: float = None, last_polled: float = None):
+        self.interval = interval
+        self.next_at = next_at
+        self.rate = rate                  # 추정한 새 항목 수 / 초 (아직 모르면 None)
+        self.last_polled = last_polled
+
+    def to_dict(self) -> dict:
+        return {'interval': self.interval, 'next_at': self.next_at,
+                'rate': self.rate, 'last_polled': self.last_polled}
+
+
+class AdaptivePoller:
+    """
+    사용 예:
+        poller = AdaptivePoller([feed['url'] for feed in feeds])
+        while True:
+            for url in poller.due():
+                new_count = ...           # 이번에 처음 본 항목 수
+                poller.record(url, new_count)
+            time.sleep(poller.seconds_until_next())
+    """
+
+    def __init__(self, keys, min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 initial_interval: float = DEFAULT_INITIAL_INTERVAL,
+                 target_new: float = 3.0, backoff: float = 1.5, smoothing: float = 0.3,
+                 jitter: float = 0.1, state_path: str = None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = self._clamp(initial_interval)
+        self.target_new = target_new
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.jitter = jitter
+        self.state_path = state_path
+
+        saved = self._load_state()
+        self.schedules = {}
+        for key in keys:
+            entry = saved.get(key)
+            if isinstance(entry, dict) and 'interval' in entry:
+                self.schedules[key] = FeedSchedule(
+                    self._clamp(entry['interval']), entry.get('next_at') or 0.0,
+                    entry.get('rate'), entry.get('last_polled'),
+                )
+            else:
+                # 처음 보는 피드는 바로 폴링
+                self.schedules[key] = FeedSchedule(self.initial_interval)
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _load_state(self) -> dict:
+        if not self.state_path:
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """학습한 간격을 state_path에 저장합니다 (임시 파일에 쓴 뒤 교체)."""
+        if not self.state_path:
+            return
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({key: s.to_dict() for key, s in self.schedules.items()}, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def due(self, now: float = None) -> list:
+        """지금 폴링할 차례가 된 피드 키 목록"""
+        now = time.time() if now is None else now
+        return [key for key, s in self.schedules.items() if s.next_at <= now]
+
+    def seconds_until_next(self, now: float = None) -> float:
+        now = time.time() if now is None else now
+        if not self.schedules:
+            return self.max_interval
+        return max(0.0, min(s.next_at for s in self.schedules.values()) - now)
+
+    def record(self, key, new_count: int, now: float = None) -> float:
+        """
+        폴링 결과(처음 본 항목 수)를 반영해 다음 간격을 정하고, 그 간격(초)을 반환합니다.
+        오류로 결과를 알 수 없는 경우 new_count=0으로 기록하면 간격이 늘어납니다.
+        """
+        now = time.time() if now is None else now
+        schedule = self.schedules[key]
+
+        if schedule.last_polled is not None:
+            elapsed = max(1.0, now - schedule.last_polled)
+            observed = new_count / elapsed
+            if schedule.rate is None:
+                schedule.rate = observed
+            else:
+                schedule.rate = self.smoothing * observed + (1 - self.smoothing) * schedule.rate
+
+        if new_count == 0:
+            interval = schedule.interval * self.backoff
+        elif schedule.rate:
+            interval = self.target_new / schedule.rate
+        else:
+            interval = schedule.interval
+
+        schedule.interval = self._clamp(interval)
+        schedule.last_polled = now
+        # 여러 피드가 같은 시각에 몰리지 않도록 약간의 지터
+        spread = schedule.interval * self.jitter
+        schedule.next_at = now + schedule.interval + random.uniform(-spread, spread)
+        return schedule.interval
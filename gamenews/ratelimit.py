@@ -0,0 +1,323 @@
+"""
+Supabase(PostgREST) 요청 스케줄러
+
+crawler.py와 scripts/*.py의 쿼리는 모두 RequestScheduler.execute(query)를 거쳐 실행됩니다.
+
+    - 토큰 버킷: 초당 요청 수를 rate로 제한합니다. 처음 스로틀링 응답을 받기 전까지는 1초마다 약 두 배로 올리고
+      (slow start), 그 뒤로는 성공할 때마다 조금씩 올리다가(1초에 약 10%) 429를 받으면 70%로 줄여(곱셈 감소)
+      서버가 허용하는 최대 처리량 근처를 유지합니다 (AIMD). 버킷은 BUCKET_BURST_SECONDS 분량만 모아 두므로
+      한꺼번에 몰아 보내 서버의 버스트 한도를 넘기지 않습니다
+    - 동시 요청 수: SUPABASE_CONCURRENCY개까지
+    - 재시도: 일시적 오류(429, 5xx, 연결 실패 / 타임아웃)는 지터를 넣은 지수 백오프로 최대 SUPABASE_MAX_RETRIES번.
+      Retry-After 헤더가 있으면 그 요청은 그 시간이 지난 뒤 다시 보냅니다. Retry-After가 RETRY_AFTER_PAUSE_MIN초 이상이면
+      다른 스레드의 요청도 그동안 보내지 않습니다 (짧은 값은 속도를 줄이는 것으로 충분)
+    - 서킷 브레이커: 스로틀링이 아닌 일시적 오류(5xx, 연결 실패)가 연속 BREAKER_FAILURES번 나면 BREAKER_RESET_SECONDS 동안 요청을 보내지 않고
+      바로 CircuitOpenError를 냅니다. 그 뒤 요청 하나로 복구 여부를 확인합니다
+
+400 / 404 / 409처럼 다시 보내도 결과가 같은 오류는 재시도하지 않고 그대로 다시 발생시킵니다.
+응답 상태와 Retry-After는 gamenews/http.py의 httpx 클라이언트가 record_response 훅으로 스레드별로 기록합니다.
+"""
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+SUPABASE_RATE = float(os.getenv("SUPABASE_RATE", "20"))             # 시작 초당 요청 수
+SUPABASE_MIN_RATE = float(os.getenv("SUPABASE_MIN_RATE", "1"))
+SUPABASE_MAX_RATE = float(os.getenv("SUPABASE_MAX_RATE", "200"))
+SUPABASE_CONCURRENCY = int(os.getenv("SUPABASE_CONCURRENCY", "4"))
+SUPABASE_MAX_RETRIES = int(os.getenv("SUPABASE_MAX_RETRIES", "5"))
+
+RATE_INCREASE = 0.1         # 스로틀링을 한 번 겪은 뒤 성공마다 늘리는 값 (rate번 성공 = 약 1초에 10%)
+RATE_DECREASE = 0.7         # 스로틀링 응답을 받으면 rate에 곱하는 값 (CUBIC과 같은 값)
+
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+RETRY_AFTER_LIMIT = 120.0   # Retry-After를 따르되 이보다 오래 기다리지는 않음
+RETRY_AFTER_PAUSE_MIN = 5.0 # 이보다 긴 Retry-After만 모든 스레드의 요청을 멈춤
+BUCKET_BURST_SECONDS = 0.1  # 토큰 버킷이 모아 두는 최대 분량 (rate의 몇 초 분량)
+TOKEN_EPSILON = 1e-9        # 토큰 계산의 부동소수점 오차 (0.999999999999...개도 1개로 봄)
+
+BREAKER_FAILURES = int(os.getenv("BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+
+THROTTLE_STATUS = frozenset({429})    # 503은 Retry-After가 있을 때만 스로틀링으로 봄
+TRANSIENT_STATUS = frozenset({408, 425, 429, 500, 502, 503, 504, 520, 522, 524})
+
+_last_response = threading.local()
+_default_scheduler = None
+_default_lock = threading.Lock()
+
+
+def record_response(response):
+    """httpx 응답 훅: 이 스레드의 마지막 응답 상태와 Retry-After를 기록합니다."""
+    _last_response.status = response.status_code
+    _last_response.retry_after = response.headers.get('Retry-After')
+
+
+def parse_retry_after(value, now: float = None):
+    """Retry-After 값(초 또는 HTTP 날짜)을 기다릴 초로 바꿉니다. 읽을 수 없으면 None."""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - (time.time() if now is None else now)
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), RETRY_AFTER_LIMIT)
+
+
+def classify_error(error: Exception):
+    """
+    예외를 (일시적 오류 여부, HTTP 상태, Retry-After 초)로 분류합니다.
+    상태는 record_response가 기록한 값을, 없으면 APIError.code(숫자인 경우)를 사용합니다.
+    """
+    status = getattr(_last_response, 'status', None)
+    retry_after = parse_retry_after(getattr(_last_response, 'retry_after', None))
+
+    if status is None:
+        try:
+            status = int(getattr(error, 'code', None))
+        except (TypeError, ValueError):
+            status = None
+
+    if status is not None:
+        return status in TRANSIENT_STATUS, status, retry_after
+
+    # 응답을 받지 못한 경우: 연결 실패 / 타임아웃만 일시적 오류로 봄 (httpx는 오류가 났을 때만 import)
+    import httpx
+    return isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError)), None, None
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 있어 요청을 보내지 않았을 때 발생합니다."""
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 토큰이 차는 버킷 (최대 BUCKET_BURST_SECONDS 분량, 적어도 1개까지 모아 둠).
+    acquire()는 토큰이 생길 때까지 기다리고, pause(seconds)는 그동안 모든 스레드의 요청을 멈춥니다.
+    """
+
+    def __init__(self, rate: float, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.resume_at = 0.0
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> float:
+        return max(1.0, self.rate * BUCKET_BURST_SECONDS)
+
+    def _refill(self, now: float):
+        if now > self._updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+    def acquire(self) -> float:
+        """토큰 하나를 꺼냅니다. 기다린 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._refill(now)
+                wait = self.resume_at - now
+                # 오차만큼 모자란 토큰을 기다리면 시계 해상도보다 짧은 대기를 끝없이 반복할 수 있음
+                if wait <= 0 and self.tokens >= 1 - TOKEN_EPSILON:
+                    self.tokens -= 1
+                    return waited
+                wait = max(wait, (1 - self.tokens) / self.rate)
+            self.sleep(wait)
+            waited += wait
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(self.clock())
+            self.rate = rate
+            self.tokens = min(self.tokens, self.capacity)
+
+    def pause(self, seconds: float):
+        """seconds 동안 토큰을 내주지 않고, 재개한 시점부터 다시 채웁니다 (Retry-After)."""
+        with self._lock:
+            self.resume_at = max(self.resume_at, self.clock() + seconds)
+            self.tokens = 0.0
+            self._updated_at = max(self._updated_at, self.resume_at)
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold번이면 열리고(open), reset_seconds가 지나면
+    요청 하나만 통과시켜(half-open) 성공하면 닫고 실패하면 다시 엽니다.
+    """
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURES,
+                 reset_seconds: float = BREAKER_RESET_SECONDS, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """요청을 보내도 되는지 확인합니다. 열려 있으면 CircuitOpenError를 냅니다."""
+        with self._lock:
+            if self.state == 'closed':
+                return
+            remaining = self.opened_at + self.reset_seconds - self.clock()
+            if self.state == 'open' and remaining <= 0:
+                self.state = 'half_open'
+                return
+            raise CircuitOpenError(
+                f"Supabase circuit open after {self.failures} consecutive failures"
+                + (f" (retry in {remaining:.0f}s)" if remaining > 0 else "")
+            )
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = self.clock()
+
+
+class RequestScheduler:
+    """
+    토큰 버킷(AIMD), 동시 요청 수 제한, 재시도, 서킷 브레이커를 묶은 요청 실행기.
+    여러 스레드에서 함께 사용할 수 있습니다.
+
+    Args:
+        metrics: count(name, value)를 가진 객체 (gamenews.metrics.Metrics). 있으면
+                 db_requests(재시도 포함) / db_failures / db_retries / db_throttled / db_rate_wait_ms를 기록합니다.
+    """
+
+    def __init__(self, rate: float = SUPABASE_RATE, min_rate: float = SUPABASE_MIN_RATE,
+                 max_rate: float = SUPABASE_MAX_RATE, concurrency: int = SUPABASE_CONCURRENCY,
+                 max_retries: int = SUPABASE_MAX_RETRIES, breaker: CircuitBreaker = None,
+                 metrics=None, clock=time.monotonic, sleep=time.sleep):
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(min(max(rate, min_rate), self.max_rate), clock=clock, sleep=sleep)
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.metrics = metrics
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'failures': 0}
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._lock = threading.Lock()
+        self._decreased_at = float('-inf')
+        self._slow_start = True
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self.stats[name] += value
+        if self.metrics is not None:
+            self.metrics.count(f'db_{name}', value)
+
+    def _on_success(self):
+        self.breaker.record_success()
+        with self._lock:
+            # slow start: 성공마다 1씩 (1초에 약 두 배), 이후: 성공마다 RATE_INCREASE씩
+            step = 1.0 if self._slow_start else RATE_INCREASE
+            rate = min(self.max_rate, self.bucket.rate + step)
+        self.bucket.set_rate(rate)
+
+    def _on_throttled(self, sent_at: float, retry_after):
+        self._count('throttled')
+        with self._lock:
+            self._slow_start = False
+            # 마지막으로 줄이기 전에 보낸 요청의 429는 같은 혼잡에 대한 응답이므로 다시 줄이지 않음
+            decrease = sent_at >= self._decreased_at
+            if decrease:
+                self._decreased_at = self.clock()
+                rate = max(self.min_rate, self.bucket.rate * RATE_DECREASE)
+        if decrease:
+            self.bucket.set_rate(rate)
+        # 짧은 Retry-After는 이 요청의 재시도만 늦춤 (backoff), 긴 값은 모든 요청을 멈춤
+        if retry_after and retry_after >= RETRY_AFTER_PAUSE_MIN:
+            self.bucket.pause(retry_after)
+
+    def backoff(self, attempt: int, retry_after: float = None) -> float:
+        """attempt번째 재시도 전에 기다릴 시간 (full jitter, Retry-After가 있으면 그 이상)"""
+        delay = random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, fn):
+        """fn()을 스케줄러 규칙에 따라 실행하고 결과를 반환합니다."""
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            waited = self.bucket.acquire()
+            if waited and self.metrics is not None:
+                self.metrics.count('db_rate_wait_ms', int(waited * 1000))
+
+            with self._slots:
+                self._count('requests')
+                sent_at = self.clock()
+                _last_response.status = None
+                _last_response.retry_after = None
+                try:
+                    result = fn()
+                except Exception as e:
+                    error = e
+                    transient, status, retry_after = classify_error(e)
+                else:
+                    self._on_success()
+                    return result
+
+            if not transient:
+                # 서버는 응답했으므로 브레이커 입장에서는 정상
+                self.breaker.record_success()
+                raise error
+
+            self._count('failures')
+            if status in THROTTLE_STATUS or (status == 503 and retry_after is not None):
+                # 서버가 속도를 늦추라고 알려 준 것이므로 장애로 세지 않음
+                self._on_throttled(sent_at, retry_after)
+            else:
+                self.breaker.record_failure()
+
+            if attempt >= self.max_retries:
+                raise error
+
+            self._count('retries')
+            self.sleep(self.backoff(attempt, retry_after))
+            attempt += 1
+
+    def execute(self, query):
+        """PostgREST 쿼리 빌더의 execute()를 스케줄러를 거쳐 실행합니다."""
+        return self.call(query.execute)
+
+
+def get_scheduler() -> RequestScheduler:
+    """프로세스 전체에서 공유하는 기본 스케줄러 (scripts/*.py용)"""
+    global _default_scheduler
+    if _default_scheduler is None:
+        with _default_lock:
+            if _default_scheduler is None:
+                _default_scheduler = RequestScheduler()
+    return _default_scheduler
+
+
+def execute(query):
+    """기본 스케줄러로 쿼리를 실행합니다."""
+    return get_scheduler().execute(query)
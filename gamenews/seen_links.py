@@ -0,0 +1,129 @@
+"""
+이미 처리한 기사 링크를 기억하는 로컬 SQLite 저장소
+
+Google News는 매 실행마다 대부분 같은 기사를 돌려줍니다. 이미 posts에 있는 링크를
+정규화한 뒤 64비트 해시로 저장해 두면, 텍스트 정리나 Supabase 조회 전에 바로 건너뛸 수 있습니다.
+
+저장소는 캐시일 뿐이므로 파일이 없거나 손상되면 posts 테이블에서 다시 만들 수 있습니다.
+"""
+import hashlib
+import os
+import sqlite3
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+SEEN_LINKS_DB = os.getenv("SEEN_LINKS_DB", ".cache/seen_links.sqlite")
+SEEN_LINKS_TTL_DAYS = int(os.getenv("SEEN_LINKS_TTL_DAYS", "30"))
+
+
+def route_fragment(fragment: str) -> str:
+    """
+    해시 라우팅 주소(#/article/123, #!/article/123)처럼 문서 자체를 가리키는 fragment는 그대로,
+    문서 안의 위치(#comments 같은 앵커)만 가리키는 fragment는 빈 문자열로 반환합니다.
+    """
+    return fragment if fragment.startswith(('/', '!')) else ''
+
+
+def normalize_link(link: str) -> str:
+    """
+    비교용으로 링크를 정규화합니다.
+    앞뒤 공백과 문서 안 위치만 가리키는 #fragment를 제거하고(route_fragment), scheme과 host는 소문자로 바꿉니다.
+    """
+    if not link:
+        return ""
+
+    link = link.strip()
+    try:
+        parts = urlsplit(link)
+    except ValueError:
+        return link
+
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or '/',
+        parts.query,
+        route_fragment(parts.fragment),
+    ))
+
+
+def link_key(link: str) -> int:
+    """정규화한 링크의 64비트 해시 (SQLite INTEGER 키)"""
+    digest = hashlib.blake2b(normalize_link(link).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class SeenLinkStore:
+    """
+    처리한 링크의 해시와 마지막으로 본 시각을 저장합니다.
+    ttl_days보다 오래된 항목은 purge_expired()에서 지워집니다.
+
+    is_new가 True이면 새로 만들어진(또는 손상되어 다시 만든) 저장소이므로
+    호출하는 쪽에서 posts 테이블로 다시 채워야 합니다.
+    """
+
+    def __init__(self, path: str = SEEN_LINKS_DB, ttl_days: int = SEEN_LINKS_TTL_DAYS):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.is_new = not os.path.exists(path)
+        try:
+            self._conn = self._open()
+        except sqlite3.DatabaseError:
+            # 손상된 파일은 버리고 새로 만듦
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            self.is_new = True
+            self._conn = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_links ("
+            " key INTEGER PRIMARY KEY,"
+            " seen_at INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_seen_links_seen_at ON seen_links(seen_at)")
+        return conn
+
+    def __contains__(self, link: str) -> bool:
+        row = self._conn.execute(
+            "SELECT seen_at FROM seen_links WHERE key = ?", (link_key(link),)
+        ).fetchone()
+        return row is not None and row[0] >= time.time() - self.ttl_seconds
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM seen_links").fetchone()[0]
+
+    def add(self, link: str, seen_at: float = None):
+        self.add_many([link], seen_at)
+
+    def add_many(self, links, seen_at: float = None):
+        """링크들을 본 것으로 기록합니다. seen_at을 주지 않으면 현재 시각을 사용합니다."""
+        timestamp = int(seen_at if seen_at is not None else time.time())
+        self._conn.executemany(
+            "INSERT INTO seen_links (key, seen_at) VALUES (?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET seen_at = MAX(seen_at, excluded.seen_at)",
+            [(link_key(link), timestamp) for link in links if link],
+        )
+
+    def purge_expired(self) -> int:
+        """TTL이 지난 항목을 삭제하고 삭제한 개수를 반환합니다."""
+        cursor = self._conn.execute(
+            "DELETE FROM seen_links WHERE seen_at < ?", (int(time.time() - self.ttl_seconds),)
+        )
+        return cursor.rowcount
+
+    def commit(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
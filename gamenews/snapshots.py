@@ -0,0 +1,211 @@
+"""
+가져온 피드 원본을 보관하는 스냅샷 저장소 (기록 + 리플레이용)
+
+feedparser로 파싱하고 나면 받은 바이트는 버려지므로, clean_summary / 스팸 키워드 / 유사도 기준을
+바꿨을 때 지난 실행 결과가 어떻게 달라지는지 보려면 새 피드를 기다려야 했습니다.
+크롤러는 받은 피드 바이트를 모두 여기에 저장하고, `python crawler.py replay`가 네트워크 없이 다시 처리합니다.
+
+    FEED_SNAPSHOT_DIR/
+    ├── objects/ab/cdef....gz     # 내용 주소 저장: 원본 바이트의 SHA-256 이름으로 gzip 저장 (같은 내용은 한 번만)
+    └── index/2024-05-01.jsonl    # 시간 인덱스: UTC 날짜별로 가져온 시각, 실행, 피드, 객체 해시를 한 줄씩
+
+날짜 범위를 읽을 때는 그 날짜의 인덱스 파일만 엽니다. 보관 기간(FEED_SNAPSHOT_DAYS)이 지난 인덱스 파일은
+purge_expired()에서 지우고, 남은 인덱스가 가리키지 않는 객체도 함께 지웁니다.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+
+FEED_SNAPSHOT_DIR = os.getenv("FEED_SNAPSHOT_DIR", ".cache/feed_snapshots")   # 빈 값이면 기록하지 않음
+FEED_SNAPSHOT_DAYS = int(os.getenv("FEED_SNAPSHOT_DAYS", "30"))
+SNAPSHOT_COMPRESS_LEVEL = 6
+
+
+def parse_time(value, end: bool = False):
+    """
+    'YYYY-MM-DD' 또는 ISO 8601 문자열 / datetime / date를 UTC datetime으로 바꿉니다.
+    날짜만 주어지고 end가 True이면 그 날의 끝(다음 날 0시)을 반환해 범위 끝을 포함하도록 합니다.
+    """
+    if value is None or isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, date):
+        parsed = datetime(value.year, value.month, value.day)
+        if end:
+            parsed += timedelta(days=1)
+    elif len(value) == 10:
+        parsed = datetime.fromisoformat(value)
+        if end:
+            parsed += timedelta(days=1)
+    else:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class SnapshotStore:
+    """
+    사용 예:
+        store = SnapshotStore()
+        store.record(feed_info, content, response_headers, run_id)     # 가져온 피드 저장
+        for run in store.iter_runs(since='2024-05-01', until='2024-05-31'):
+            for record in run:
+                content = store.get(record['sha256'])
+    """
+
+    def __init__(self, root: str = FEED_SNAPSHOT_DIR, retention_days: int = FEED_SNAPSHOT_DAYS):
+        self.root = root
+        self.retention_days = retention_days
+        self.objects_dir = os.path.join(root, 'objects')
+        self.index_dir = os.path.join(root, 'index')
+        self._lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest[2:]}.gz")
+
+    def put(self, content: bytes) -> str:
+        """내용을 gzip으로 저장하고 SHA-256 해시를 반환합니다. 이미 있으면 쓰지 않습니다."""
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            return digest
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 여러 스레드 / 프로세스가 같은 내용을 동시에 써도 한쪽이 통째로 교체하도록 임시 파일 이름을 다르게 함
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(content, compresslevel=SNAPSHOT_COMPRESS_LEVEL, mtime=0))
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        with open(self.object_path(digest), 'rb') as f:
+            return gzip.decompress(f.read())
+
+    def record(self, feed_info: dict, content: bytes, response_headers: dict = None,
+               run_id: str = None, fetched_at: datetime = None) -> dict:
+        """
+        가져온 피드 바이트를 저장하고 인덱스에 한 줄을 추가합니다.
+        response_headers는 리플레이 때 feedparser에 그대로 넘길 content-location / content-type입니다.
+        """
+        fetched_at = (fetched_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+        response_headers = response_headers or {}
+        record = {
+            'at': fetched_at.isoformat(timespec='seconds'),
+            'run': run_id,
+            'feed': feed_info['url'],
+            'name': feed_info.get('name'),
+            'category': feed_info.get('category'),
+            'sha256': self.put(content),
+            'size': len(content),
+            'location': response_headers.get('content-location'),
+            'content_type': response_headers.get('content-type'),
+        }
+
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self._index_path(fetched_at.date()), 'a', encoding='utf-8') as f:
+                f.write(line)
+        return record
+
+    def _index_path(self, day: date) -> str:
+        return os.path.join(self.index_dir, f"{day.isoformat()}.jsonl")
+
+    def _index_days(self) -> list:
+        days = []
+        for name in os.listdir(self.index_dir):
+            if name.endswith('.jsonl'):
+                try:
+                    days.append(date.fromisoformat(name[:-len('.jsonl')]))
+                except ValueError:
+                    continue
+        return sorted(days)
+
+    def iter_records(self, since=None, until=None, feed_urls=None):
+        """
+        since <= 가져온 시각 < until인 기록을 시각 순서대로 내보냅니다.
+        범위와 겹치는 날짜의 인덱스 파일만 읽으며, feed_urls를 주면 그 피드만 내보냅니다.
+        """
+        since, until = parse_time(since), parse_time(until, end=True)
+        feed_urls = set(feed_urls) if feed_urls else None
+
+        for day in self._index_days():
+            if since is not None and day < since.date():
+                continue
+            if until is not None and day > until.date():
+                break
+
+            records = []
+            with open(self._index_path(day), 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        at = parse_time(record['at'])
+                    except (ValueError, KeyError, TypeError):
+                        continue    # 중단된 쓰기로 잘린 줄
+                    if since is not None and at < since:
+                        continue
+                    if until is not None and at >= until:
+                        continue
+                    if feed_urls is not None and record.get('feed') not in feed_urls:
+                        continue
+                    records.append((at, record))
+
+            records.sort(key=lambda item: item[0])
+            for _, record in records:
+                yield record
+
+    def iter_runs(self, since=None, until=None, feed_urls=None):
+        """
+        기록을 크롤러 실행 단위로 묶어 내보냅니다 (실행 id가 없는 기록은 하나씩).
+        실행은 첫 기록의 시각 순서대로 나오며, 날짜 경계에 걸친 실행도 하나로 묶입니다.
+        """
+        runs = {}
+        for record in self.iter_records(since, until, feed_urls):
+            key = record.get('run') or f"{record['at']} {record['feed']}"
+            runs.setdefault(key, []).append(record)
+        yield from runs.values()
+
+    def purge_expired(self) -> int:
+        """
+        보관 기간이 지난 인덱스 파일을 지우고, 남은 인덱스가 가리키지 않는 객체를 지웁니다.
+        지운 객체 수를 반환합니다.
+        """
+        cutoff = datetime.now(timezone.utc).date() - timedelta(days=self.retention_days)
+        referenced = set()
+
+        for day in self._index_days():
+            path = self._index_path(day)
+            if day < cutoff:
+                os.remove(path)
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        referenced.add(json.loads(line)['sha256'])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+
+        # 다른 프로세스가 방금 저장하고 아직 인덱스에 적지 않은 객체는 남겨 둠
+        recent = time.time() - 3600
+        removed = 0
+        for prefix in os.listdir(self.objects_dir):
+            directory = os.path.join(self.objects_dir, prefix)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if not name.endswith('.gz'):
+                    continue    # 다른 프로세스가 쓰는 중인 임시 파일
+                path = os.path.join(directory, name)
+                if prefix + name[:-len('.gz')] not in referenced and os.path.getmtime(path) < recent:
+                    os.remove(path)
+                    removed += 1
+        return removed
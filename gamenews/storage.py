@@ -0,0 +1,547 @@
+"""
+posts 저장소 인터페이스 (Supabase / 로컬 SQLite)
+
+crawler.py와 scripts/*.py는 supabase-py 쿼리 빌더를 직접 부르지 않고 PostStore의 메서드만 사용합니다.
+
+    existing_links      이미 저장된 original_link 일괄 확인 (정확한 일치)
+    recent_rows         최근 N일 게시물을 최신순으로 (최근 제목 / 스토리 / seen-link 복원)
+    insert_posts        일괄 저장, original_link가 겹치면 무시하고 추가된 링크만 반환
+    upsert_posts        일괄 저장, original_link가 겹치면 덮어씀 (아카이브 복원)
+    iter_pages          (created_at, id) 키셋 페이지 순회 (아카이빙, 태그 재계산)
+    delete_ids          id 목록 배치 삭제
+    delete_before       기준 시각보다 오래된 행을 한 배치만 삭제
+    update_tags         태그 일괄 갱신
+    count_posts / size_stats  행 수와 용량
+
+STORAGE_BACKEND=supabase(기본값)이면 Supabase(PostgREST)에, sqlite이면 POSTS_DB 파일에 저장합니다.
+SQLite 저장소는 Supabase 스키마(supabase/schema.sql)와 같은 컬럼 / 인덱스를 쓰므로 인증 정보나 네트워크 없이
+크롤러와 스크립트를 끝까지 실행하고, 부하 테스트를 디스크 속도로 돌릴 수 있습니다.
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+
+from gamenews.paging import DEFAULT_PAGE_SIZE, iter_keyset_pages
+from gamenews.ratelimit import execute
+
+POSTS_DB = os.getenv("POSTS_DB", ".cache/posts.sqlite")
+
+POST_COLUMNS = ('id', 'title', 'summary', 'original_link', 'category', 'tags', 'cluster_id', 'created_at')
+EXISTS_CHUNK_SIZE = 100     # in_ 조회 / 삭제 요청당 값 수 (URL 길이 제한)
+SQLITE_CHUNK_SIZE = 500     # SQLite 문장 하나에 넣는 행 / 값 수 (변수 개수 제한)
+
+# 열이 없을 때의 오류 코드 (Postgres undefined_column, PostgREST 스키마 캐시에 없는 열)
+MISSING_COLUMN_CODES = ('42703', 'PGRST204')
+
+# check_database_size()와 같은 기준 (sql/maintenance_functions.sql)
+ALERT_LEVELS = ((0.9, '🔴 CRITICAL'), (0.8, '🟠 WARNING'), (0.6, '🟡 CAUTION'))
+
+
+def alert_level(used_mb: float, max_size_mb: float) -> str:
+    for ratio, level in ALERT_LEVELS:
+        if used_mb >= max_size_mb * ratio:
+            return level
+    return '🟢 OK'
+
+
+def is_missing_column(error: Exception, column: str) -> bool:
+    """error가 posts에 column 열이 없어서(마이그레이션 전 데이터베이스) 난 오류인지 확인합니다."""
+    text = f"{getattr(error, 'message', '')} {error}"
+    if column not in text:
+        return False
+    return str(getattr(error, 'code', '')) in MISSING_COLUMN_CODES or 'no such column' in text
+
+
+class PostStore:
+    """
+    posts 테이블에 대한 연산 모음. 구현마다 같은 형식의 행(dict)을 주고받습니다.
+    metrics를 주면 요청(문장)마다 db_round_trips를 세고 db_query 시간을 기록합니다.
+
+    사용 예:
+        with open_post_store() as store:
+            existing = store.existing_links(links)
+            added = store.insert_posts(rows)
+    """
+
+    backend = None
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @contextlib.contextmanager
+    def _round_trip(self):
+        if self.metrics is None:
+            yield
+            return
+        self.metrics.count('db_round_trips')
+        with self.metrics.timer('db_query'):
+            yield
+
+    def existing_links(self, links) -> set:
+        """links 중 이미 저장된 original_link 집합"""
+        raise NotImplementedError
+
+    def recent_rows(self, columns: str, since=None, limit: int = None) -> list:
+        """since 이후(None이면 전체)에 저장된 행을 (created_at, id) 내림차순으로 최대 limit개 (None이면 모두) 반환합니다."""
+        raise NotImplementedError
+
+    def insert_posts(self, rows: list) -> set:
+        """행을 저장하고 실제로 추가된 original_link 집합을 반환합니다 (이미 있는 링크는 무시)."""
+        raise NotImplementedError
+
+    def upsert_posts(self, rows: list) -> int:
+        """행을 저장하고, original_link가 이미 있으면 주어진 컬럼으로 덮어씁니다."""
+        raise NotImplementedError
+
+    def iter_pages(self, columns: str = '*', page_size: int = DEFAULT_PAGE_SIZE,
+                   before=None, after: tuple = None):
+        """
+        (created_at, id) 오름차순으로 한 페이지씩 행 목록을 yield합니다 (gamenews/paging.py).
+        before를 주면 created_at < before인 행만, after를 주면 그 (created_at, id) 다음부터 읽습니다.
+        """
+        raise NotImplementedError
+
+    def delete_ids(self, ids: list) -> int:
+        """id 목록을 나누어 삭제하고 삭제된 행 수를 반환합니다."""
+        raise NotImplementedError
+
+    def delete_before(self, cutoff, limit: int) -> int:
+        """created_at < cutoff인 행을 오래된 것부터 최대 limit개 삭제하고 삭제된 행 수를 반환합니다."""
+        raise NotImplementedError
+
+    def update_tags(self, updates: list) -> int:
+        """[{'id', 'tags'}, ...]로 태그를 갱신하고 갱신된 행 수를 반환합니다 (없는 id는 건너뜀)."""
+        raise NotImplementedError
+
+    def count_posts(self) -> tuple:
+        """(행 수, 방식)을 반환합니다. 셀 수 없으면 (None, None)."""
+        raise NotImplementedError
+
+    def size_stats(self, max_size_mb: float = 500) -> dict:
+        """
+        {'total_size_mb', 'posts_size_mb', 'usage_percent', 'alert_level'}을 반환합니다.
+        크기를 알 수 없으면 None.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SupabasePostStore(PostStore):
+    """
+    Supabase(PostgREST) 구현. 요청은 모두 scheduler(없으면 gamenews/ratelimit.py의 기본 스케줄러)로 실행합니다.
+    client를 주지 않으면 SUPABASE_URL / SUPABASE_KEY로 만듭니다 (gamenews/clients.py).
+    """
+
+    backend = 'supabase'
+
+    def __init__(self, client=None, scheduler=None, metrics=None, page_size: int = DEFAULT_PAGE_SIZE):
+        super().__init__(metrics)
+        if client is None:
+            # supabase 패키지 import가 무거우므로 Supabase 저장소를 쓸 때만 불러옴
+            from gamenews.clients import create_supabase_client
+            client = create_supabase_client()
+        self.client = client
+        self.scheduler = scheduler
+        self.page_size = page_size
+
+    def _execute(self, query):
+        with self._round_trip():
+            return self.scheduler.execute(query) if self.scheduler else execute(query)
+
+    def _table(self):
+        return self.client.table('posts')
+
+    def existing_links(self, links) -> set:
+        existing = set()
+        unique_links = list(dict.fromkeys(link for link in links if link))
+
+        for i in range(0, len(unique_links), EXISTS_CHUNK_SIZE):
+            chunk = unique_links[i:i + EXISTS_CHUNK_SIZE]
+            result = self._execute(self._table().select('original_link').in_('original_link', chunk))
+            existing.update(row['original_link'] for row in (result.data or []))
+        return existing
+
+    def recent_rows(self, columns: str, since=None, limit: int = None) -> list:
+        """
+        (created_at, id) 내림차순 키셋 페이지로 읽습니다. 일괄 저장한 행은 created_at이 같으므로
+        offset(range) 페이지는 요청마다 순서가 달라져 페이지 경계에서 행이 빠지거나 겹칠 수 있습니다.
+        """
+        if limit is not None and limit <= 0:
+            return []
+        since = since.isoformat() if isinstance(since, datetime) else since
+        # 키셋 커서에 필요한 created_at, id를 함께 읽고, 요청하지 않은 컬럼은 결과에서 뺌
+        extra = [] if columns.strip() == '*' else [
+            key for key in ('created_at', 'id')
+            if key not in [name.strip() for name in columns.split(',')]
+        ]
+        page_size = self.page_size if limit is None else min(self.page_size, limit)
+        rows = []
+
+        for page in iter_keyset_pages(
+            self.client, 'posts', ', '.join([columns] + extra), page_size,
+            filters=(lambda query: query.gte('created_at', since)) if since else None,
+            execute=self._execute,
+            descending=True,
+        ):
+            rows.extend(page)
+            if limit is not None and len(rows) >= limit:
+                del rows[limit:]
+                break
+
+        for row in rows:
+            for key in extra:
+                row.pop(key, None)
+        return rows
+
+    def insert_posts(self, rows: list) -> set:
+        if not rows:
+            return set()
+        query = self._table().upsert(rows, on_conflict='original_link', ignore_duplicates=True)
+        return {row['original_link'] for row in (self._execute(query).data or [])}
+
+    def upsert_posts(self, rows: list) -> int:
+        if not rows:
+            return 0
+        self._execute(self._table().upsert(rows, on_conflict='original_link'))
+        return len(rows)
+
+    def iter_pages(self, columns: str = '*', page_size: int = DEFAULT_PAGE_SIZE,
+                   before=None, after: tuple = None):
+        before = before.isoformat() if isinstance(before, datetime) else before
+        return iter_keyset_pages(
+            self.client, 'posts', columns, page_size,
+            filters=(lambda query: query.lt('created_at', before)) if before else None,
+            after=after,
+            execute=self._execute,
+        )
+
+    def delete_ids(self, ids: list) -> int:
+        deleted = 0
+        for i in range(0, len(ids), EXISTS_CHUNK_SIZE):
+            chunk = ids[i:i + EXISTS_CHUNK_SIZE]
+            result = self._execute(self._table().delete(count='exact', returning='minimal').in_('id', chunk))
+            deleted += result.count if result.count is not None else len(chunk)
+        return deleted
+
+    def delete_before(self, cutoff, limit: int) -> int:
+        """delete_old_posts_step() 함수로 요청 한 번에 삭제합니다 (sql/maintenance_functions.sql)."""
+        cutoff = cutoff.isoformat() if isinstance(cutoff, datetime) else cutoff
+        result = self._execute(self.client.rpc('delete_old_posts_step', {
+            'cutoff_at': cutoff,
+            'batch_size': limit,
+        }))
+
+        # 응답이 스칼라 또는 행 목록으로 올 수 있음
+        data = result.data
+        if isinstance(data, list):
+            data = data[0] if data else 0
+        if isinstance(data, dict):
+            data = next(iter(data.values()), 0)
+        return int(data or 0)
+
+    def update_tags(self, updates: list) -> int:
+        """update_post_tags() 함수로 UPDATE 한 번에 갱신합니다 (sql/maintenance_functions.sql)."""
+        if not updates:
+            return 0
+        result = self._execute(self.client.rpc('update_post_tags', {'updates': updates}))
+        return result.data if isinstance(result.data, int) else len(updates)
+
+    def count_posts(self) -> tuple:
+        # 테이블 전체를 세지 않도록 플래너 통계 기반 추정(planned)을 먼저 쓰고, 추정할 수 없을 때만 exact로 셈
+        for method in ('planned', 'exact'):
+            try:
+                result = self._execute(self._table().select('id', count=method).limit(1))
+            except Exception:
+                continue
+            if result.count is not None and result.count >= 0:
+                return result.count, method
+        return None, None
+
+    def size_stats(self, max_size_mb: float = 500) -> dict:
+        """check_database_size() 함수가 없으면 None (한도는 함수 안의 max_size_mb를 따름)"""
+        try:
+            result = self._execute(self.client.rpc('check_database_size'))
+        except Exception:
+            return None
+        return result.data[0] if result.data else None
+
+
+def utc_timestamp(value=None) -> str:
+    """
+    시각을 UTC 고정 길이 ISO 문자열(마이크로초까지)로 바꿉니다. None이면 현재 시각.
+    SQLite는 created_at을 문자열로 비교하므로 저장값과 조건값을 모두 이 형식으로 맞춥니다.
+    시간대가 없는 값은 UTC로 봅니다 (Postgres 세션 시간대와 같음).
+    """
+    if value is None:
+        parsed = datetime.now(timezone.utc)
+    elif isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return str(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+def parse_columns(columns: str) -> list:
+    """'id, title' / '*' 형식의 select 컬럼을 목록으로 바꿉니다 (posts 컬럼만 허용)."""
+    if columns.strip() == '*':
+        return list(POST_COLUMNS)
+    names = [name.strip() for name in columns.split(',') if name.strip()]
+    unknown = [name for name in names if name not in POST_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown posts column: {', '.join(unknown)}")
+    return names
+
+
+class SqlitePostStore(PostStore):
+    """
+    로컬 SQLite 파일 구현. supabase/schema.sql의 posts와 같은 컬럼에 같은 인덱스
+    (original_link 유니크, (created_at, id), (cluster_id, created_at))를 둡니다.
+    tags는 JSON 문자열, created_at은 utc_timestamp() 형식의 문자열로 저장합니다.
+
+    연결 하나를 잠금으로 보호하므로 스크립트의 쓰기 스레드에서 동시에 불러도 됩니다.
+    쓰기 메서드는 끝날 때마다 커밋합니다.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path: str = POSTS_DB, metrics=None):
+        super().__init__(metrics)
+        self.path = path
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS posts ("
+            " id TEXT PRIMARY KEY,"
+            " title TEXT NOT NULL,"
+            " summary TEXT NOT NULL,"
+            " original_link TEXT NOT NULL UNIQUE,"
+            " category TEXT NOT NULL,"
+            " tags TEXT NOT NULL DEFAULT '[]',"
+            " cluster_id TEXT,"
+            " created_at TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at, id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_posts_cluster_id ON posts(cluster_id, created_at)")
+        self._conn.commit()
+
+    @contextlib.contextmanager
+    def _cursor(self, commit: bool = False):
+        with self._lock, self._round_trip():
+            cursor = self._conn.cursor()
+            try:
+                yield cursor
+            except BaseException:
+                if commit:
+                    self._conn.rollback()
+                raise
+            if commit:
+                self._conn.commit()
+
+    @staticmethod
+    def _decode(names: list, values) -> dict:
+        row = dict(zip(names, values))
+        if isinstance(row.get('tags'), str):
+            row['tags'] = json.loads(row['tags'])
+        return row
+
+    def _select(self, columns: str, where: str = '', params=(), order: str = 'created_at, id',
+                limit: int = None) -> list:
+        names = parse_columns(columns)
+        sql = f"SELECT {', '.join(names)} FROM posts {where} ORDER BY {order}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._cursor() as cursor:
+            return [self._decode(names, values) for values in cursor.execute(sql, params)]
+
+    @staticmethod
+    def _encode(row: dict, now: str) -> tuple:
+        """
+        행을 POST_COLUMNS 순서의 값으로 바꿉니다. 없는 id / created_at은 Supabase 기본값처럼 채우며,
+        created_at은 Postgres의 NOW()처럼 한 문장 안에서 같은 값(now)을 씁니다.
+        """
+        return (
+            row.get('id') or str(uuid.uuid4()),
+            row.get('title'),
+            row.get('summary'),
+            row.get('original_link'),
+            row.get('category'),
+            json.dumps(row.get('tags') or [], ensure_ascii=False),
+            row.get('cluster_id'),
+            utc_timestamp(row['created_at']) if row.get('created_at') else now,
+        )
+
+    def existing_links(self, links) -> set:
+        existing = set()
+        unique_links = list(dict.fromkeys(link for link in links if link))
+
+        for i in range(0, len(unique_links), SQLITE_CHUNK_SIZE):
+            chunk = unique_links[i:i + SQLITE_CHUNK_SIZE]
+            marks = ', '.join('?' * len(chunk))
+            with self._cursor() as cursor:
+                cursor.execute(f"SELECT original_link FROM posts WHERE original_link IN ({marks})", chunk)
+                existing.update(link for link, in cursor)
+        return existing
+
+    def recent_rows(self, columns: str, since=None, limit: int = None) -> list:
+        if since is None:
+            return self._select(columns, order='created_at DESC, id DESC', limit=limit)
+        return self._select(columns, "WHERE created_at >= ?", (utc_timestamp(since),),
+                            order='created_at DESC, id DESC', limit=limit)
+
+    def _insert(self, rows: list, conflict: str) -> list:
+        """POST_COLUMNS 전체를 여러 행 INSERT 한 문장으로 넣고, RETURNING한 original_link 목록을 반환합니다."""
+        returned = []
+        row_marks = f"({', '.join('?' * len(POST_COLUMNS))})"
+        for i in range(0, len(rows), SQLITE_CHUNK_SIZE):
+            chunk = rows[i:i + SQLITE_CHUNK_SIZE]
+            sql = (f"INSERT INTO posts ({', '.join(POST_COLUMNS)}) "
+                   f"VALUES {', '.join([row_marks] * len(chunk))} {conflict} RETURNING original_link")
+            now = utc_timestamp()
+            params = [value for row in chunk for value in self._encode(row, now)]
+            with self._cursor(commit=True) as cursor:
+                returned.extend(link for link, in cursor.execute(sql, params).fetchall())
+        return returned
+
+    def insert_posts(self, rows: list) -> set:
+        if not rows:
+            return set()
+        return set(self._insert(rows, "ON CONFLICT(original_link) DO NOTHING"))
+
+    def upsert_posts(self, rows: list) -> int:
+        if not rows:
+            return 0
+        # PostgREST upsert처럼 행에 들어 있는 컬럼만 덮어씀
+        present = [name for name in POST_COLUMNS
+                   if name != 'original_link' and any(name in row for row in rows)]
+        if present:
+            updates = ', '.join(f"{name} = excluded.{name}" for name in present)
+            conflict = f"ON CONFLICT(original_link) DO UPDATE SET {updates}"
+        else:
+            conflict = "ON CONFLICT(original_link) DO NOTHING"
+        self._insert(rows, conflict)
+        return len(rows)
+
+    def iter_pages(self, columns: str = '*', page_size: int = DEFAULT_PAGE_SIZE,
+                   before=None, after: tuple = None):
+        names = parse_columns(columns)
+        # 커서를 만들 수 있도록 created_at, id는 항상 읽음
+        select = ', '.join(names + [name for name in ('created_at', 'id') if name not in names])
+        before = utc_timestamp(before) if before else None
+        cursor = (utc_timestamp(after[0]), after[1]) if after else None
+
+        while True:
+            conditions, params = [], []
+            if before:
+                conditions.append("created_at < ?")
+                params.append(before)
+            if cursor:
+                conditions.append("(created_at, id) > (?, ?)")
+                params.extend(cursor)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+            rows = self._select(select, where, params, limit=page_size)
+            if not rows:
+                return
+
+            cursor = (rows[-1]['created_at'], rows[-1]['id'])
+            yield [{name: row[name] for name in names} for row in rows]
+
+            if len(rows) < page_size:
+                return
+
+    def delete_ids(self, ids: list) -> int:
+        deleted = 0
+        for i in range(0, len(ids), SQLITE_CHUNK_SIZE):
+            chunk = ids[i:i + SQLITE_CHUNK_SIZE]
+            with self._cursor(commit=True) as cursor:
+                cursor.execute(f"DELETE FROM posts WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+                deleted += cursor.rowcount
+        return deleted
+
+    def delete_before(self, cutoff, limit: int) -> int:
+        with self._cursor(commit=True) as cursor:
+            cursor.execute(
+                "DELETE FROM posts WHERE id IN ("
+                " SELECT id FROM posts WHERE created_at < ? ORDER BY created_at LIMIT ?)",
+                (utc_timestamp(cutoff), limit),
+            )
+            return cursor.rowcount
+
+    def update_tags(self, updates: list) -> int:
+        if not updates:
+            return 0
+        with self._cursor(commit=True) as cursor:
+            before = self._conn.total_changes
+            cursor.executemany(
+                "UPDATE posts SET tags = ? WHERE id = ?",
+                [(json.dumps(update['tags'], ensure_ascii=False), update['id']) for update in updates],
+            )
+            return self._conn.total_changes - before
+
+    def count_posts(self) -> tuple:
+        with self._cursor() as cursor:
+            return cursor.execute("SELECT COUNT(*) FROM posts").fetchone()[0], 'exact'
+
+    def size_stats(self, max_size_mb: float = 500) -> dict:
+        """파일 크기(page_count x page_size)와 dbstat으로 잰 posts 테이블 + 인덱스 크기"""
+        with self._cursor() as cursor:
+            page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+            page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+            try:
+                posts_bytes = cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name IN "
+                    "(SELECT name FROM sqlite_schema WHERE tbl_name = 'posts')"
+                ).fetchone()[0] or 0
+            except sqlite3.OperationalError:
+                posts_bytes = None      # dbstat 없이 빌드된 SQLite
+
+        total_mb = page_count * page_size / 1024 / 1024
+        posts_mb = total_mb if posts_bytes is None else posts_bytes / 1024 / 1024
+        return {
+            'total_size_mb': round(total_mb, 2),
+            'posts_size_mb': round(posts_mb, 2),
+            'usage_percent': round(total_mb / max_size_mb * 100, 2),
+            'alert_level': alert_level(total_mb, max_size_mb),
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_post_store(backend: str = None, metrics=None, scheduler=None, path: str = None) -> PostStore:
+    """
+    STORAGE_BACKEND(supabase 또는 sqlite, 기본값 supabase)에 맞는 저장소를 엽니다.
+    crawler.py가 .env를 읽은 뒤에 결정되도록 환경 변수는 호출할 때 읽습니다.
+    Supabase 인증 정보가 없으면 ValueError를 냅니다.
+    """
+    backend = (backend or os.getenv("STORAGE_BACKEND", "supabase")).lower()
+    if backend == 'sqlite':
+        return SqlitePostStore(path or os.getenv("POSTS_DB", POSTS_DB), metrics=metrics)
+    if backend == 'supabase':
+        return SupabasePostStore(scheduler=scheduler, metrics=metrics)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend} (supabase or sqlite)")
@@ -0,0 +1,63 @@
+"""
+제목 / 요약 텍스트 정리
+
+crawler.py가 그대로 다시 내보냅니다(crawler.clean_title 등). 프로세스 풀(pipeline.CpuPool)에 넘기는 함수는
+crawler가 아니라 이 모듈의 이름으로 직렬화되므로, worker는 함수를 이 모듈에서 찾습니다.
+단, spawn으로 시작한 worker는 실행한 스크립트(crawler.py)를 __mp_main__으로 다시 import하므로
+crawler.py의 모듈 최상위 코드(환경 변수 / feeds.json 읽기, 무거운 패키지를 뺀 import)는 worker마다 한 번씩 실행됩니다.
+실행 코드는 if __name__ == "__main__" 아래에 있어 worker에서는 실행되지 않습니다.
+"""
+import re
+from difflib import SequenceMatcher
+
+_HTML_TAG = re.compile(r'<[^>]+>')
+
+
+def clean_title(title: str) -> str:
+    """
+    Google News 제목에서 출처(Publisher) 부분을 제거합니다.
+    예: "기사 제목 - 언론사명" -> "기사 제목"
+    """
+    if not title:
+        return ""
+
+    # " - 언론사명" 패턴 제거
+    if " - " in title:
+        parts = title.rsplit(" - ", 1)
+        title = parts[0].strip()
+
+    return title
+
+
+def clean_summary(text: str, max_length: int = 200) -> str:
+    """요약 텍스트를 정리하고 길이를 제한합니다."""
+    if not text:
+        return ""
+
+    # HTML 태그 제거
+    text = _HTML_TAG.sub('', text)
+
+    # 공백 정리
+    text = ' '.join(text.split())
+
+    # 길이 제한
+    if len(text) > max_length:
+        text = text[:max_length] + "..."
+
+    return text
+
+
+def calculate_similarity(text1: str, text2: str) -> float:
+    """
+    두 텍스트의 유사도를 계산합니다 (0.0 ~ 1.0).
+    0.8 이상이면 매우 유사한 것으로 판단합니다.
+    """
+    if not text1 or not text2:
+        return 0.0
+
+    # 소문자로 변환하고 공백 정리
+    text1 = ' '.join(text1.lower().split())
+    text2 = ' '.join(text2.lower().split())
+
+    # SequenceMatcher로 유사도 계산
+    return SequenceMatcher(None, text1, text2).ratio()
@@ -7,6 +7,7 @@ export interface Post {
   original_link: string;
   category: string;
   tags?: string[]; // 자동 추출된 태그
+  cluster_id?: string | null; // 같은 사건을 다룬 기사 묶음 (크롤러의 스토리 묶기)
   created_at: string;
 }
 
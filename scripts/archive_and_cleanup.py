@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+오래된 포스트를 아카이빙한 뒤 바로 삭제하는 단일 파이프라인
+
+archive_old_posts.py와 cleanup_old_posts.py를 따로 실행하면 같은 행을 두 번 읽고,
+각자 기준 날짜를 계산하기 때문에 아카이브되지 않은 행이 삭제될 수 있습니다.
+이 스크립트는 기준 날짜를 한 번만 정하고, 각 페이지를 다음 순서로 처리합니다.
+
+    1. 읽기:   (created_at, id) 키셋 페이지로 오래된 행을 한 번만 읽음
+    2. 아카이브: 월별 gzip CSV에 쓰고 디스크까지 flush(fsync)
+    3. 삭제:   방금 아카이브한 행의 id만 삭제
+
+삭제는 항상 해당 행이 디스크에 기록된 뒤에만 일어납니다. 중간에 중단되더라도
+삭제된 행은 모두 아카이브에 남아 있고, 남은 행은 다음 실행에서 이어서 처리됩니다.
+
+사용법:
+    python scripts/archive_and_cleanup.py
+
+환경 변수:
+    STORAGE_BACKEND: supabase (기본값) 또는 sqlite (POSTS_DB 파일, 기본값: .cache/posts.sqlite)
+    SUPABASE_URL: Supabase 프로젝트 URL
+    SUPABASE_KEY: Supabase service_role 키
+    ARCHIVE_MONTHS: 아카이빙 + 삭제할 개월 수 (기본값: 6)
+    ARCHIVE_PAGE_SIZE: 한 번에 읽을 행 수 (기본값: 1000)
+"""
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.archive import MonthlyArchiveWriter  # noqa: E402
+from gamenews.storage import open_post_store  # noqa: E402
+
+# 설정
+ARCHIVE_MONTHS = int(os.getenv("ARCHIVE_MONTHS", "6"))
+ARCHIVE_PAGE_SIZE = int(os.getenv("ARCHIVE_PAGE_SIZE", "1000"))
+ARCHIVE_DIR = "archives"
+
+class StageStats:
+    """단계별 처리 행 수와 소요 시간"""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.seconds = 0.0
+
+    def add(self, rows, seconds):
+        self.rows += rows
+        self.seconds += seconds
+
+    def report(self):
+        rate = self.rows / self.seconds if self.seconds > 0 else 0
+        return f"{self.name}: {self.rows}개, {self.seconds:.1f}초, {rate:.0f}행/초"
+
+def archive_and_cleanup():
+    """오래된 포스트를 한 번만 읽어 아카이빙 후 삭제"""
+
+    # posts 저장소 (STORAGE_BACKEND=sqlite이면 로컬 SQLite 파일)
+    try:
+        store = open_post_store()
+    except ValueError as e:
+        print(f"❌ 저장소를 열 수 없습니다: {e}")
+        print("   SUPABASE_URL, SUPABASE_KEY를 설정하거나 STORAGE_BACKEND=sqlite로 실행하세요")
+        return 0
+
+    # 아카이빙과 삭제가 같은 기준 날짜를 사용
+    cutoff_date = (datetime.now() - timedelta(days=ARCHIVE_MONTHS * 30)).isoformat()
+
+    print(f"📦 아카이빙 + 정리 시작...")
+    print(f"📅 기준 날짜: {cutoff_date} ({ARCHIVE_MONTHS}개월 전)")
+
+    run_dir = os.path.join(ARCHIVE_DIR, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    writer = None
+
+    read_stats = StageStats("읽기")
+    archive_stats = StageStats("아카이브")
+    delete_stats = StageStats("삭제")
+    total_deleted = 0
+
+    pages = store.iter_pages('*', page_size=ARCHIVE_PAGE_SIZE, before=cutoff_date)
+
+    try:
+        while True:
+            # 1. 읽기
+            stage_start = time.time()
+            rows = next(pages, None)
+            if rows is None:
+                break
+            read_stats.add(len(rows), time.time() - stage_start)
+
+            # 2. 아카이브 + 디스크 기록 보장
+            stage_start = time.time()
+            if writer is None:
+                writer = MonthlyArchiveWriter(run_dir, cutoff=cutoff_date)
+            writer.write_many(rows)
+            writer.flush()
+            archive_stats.add(len(rows), time.time() - stage_start)
+
+            # 3. 방금 아카이브한 행만 삭제
+            stage_start = time.time()
+            deleted = store.delete_ids([row['id'] for row in rows])
+            delete_stats.add(deleted, time.time() - stage_start)
+            total_deleted += deleted
+
+            print(f"✅ {writer.total_rows}개 아카이브, {total_deleted}개 삭제 완료... "
+                  f"(~{rows[-1]['created_at'][:10]})")
+    except Exception:
+        # 이미 쓴 파일은 닫고 불완전한 아카이브로 표시 (삭제된 행은 모두 기록되어 있음)
+        if writer:
+            writer.close(complete=False)
+        raise
+
+    if writer is None:
+        print("📭 아카이빙할 포스트가 없습니다.")
+        return 0
+
+    manifest_path = writer.close()
+
+    print(f"\n🧾 매니페스트: {manifest_path}")
+    for info in writer.files:
+        print(f"📄 {info['file']}: {info['rows']}개, {info['bytes'] / 1024:.2f} KB")
+
+    print("\n⏱️  단계별 처리량")
+    for stats in (read_stats, archive_stats, delete_stats):
+        print(f"   {stats.report()}")
+
+    if total_deleted != writer.total_rows:
+        print(f"⚠️  아카이브 {writer.total_rows}개 중 {total_deleted}개만 삭제되었습니다 "
+              f"(다른 작업이 먼저 삭제했을 수 있음)")
+
+    print(f"\n🎉 완료: {writer.total_rows}개 아카이빙, {total_deleted}개 삭제")
+    return total_deleted
+
+if __name__ == "__main__":
+    try:
+        count = archive_and_cleanup()
+        if count > 0:
+            print(f"💡 팁: 데이터베이스 용량을 확인하세요:")
+            print(f"   python scripts/check_db_capacity.py")
+    except Exception as e:
+        print(f"❌ 오류 발생: {e}")
+        exit(1)
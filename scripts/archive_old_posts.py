@@ -1,75 +1,86 @@
 #!/usr/bin/env python3
 """
-오래된 포스트를 CSV로 아카이빙하는 스크립트
+오래된 포스트를 월별 gzip CSV로 아카이빙하는 스크립트
 
 사용법:
     python scripts/archive_old_posts.py
 
 환경 변수:
+    STORAGE_BACKEND: supabase (기본값) 또는 sqlite (POSTS_DB 파일, 기본값: .cache/posts.sqlite)
     SUPABASE_URL: Supabase 프로젝트 URL
     SUPABASE_KEY: Supabase service_role 키
+    ARCHIVE_MONTHS: 아카이빙할 개월 수 (기본값: 6)
+    ARCHIVE_PAGE_SIZE: 한 번에 읽을 행 수 (기본값: 1000)
+
+출력:
+    archives/<실행시각>/posts_YYYY-MM.csv.gz  월별 아카이브
+    archives/<실행시각>/manifest.json         파일별 행 수, created_at 범위, 체크섬
 """
 import os
-import csv
+import sys
 from datetime import datetime, timedelta
-from supabase import create_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.archive import MonthlyArchiveWriter  # noqa: E402
+from gamenews.storage import open_post_store  # noqa: E402
 
 # 설정
 ARCHIVE_MONTHS = int(os.getenv("ARCHIVE_MONTHS", "6"))  # 6개월 이상 된 데이터 아카이빙
+ARCHIVE_PAGE_SIZE = int(os.getenv("ARCHIVE_PAGE_SIZE", "1000"))
 ARCHIVE_DIR = "archives"
 
 def archive_old_posts():
-    """오래된 포스트를 CSV로 저장"""
+    """오래된 포스트를 (created_at, id) 순서로 한 페이지씩 읽어 월별 파일로 저장"""
     
-    # Supabase 클라이언트
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_KEY")
-    
-    if not supabase_url or not supabase_key:
-        print("❌ 환경 변수를 설정해주세요: SUPABASE_URL, SUPABASE_KEY")
+    # posts 저장소 (STORAGE_BACKEND=sqlite이면 로컬 SQLite 파일)
+    try:
+        store = open_post_store()
+    except ValueError as e:
+        print(f"❌ 저장소를 열 수 없습니다: {e}")
+        print("   SUPABASE_URL, SUPABASE_KEY를 설정하거나 STORAGE_BACKEND=sqlite로 실행하세요")
         return 0
     
-    supabase = create_client(supabase_url, supabase_key)
-    
-    # 아카이브 디렉토리 생성
-    os.makedirs(ARCHIVE_DIR, exist_ok=True)
-    
     # 아카이빙 기준 날짜
     cutoff_date = (datetime.now() - timedelta(days=ARCHIVE_MONTHS * 30)).isoformat()
     
     print(f"📦 아카이빙 시작...")
     print(f"📅 기준 날짜: {cutoff_date} ({ARCHIVE_MONTHS}개월 전)")
     
-    # 오래된 포스트 조회
-    result = supabase.table('posts')\
-        .select('*')\
-        .lt('created_at', cutoff_date)\
-        .order('created_at', desc=True)\
-        .execute()
+    # 이번 실행의 아카이브 디렉토리
+    run_dir = os.path.join(ARCHIVE_DIR, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    writer = None
+    
+    pages = store.iter_pages('*', page_size=ARCHIVE_PAGE_SIZE, before=cutoff_date)
     
-    posts = result.data
+    try:
+        for rows in pages:
+            # 아카이빙할 행이 있을 때만 디렉토리 생성
+            if writer is None:
+                writer = MonthlyArchiveWriter(run_dir, cutoff=cutoff_date)
+            
+            writer.write_many(rows)
+            print(f"  ↳ {writer.total_rows}개 기록 중... (~{rows[-1]['created_at'][:10]})")
+    except Exception:
+        # 중간에 실패해도 이미 쓴 파일은 닫고, 불완전한 아카이브로 표시
+        if writer:
+            writer.close(complete=False)
+        raise
     
-    if not posts:
+    if writer is None:
         print("📭 아카이빙할 포스트가 없습니다.")
         return 0
     
-    # CSV 파일명
-    filename = f"{ARCHIVE_DIR}/posts_archive_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-    
-    # CSV로 저장
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        if posts:
-            writer = csv.DictWriter(f, fieldnames=posts[0].keys())
-            writer.writeheader()
-            writer.writerows(posts)
-    
-    file_size_kb = os.path.getsize(filename) / 1024
+    manifest_path = writer.close()
+    total_kb = sum(f['bytes'] for f in writer.files) / 1024
     
-    print(f"✅ {len(posts)}개 포스트를 아카이빙했습니다")
-    print(f"📄 파일: {filename}")
-    print(f"📊 크기: {file_size_kb:.2f} KB")
+    print(f"✅ {writer.total_rows}개 포스트를 아카이빙했습니다")
+    for info in writer.files:
+        print(f"📄 {info['file']}: {info['rows']}개, {info['bytes'] / 1024:.2f} KB")
+    print(f"🧾 매니페스트: {manifest_path}")
+    print(f"📊 크기: {total_kb:.2f} KB")
     
-    return len(posts)
+    return writer.total_rows
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+저장된 포스트의 태그 / 스팸 여부를 현재 키워드 목록으로 다시 계산하는 스크립트
+
+config/keywords/*.txt를 고쳐도 이미 저장된 포스트의 태그는 그대로 남습니다.
+이 스크립트는 posts를 (created_at, id) 키셋 페이지로 훑으면서 크롤러와 같은 함수
+(gamenews.keywords.classify_post)로 태그와 스팸 여부를 계산하고, 바뀐 행만 씁니다.
+supabase/add_tags_to_existing.sql, supabase/delete_spam_keywords.sql을 대신합니다.
+
+    1. 읽기:  다음 페이지는 현재 페이지를 처리하는 동안 백그라운드에서 미리 읽음
+    2. 분류:  페이지를 프로세스 풀(--workers)에 나눠 태그 / 스팸 계산
+    3. 쓰기:  태그가 바뀐 행만 배치마다 한 번에 갱신 (Supabase는 update_post_tags() 함수),
+              --delete-spam이면 스팸 행은 id로 배치 삭제
+
+사용법:
+    python scripts/backfill_tags.py [옵션]
+
+예시:
+    # 무엇이 바뀌는지만 확인 (쓰지 않음)
+    python scripts/backfill_tags.py --dry-run
+
+    # 태그 갱신 + 스팸 삭제
+    python scripts/backfill_tags.py --delete-spam
+
+옵션:
+    --dry-run: 바뀔 행 수만 세고 쓰지 않음 (커서도 저장하지 않음)
+    --delete-spam: 스팸 키워드가 들어간 포스트를 삭제 (없으면 개수만 출력)
+    --workers: 분류에 쓸 프로세스 수 (기본값: CPU 수)
+    --writers: 동시에 보낼 쓰기 요청 수 (기본값: 4)
+    --page-size: 한 번에 읽을 행 수 (기본값: 1000)
+    --cursor: 진행 상황 파일 (기본값: .cache/backfill_tags_cursor.json)
+    --restart: 커서를 무시하고 처음부터 실행
+
+중단된 실행은 같은 명령을 다시 실행하면 마지막으로 쓰기까지 끝난 페이지 다음부터 이어서 진행합니다.
+키워드 파일이 바뀌었으면 커서를 무시하고 처음부터 다시 계산합니다.
+
+사전 준비:
+    sql/maintenance_functions.sql의 update_post_tags() 함수를 Supabase SQL Editor에서 생성 (Supabase 저장소만)
+
+환경 변수:
+    STORAGE_BACKEND: supabase (기본값) 또는 sqlite (POSTS_DB 파일, 기본값: .cache/posts.sqlite)
+    SUPABASE_URL: Supabase 프로젝트 URL
+    SUPABASE_KEY: Supabase service_role 키
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.keywords import classify_post, keywords_fingerprint  # noqa: E402
+from gamenews.paging import DEFAULT_PAGE_SIZE  # noqa: E402
+from gamenews.pipeline import EMPTY_SUMMARY, PROCESS_POOL_WORKERS, CpuPool, prefetch  # noqa: E402
+from gamenews.storage import open_post_store  # noqa: E402
+
+DEFAULT_WRITERS = 4
+DEFAULT_CURSOR_FILE = os.path.join(".cache", "backfill_tags_cursor.json")
+UPDATE_BATCH_SIZE = 500                                  # update_tags 호출당 행 수
+DELETE_CHUNK_SIZE = 100                                  # delete_ids 호출당 id 수 (Supabase in_ URL 길이 제한)
+COLUMNS = 'id, created_at, title, summary, tags'
+
+def load_cursor(path):
+    """커서 파일을 읽습니다. 없으면 빈 딕셔너리를 반환합니다."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cursor(path, cursor):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cursor, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def classify_page(pool, rows):
+    """
+    페이지의 행을 분류하고 (태그가 바뀐 {id, tags} 목록, 스팸 id 목록)을 반환합니다.
+    요약이 없어 EMPTY_SUMMARY로 저장된 행은 크롤러처럼 빈 요약으로 검사합니다.
+    """
+    posts = [
+        (row['id'], row.get('title') or '',
+         '' if row.get('summary') == EMPTY_SUMMARY else row.get('summary') or '')
+        for row in rows
+    ]
+    stored = {row['id']: row.get('tags') or [] for row in rows}
+
+    changed = []
+    spam_ids = []
+    for post_id, tags, spam in pool.map(classify_post, posts):
+        if spam:
+            spam_ids.append(post_id)
+        # 순서만 다른 경우는 쓰지 않음
+        if set(tags) != set(stored[post_id]):
+            changed.append({'id': post_id, 'tags': tags})
+    return changed, spam_ids
+
+def submit_writes(executor, store, changed, spam_ids, delete_spam):
+    """페이지의 쓰기 요청을 배치로 나눠 보내고 (종류, future) 목록을 반환합니다."""
+    futures = []
+    if delete_spam:
+        doomed = set(spam_ids)
+        changed = [update for update in changed if update['id'] not in doomed]
+        for start in range(0, len(spam_ids), DELETE_CHUNK_SIZE):
+            chunk = spam_ids[start:start + DELETE_CHUNK_SIZE]
+            futures.append(('deleted', executor.submit(store.delete_ids, chunk)))
+    for start in range(0, len(changed), UPDATE_BATCH_SIZE):
+        chunk = changed[start:start + UPDATE_BATCH_SIZE]
+        futures.append(('updated', executor.submit(store.update_tags, chunk)))
+    return futures
+
+def backfill_tags(dry_run=False, delete_spam=False, workers=PROCESS_POOL_WORKERS, writers=DEFAULT_WRITERS,
+                  page_size=DEFAULT_PAGE_SIZE, cursor_path=DEFAULT_CURSOR_FILE, restart=False, store=None):
+    """
+    posts 전체의 태그 / 스팸 여부를 다시 계산합니다.
+
+    Returns:
+        dict: read / changed / spam / updated / deleted 행 수와 seconds
+    """
+    if store is None:
+        store = open_post_store()
+
+    fingerprint = keywords_fingerprint()
+    cursor = {} if restart else load_cursor(cursor_path)
+    if cursor and cursor.get('keywords') != fingerprint:
+        print("🔄 마지막 실행 이후 키워드 파일이 바뀌어 처음부터 다시 계산합니다")
+        cursor = {}
+
+    after = tuple(cursor['after']) if cursor.get('after') else None
+    if after:
+        print(f"↩️  {after[0]} (id {after[1]}) 다음부터 이어서 진행합니다 (이전 실행에서 {cursor.get('read', 0)}개 확인)")
+
+    stats = {key: 0 for key in ('read', 'changed', 'spam', 'updated', 'deleted')}
+    committed = cursor.get('read', 0) if after else 0
+    pending = deque()                                    # (페이지 끝 커서, 행 수, 쓰기 future 목록), 페이지 순서
+    start_time = time.time()
+
+    def commit(limit=0):
+        """
+        앞에서부터 쓰기가 모두 끝난 페이지까지 커서를 옮깁니다.
+        끝나지 않은 페이지가 limit개보다 많으면 가장 오래된 페이지의 쓰기를 기다립니다.
+        쓰기가 실패하면 남은 쓰기를 기다린 뒤 커서를 실패한 페이지 앞에 두고 예외를 다시 발생시킵니다.
+        """
+        nonlocal committed
+        while pending and (len(pending) > limit or all(future.done() for _, future in pending[0][2])):
+            page_end, size, futures = pending.popleft()
+            wait([future for _, future in futures])
+            try:
+                for kind, future in futures:
+                    stats[kind] += future.result()
+            except Exception:
+                wait([future for _, _, rest in pending for _, future in rest])
+                pending.clear()
+                raise
+            committed += size
+            if not dry_run:
+                save_cursor(cursor_path, {'after': list(page_end), 'keywords': fingerprint, 'read': committed})
+
+    pages = store.iter_pages(COLUMNS, page_size, after=after)
+
+    with CpuPool(workers, threshold=0) as pool, ThreadPoolExecutor(max_workers=writers) as executor:
+        try:
+            for rows in prefetch(pages):
+                changed, spam_ids = classify_page(pool, rows)
+                stats['read'] += len(rows)
+                stats['changed'] += len(changed)
+                stats['spam'] += len(spam_ids)
+
+                futures = [] if dry_run else submit_writes(executor, store, changed, spam_ids, delete_spam)
+                pending.append(((rows[-1]['created_at'], rows[-1]['id']), len(rows), futures))
+
+                # 쓰기가 밀리면 읽기를 멈추고 기다림 (메모리에는 최대 writers * 2 페이지)
+                commit(limit=writers * 2)
+
+                elapsed = time.time() - start_time
+                rate = stats['read'] / elapsed if elapsed > 0 else 0
+                print(f"📄 {stats['read']}개 확인 | 태그 변경 {stats['changed']}개 | 스팸 {stats['spam']}개 "
+                      f"| {rate:.0f}행/초")
+        finally:
+            # 중단되더라도 이미 보낸 쓰기는 끝까지 기다린 뒤 커서를 저장
+            commit()
+
+    stats['seconds'] = time.time() - start_time
+    return stats
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="저장된 포스트의 태그 / 스팸 여부를 현재 키워드로 다시 계산합니다.")
+    parser.add_argument('--dry-run', action='store_true', help="바뀔 행 수만 세고 쓰지 않음")
+    parser.add_argument('--delete-spam', action='store_true', help="스팸 키워드가 들어간 포스트 삭제")
+    parser.add_argument('--workers', type=int, default=PROCESS_POOL_WORKERS)
+    parser.add_argument('--writers', type=int, default=DEFAULT_WRITERS)
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--cursor', default=DEFAULT_CURSOR_FILE, help="커서 파일 경로")
+    parser.add_argument('--restart', action='store_true', help="커서를 무시하고 처음부터 실행")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    print("=" * 60)
+    print("🏷️  태그 / 스팸 재계산 시작" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 60)
+
+    try:
+        stats = backfill_tags(
+            dry_run=args.dry_run,
+            delete_spam=args.delete_spam,
+            workers=max(1, args.workers),
+            writers=max(1, args.writers),
+            page_size=args.page_size,
+            cursor_path=args.cursor,
+            restart=args.restart,
+        )
+    except Exception as e:
+        print(f"\n❌ 에러 발생: {e}")
+        if 'update_post_tags' in str(e):
+            print("💡 sql/maintenance_functions.sql의 update_post_tags() 함수를 먼저 생성하세요")
+        print("   같은 명령을 다시 실행하면 마지막으로 완료된 페이지 다음부터 이어서 진행합니다")
+        sys.exit(1)
+
+    rate = stats['read'] / stats['seconds'] if stats['seconds'] > 0 else 0
+    print(f"\n🎉 {stats['read']}개 확인 완료 ({stats['seconds']:.1f}초, {rate:.0f}행/초)")
+    if args.dry_run:
+        print(f"   태그가 바뀔 포스트: {stats['changed']}개, 스팸: {stats['spam']}개 (쓰지 않음)")
+    else:
+        print(f"   태그 갱신: {stats['updated']}개, 스팸 삭제: {stats['deleted']}개")
+        if stats['spam'] and not args.delete_spam:
+            print(f"💡 스팸 {stats['spam']}개는 남겨 두었습니다. 삭제하려면 --delete-spam으로 실행하세요")
@@ -6,66 +6,217 @@
     python scripts/check_db_capacity.py
 
 환경 변수:
+    STORAGE_BACKEND: supabase (기본값) 또는 sqlite (POSTS_DB 파일, 기본값: .cache/posts.sqlite)
     SUPABASE_URL: Supabase 프로젝트 URL
     SUPABASE_KEY: Supabase service_role 키
+    DB_MAX_SIZE_MB: 데이터베이스 용량 한도 (기본값: 500, 무료 티어)
+    ROW_SAMPLE_SIZE: 행 크기 / 증가 속도 추정에 쓸 최신 행 수 (기본값: 200)
+    CAPACITY_HISTORY_FILE: 용량 스냅샷 기록 파일 (기본값: .cache/capacity_history.jsonl)
+    ARCHIVE_MONTHS: 현재 아카이빙 설정 (권장값과 비교용, 기본값: 6)
+
+실행할 때마다 용량 스냅샷을 기록 파일에 남기고, 쌓인 기록으로 경고 / 위험 기준 도달 시점과
+권장 ARCHIVE_MONTHS 값을 계산합니다. check_database_size() 함수가 없으면 행 수는
+통계 기반 추정(count='planned')으로, 크기는 최신 행 표본의 실제 크기로 추정합니다.
+SQLite 저장소는 파일 크기와 정확한 행 수를 사용합니다.
 """
 import os
-from supabase import create_client
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.capacity import (  # noqa: E402
+    FORECAST_WINDOW_DAYS, SECONDS_PER_DAY, CapacityHistory, days_until, estimate_row_bytes,
+    growth_per_day, recommend_archive_months,
+)
+from gamenews.storage import open_post_store  # noqa: E402
 
 # 설정
 WARNING_THRESHOLD = 80  # 80% 이상이면 경고
 CRITICAL_THRESHOLD = 90  # 90% 이상이면 위험
+MAX_SIZE_MB = float(os.getenv("DB_MAX_SIZE_MB", "500"))  # sql/maintenance_functions.sql의 max_size_mb와 같은 값
+ROW_SAMPLE_SIZE = int(os.getenv("ROW_SAMPLE_SIZE", "200"))
+ARCHIVE_MONTHS = int(os.getenv("ARCHIVE_MONTHS", "6"))
 
 def check_capacity():
     """데이터베이스 용량 확인"""
     
-    # Supabase 클라이언트
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_KEY")
-    
-    if not supabase_url or not supabase_key:
-        print("❌ 환경 변수를 설정해주세요: SUPABASE_URL, SUPABASE_KEY")
+    # posts 저장소 (STORAGE_BACKEND=sqlite이면 로컬 SQLite 파일)
+    try:
+        store = open_post_store()
+    except ValueError as e:
+        print(f"❌ 저장소를 열 수 없습니다: {e}")
+        print("   SUPABASE_URL, SUPABASE_KEY를 설정하거나 STORAGE_BACKEND=sqlite로 실행하세요")
         return None
     
-    supabase = create_client(supabase_url, supabase_key)
+    snapshot = take_snapshot(store)
+    
+    if snapshot['source'] == 'rpc':
+        print_capacity_report(snapshot)
+    else:
+        print_estimate_report(snapshot)
+    
+    # 이전 기록과 함께 추세 예측 (같은 방식으로 잰 스냅샷끼리만 비교)
+    history = CapacityHistory()
+    snapshots = [old for old in history.load() if old.get('source') == snapshot['source']] + [snapshot]
+    print_forecast(snapshot, snapshots)
     
     try:
-        # SQL 함수 호출 (check_database_size 함수가 있는 경우)
-        result = supabase.rpc('check_database_size').execute()
-        
-        if result.data:
-            data = result.data[0]
-            print_capacity_report(data)
-            return check_alert_level(data)
-    except Exception as e:
-        # 함수가 없는 경우 기본 통계만 표시
+        history.append(snapshot)
+    except OSError as e:
+        print(f"⚠️  용량 기록 저장 실패: {e}")
+    
+    return check_alert_level(snapshot)
+
+def take_snapshot(store) -> dict:
+    """
+    현재 용량 스냅샷을 만듭니다.
+    
+    - 저장소가 크기를 알려 주면 실제 크기를 사용 (Supabase는 check_database_size()의 pg_database_size, SQLite는 파일 크기)
+    - 없으면 posts 행 수(통계 기반 추정) x 표본 행 크기로 posts 크기만 추정
+    """
+    snapshot = {'taken_at': int(time.time())}
+    
+    data = store.size_stats(MAX_SIZE_MB)
+    rows, count_method = store.count_posts()
+    sample = sample_recent_rows(store)
+    sample_row_bytes = estimate_row_bytes(sample)
+    
+    snapshot.update({
+        'rows': rows,
+        'count_method': count_method,
+        'sample_row_bytes': round(sample_row_bytes, 1),
+        'sample_rows_per_day': sample_rows_per_day(sample),
+    })
+    
+    if data:
+        total_mb = float(data['total_size_mb'])
+        posts_mb = float(data['posts_size_mb'])
+        snapshot.update({
+            'source': 'rpc',
+            'total_mb': total_mb,
+            'posts_mb': posts_mb,
+            'used_mb': total_mb,
+            'usage_percent': float(data['usage_percent']),
+            'alert_level': data['alert_level'],
+            # 실제 posts 크기로 계산한 행당 크기 (인덱스, TOAST 포함)
+            'row_bytes': round(posts_mb * 1024 * 1024 / rows, 1) if rows else sample_row_bytes,
+        })
+    else:
         print("⚠️  check_database_size() 함수가 없습니다.")
         print("   docs/database-maintenance.md를 참고하여 SQL 함수를 생성하세요.\n")
+        posts_mb = (rows or 0) * sample_row_bytes / 1024 / 1024
+        snapshot.update({
+            'source': 'estimate',
+            'posts_mb': round(posts_mb, 2),
+            'used_mb': round(posts_mb, 2),
+            'usage_percent': round(posts_mb / MAX_SIZE_MB * 100, 2),
+            'row_bytes': round(sample_row_bytes, 1),
+        })
     
-    # 기본 통계 표시
-    result = supabase.table('posts').select('id', count='exact').execute()
-    total_posts = result.count
-    
-    print("\n" + "="*50)
-    print("📊 데이터베이스 기본 통계")
-    print("="*50)
-    print(f"총 포스트 수: {total_posts:,}개")
-    print(f"예상 크기: {(total_posts * 0.6 / 1024):.2f} MB")
-    print("="*50 + "\n")
+    return snapshot
+
+def sample_recent_rows(store, size: int = ROW_SAMPLE_SIZE) -> list:
+    """최신 행 size개를 가져옵니다 (행 크기 / 증가 속도 추정용, created_at 인덱스 사용)."""
+    if size <= 0:
+        return []
+    try:
+        return store.recent_rows('*', limit=size)
+    except Exception as e:
+        print(f"⚠️  표본 행 조회 실패: {e}")
+        return []
+
+def sample_rows_per_day(rows: list):
+    """최신 행 표본의 created_at 범위로 하루에 추가되는 행 수를 추정합니다."""
+    times = []
+    for row in rows:
+        try:
+            times.append(datetime.fromisoformat(str(row['created_at']).replace('Z', '+00:00')).timestamp())
+        except (KeyError, TypeError, ValueError):
+            continue
     
-    return "OK"
+    if len(times) < 2:
+        return None
+    span_days = (max(times) - min(times)) / SECONDS_PER_DAY
+    if span_days <= 0:
+        return None
+    return round((len(times) - 1) / span_days, 1)
 
 def print_capacity_report(data):
     """용량 리포트 출력"""
     print("\n" + "="*50)
     print("📊 데이터베이스 용량 리포트")
     print("="*50)
-    print(f"전체 크기: {data['total_size_mb']} MB")
-    print(f"Posts 테이블: {data['posts_size_mb']} MB")
+    print(f"전체 크기: {data['total_mb']} MB")
+    print(f"Posts 테이블: {data['posts_mb']} MB")
     print(f"사용률: {data['usage_percent']}%")
     print(f"상태: {data['alert_level']}")
     print("="*50 + "\n")
 
+def print_estimate_report(snapshot):
+    """check_database_size() 함수가 없을 때의 추정 리포트"""
+    rows = snapshot['rows']
+    print("\n" + "="*50)
+    print("📊 데이터베이스 기본 통계 (추정)")
+    print("="*50)
+    print(f"총 포스트 수: {rows:,}개 ({snapshot['count_method']})" if rows is not None else "총 포스트 수: 알 수 없음")
+    print(f"행당 크기: {snapshot['row_bytes']:,.0f} bytes (최신 {ROW_SAMPLE_SIZE}개 표본)")
+    print(f"예상 크기: {snapshot['posts_mb']:.2f} MB")
+    print(f"사용률: {snapshot['usage_percent']}% (posts 테이블만, 한도 {MAX_SIZE_MB:.0f} MB)")
+    print("="*50 + "\n")
+
+def print_forecast(snapshot, snapshots):
+    """스냅샷 기록으로 경고 / 위험 기준 도달 시점과 권장 ARCHIVE_MONTHS를 출력합니다."""
+    now = snapshot['taken_at']
+    used_mb = snapshot['used_mb']
+    
+    mb_per_day = growth_per_day(snapshots, 'used_mb', now=now)
+    rows_per_day = growth_per_day(snapshots, 'rows', now=now)
+    rate_source = f"최근 {FORECAST_WINDOW_DAYS}일 스냅샷 {len(snapshots)}개"
+    
+    if rows_per_day is None and snapshot.get('sample_rows_per_day'):
+        # 기록이 부족하면 최신 행 표본의 추가 속도로 대신 추정
+        rows_per_day = snapshot['sample_rows_per_day']
+        rate_source = f"최신 {ROW_SAMPLE_SIZE}개 행의 created_at"
+    if mb_per_day is None and rows_per_day is not None:
+        mb_per_day = rows_per_day * snapshot['row_bytes'] / 1024 / 1024
+    
+    print("📈 증가 추세")
+    if mb_per_day is None:
+        print("   아직 추세를 계산할 기록이 부족합니다 (하루 이상 간격의 스냅샷이 2개 이상 필요).\n")
+        return
+    
+    print(f"   하루 증가량: {mb_per_day:+.3f} MB"
+          + (f" / {rows_per_day:+,.0f}행" if rows_per_day is not None else "")
+          + f" ({rate_source})")
+    
+    for label, threshold in (("경고", WARNING_THRESHOLD), ("위험", CRITICAL_THRESHOLD)):
+        limit_mb = MAX_SIZE_MB * threshold / 100
+        days = days_until(used_mb, limit_mb, mb_per_day)
+        if days is None:
+            print(f"   {label}({threshold}%, {limit_mb:.0f} MB) 도달: 증가하지 않음")
+        elif days == 0:
+            print(f"   {label}({threshold}%, {limit_mb:.0f} MB) 도달: 이미 넘음")
+        else:
+            reach_at = datetime.fromtimestamp(now) + timedelta(days=days)
+            print(f"   {label}({threshold}%, {limit_mb:.0f} MB) 도달 예상: {reach_at:%Y-%m-%d} (약 {days:,.0f}일 후)")
+    
+    # posts 외 크기(다른 테이블, 시스템 카탈로그)는 아카이빙으로 줄지 않으므로 고정으로 봄
+    other_mb = max(0.0, used_mb - (snapshot['rows'] or 0) * snapshot['row_bytes'] / 1024 / 1024)
+    warning_mb = MAX_SIZE_MB * WARNING_THRESHOLD / 100
+    months = recommend_archive_months(warning_mb, other_mb, rows_per_day, snapshot['row_bytes'])
+    
+    if months is None:
+        pass
+    elif months == 0:
+        print(f"   💡 1개월치 게시물만 남겨도 경고 기준({warning_mb:.0f} MB)을 넘습니다. 한도 상향이나 요약 길이 축소를 검토하세요.")
+    else:
+        note = "현재 설정 유지 가능" if ARCHIVE_MONTHS <= months else "현재 설정보다 짧게"
+        print(f"   💡 권장 ARCHIVE_MONTHS: {months} 이하 (현재 {ARCHIVE_MONTHS}, {note}) "
+              f"- 경고 기준({warning_mb:.0f} MB) 아래 유지")
+    print()
+
 def check_alert_level(data):
     """알림 레벨 확인 및 액션 안내"""
     usage = float(data['usage_percent'])
@@ -6,60 +6,97 @@
     python scripts/cleanup_old_posts.py
 
 환경 변수:
+    STORAGE_BACKEND: supabase (기본값) 또는 sqlite (POSTS_DB 파일, 기본값: .cache/posts.sqlite)
     SUPABASE_URL: Supabase 프로젝트 URL
     SUPABASE_KEY: Supabase service_role 키
     CLEANUP_MONTHS: 삭제할 개월 수 (기본값: 6)
-    BATCH_SIZE: 배치 크기 (기본값: 1000)
+    CLEANUP_MODE: rpc (기본값) 또는 rest
+        rpc  - 저장소의 delete_before로 배치마다 요청 한 번에 삭제 (Supabase는 delete_old_posts_step SQL 함수,
+               sql/maintenance_functions.sql), 응답 시간에 맞춰 배치 크기 / 대기 시간 자동 조절
+        rest - 기존 방식 (id 조회 후 id로 삭제, 고정 배치 크기)
+    BATCH_SIZE: 배치 크기 / rpc 모드에서는 시작 배치 크기 (기본값: 1000)
+    CLEANUP_TARGET_SECONDS: rpc 모드의 배치당 목표 응답 시간 (기본값: 0.5)
+    CLEANUP_PAUSE_RATIO: rpc 모드에서 배치 응답 시간 대비 대기 비율 (기본값: 0.5)
 """
 import os
+import sys
 import time
 from datetime import datetime, timedelta
-from supabase import create_client
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.storage import open_post_store  # noqa: E402
 
 # 설정
 CLEANUP_MONTHS = int(os.getenv("CLEANUP_MONTHS", "6"))  # 6개월 이상 된 데이터 삭제
+CLEANUP_MODE = os.getenv("CLEANUP_MODE", "rpc")
 BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))       # 한 번에 삭제할 개수
-SLEEP_SECONDS = 1                                        # 배치 간 대기 시간
+SLEEP_SECONDS = 1                                        # 배치 간 대기 시간 (rest 모드)
 
-def cleanup_old_posts():
-    """오래된 포스트를 점진적으로 삭제"""
-    
-    # Supabase 클라이언트
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_KEY")
+# rpc 모드 적응형 배치 설정
+TARGET_BATCH_SECONDS = float(os.getenv("CLEANUP_TARGET_SECONDS", "0.5"))
+PAUSE_RATIO = float(os.getenv("CLEANUP_PAUSE_RATIO", "0.5"))
+MIN_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 20000
+MAX_GROWTH = 2.0                                         # 한 번에 최대 2배까지만 변경
+
+def next_batch_size(batch_size, latency):
+    """
+    직전 배치의 응답 시간을 목표 시간과 비교해 다음 배치 크기를 정합니다.
+    빠르면 키우고 느리면 줄이되, 한 번에 MAX_GROWTH배 이상 바뀌지 않도록 제한합니다.
+    """
+    ratio = TARGET_BATCH_SECONDS / max(latency, 0.001)
+    ratio = max(1 / MAX_GROWTH, min(MAX_GROWTH, ratio))
+    return max(MIN_BATCH_SIZE, min(MAX_BATCH_SIZE, int(batch_size * ratio)))
+
+def cleanup_via_rpc(store, cutoff_date):
+    """delete_before(Supabase는 delete_old_posts_step RPC)를 반복 호출하며 배치 크기와 대기 시간을 조절"""
+    total_deleted = 0
+    batch_size = BATCH_SIZE
+    start_time = time.time()
     
-    if not supabase_url or not supabase_key:
-        print("❌ 환경 변수를 설정해주세요: SUPABASE_URL, SUPABASE_KEY")
-        return 0
+    print(f"🎯 목표 응답 시간: {TARGET_BATCH_SECONDS:.2f}초/배치")
     
-    supabase = create_client(supabase_url, supabase_key)
+    while True:
+        batch_start = time.time()
+        deleted = store.delete_before(cutoff_date, batch_size)
+        latency = time.time() - batch_start
+        
+        total_deleted += deleted
+        
+        elapsed = time.time() - start_time
+        rate = total_deleted / elapsed if elapsed > 0 else 0
+        print(f"✅ {total_deleted}개 삭제 완료... "
+              f"(배치 {deleted}/{batch_size}개, {latency:.2f}초, 누적 {rate:.0f}행/초)")
+        
+        if deleted < batch_size:
+            break
+        
+        # 다음 배치 크기 조절 + 응답 시간에 비례해 대기 (데이터베이스 부하 감소)
+        batch_size = next_batch_size(batch_size, latency)
+        time.sleep(latency * PAUSE_RATIO)
     
-    cutoff_date = (datetime.now() - timedelta(days=CLEANUP_MONTHS * 30)).isoformat()
+    return total_deleted
+
+def cleanup_via_rest(store, cutoff_date):
+    """id 조회 후 id로 삭제 (배치마다 요청 두 번 이상, 고정 배치 크기)"""
     total_deleted = 0
-    
-    print(f"🗑️  정리 시작...")
-    print(f"📅 기준 날짜: {cutoff_date} ({CLEANUP_MONTHS}개월 전)")
-    print(f"📦 배치 크기: {BATCH_SIZE}개")
+    start_time = time.time()
     
     while True:
-        # 배치 단위로 조회
-        result = supabase.table('posts')\
-            .select('id')\
-            .lt('created_at', cutoff_date)\
-            .limit(BATCH_SIZE)\
-            .execute()
-        
-        posts = result.data
+        # 배치 단위로 조회 (가장 오래된 것부터, 삭제했으므로 매번 처음 페이지)
+        posts = next(store.iter_pages('id, created_at', page_size=BATCH_SIZE, before=cutoff_date), [])
         
         if not posts:
             break
         
         # 배치 삭제
-        ids = [post['id'] for post in posts]
-        supabase.table('posts').delete().in_('id', ids).execute()
+        store.delete_ids([post['id'] for post in posts])
         
         total_deleted += len(posts)
-        print(f"✅ {total_deleted}개 삭제 완료...")
+        elapsed = time.time() - start_time
+        rate = total_deleted / elapsed if elapsed > 0 else 0
+        print(f"✅ {total_deleted}개 삭제 완료... (누적 {rate:.0f}행/초)")
         
         # 대기 (데이터베이스 부하 감소)
         if len(posts) == BATCH_SIZE:
@@ -67,7 +104,40 @@ def cleanup_old_posts():
         else:
             break
     
-    print(f"\n🎉 정리 완료: 총 {total_deleted}개 포스트 삭제")
+    return total_deleted
+
+def cleanup_old_posts():
+    """오래된 포스트를 점진적으로 삭제"""
+    
+    # posts 저장소 (STORAGE_BACKEND=sqlite이면 로컬 SQLite 파일)
+    try:
+        store = open_post_store()
+    except ValueError as e:
+        print(f"❌ 저장소를 열 수 없습니다: {e}")
+        print("   SUPABASE_URL, SUPABASE_KEY를 설정하거나 STORAGE_BACKEND=sqlite로 실행하세요")
+        return 0
+    
+    cutoff_date = (datetime.now() - timedelta(days=CLEANUP_MONTHS * 30)).isoformat()
+    start_time = time.time()
+    
+    print(f"🗑️  정리 시작...")
+    print(f"📅 기준 날짜: {cutoff_date} ({CLEANUP_MONTHS}개월 전)")
+    print(f"📦 배치 크기: {BATCH_SIZE}개 ({CLEANUP_MODE} 모드)")
+    
+    if CLEANUP_MODE == "rest":
+        total_deleted = cleanup_via_rest(store, cutoff_date)
+    else:
+        try:
+            total_deleted = cleanup_via_rpc(store, cutoff_date)
+        except Exception as e:
+            # 함수가 없는 경우 기존 방식으로 진행
+            print(f"⚠️  delete_old_posts_step() 호출 실패: {e}")
+            print("   sql/maintenance_functions.sql을 참고하여 SQL 함수를 생성하세요. rest 모드로 계속합니다.\n")
+            total_deleted = cleanup_via_rest(store, cutoff_date)
+    
+    elapsed = time.time() - start_time
+    rate = total_deleted / elapsed if elapsed > 0 else 0
+    print(f"\n🎉 정리 완료: 총 {total_deleted}개 포스트 삭제 ({elapsed:.1f}초, {rate:.0f}행/초)")
     return total_deleted
 
 if __name__ == "__main__":
@@ -1,83 +1,255 @@
 #!/usr/bin/env python3
 """
-아카이브된 CSV 파일에서 데이터를 복원하는 스크립트
+아카이브에서 데이터를 복원하는 스크립트
 
 사용법:
-    python scripts/restore_archive.py <csv_file>
+    python scripts/restore_archive.py <아카이브 파일 또는 디렉토리> [옵션]
 
 예시:
+    # 이전 형식의 CSV 파일 하나
     python scripts/restore_archive.py archives/posts_archive_20240124.csv
 
+    # 월별로 나뉜 아카이브 디렉토리 (manifest.json 사용)
+    python scripts/restore_archive.py archives/20250101_020000
+
+    # 2024년 5월분만 복원 (겹치는 월 파일만 엶)
+    python scripts/restore_archive.py archives/20250101_020000 --from 2024-05-01 --to 2024-05-31
+
+옵션:
+    --from / --to: 복원할 created_at 날짜 범위 (YYYY-MM-DD, 양 끝 포함)
+    --workers: 동시에 보낼 배치 수 (기본값: 4)
+    --batch-size: 배치 크기 (기본값: 1000)
+    --retries: 일시적 오류(429, 5xx, 연결 실패)가 난 배치의 재시도 횟수 (기본값: 5)
+    --checkpoint: 진행 상황 파일 (기본값: <아카이브>.restore-checkpoint.json)
+    --restart: 체크포인트를 무시하고 처음부터 복원
+
+중단된 복원은 같은 명령을 다시 실행하면 마지막으로 완료된 배치 다음부터 이어서 진행합니다.
+
 환경 변수:
+    STORAGE_BACKEND: supabase (기본값) 또는 sqlite (POSTS_DB 파일, 기본값: .cache/posts.sqlite)
     SUPABASE_URL: Supabase 프로젝트 URL
     SUPABASE_KEY: Supabase service_role 키
 """
-import csv
+import argparse
+import json
 import os
 import sys
-from supabase import create_client
-
-def restore_from_archive(csv_file):
-    """CSV 파일에서 데이터 복원"""
-    
-    # 파일 존재 확인
-    if not os.path.exists(csv_file):
-        print(f"❌ 파일을 찾을 수 없습니다: {csv_file}")
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gamenews.archive import file_sha256, iter_archive_rows, select_archive_files  # noqa: E402
+from gamenews.ratelimit import RequestScheduler  # noqa: E402
+from gamenews.storage import open_post_store  # noqa: E402
+
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_RETRIES = 5
+
+def load_checkpoint(path):
+    """체크포인트 파일을 읽습니다. 없으면 빈 딕셔너리를 반환합니다."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_checkpoint(path, checkpoint):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+def resolve_sources(path, date_from=None, date_to=None):
+    """
+    복원할 파일 목록을 만듭니다.
+    디렉토리면 manifest.json에서 날짜 범위와 겹치는 파일만, 파일이면 그 파일 하나를 반환합니다.
+    """
+    if os.path.isdir(path):
+        files = select_archive_files(path, date_from, date_to)
+
+        # 체크섬 확인 (손상된 파일은 복원하지 않음)
+        for info in files:
+            if info.get('sha256') and file_sha256(info['path']) != info['sha256']:
+                raise ValueError(f"체크섬이 일치하지 않습니다: {info['path']}")
+
+        return [info['path'] for info in files]
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    return [path]
+
+def iter_batches(rows, batch_size):
+    """행 스트림을 batch_size개씩 묶어 (배치 번호, 배치)를 yield합니다."""
+    index = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield index, batch
+        index += 1
+
+def restore_file(store, source, checkpoint, checkpoint_path, date_from, date_to,
+                 batch_size, workers):
+    """
+    파일 하나를 복원합니다.
+    배치는 여러 워커가 동시에 보내지만, 체크포인트에는 처음부터 빈틈없이 완료된 배치 수만 기록합니다.
+
+    Returns:
+        (복원한 행 수, 실패한 배치 번호 목록)
+    """
+    key = json.dumps([os.path.abspath(source), date_from, date_to, batch_size])
+    committed = checkpoint.get(key, {}).get('committed', 0)
+
+    if committed:
+        print(f"↩️  {committed}개 배치는 이미 완료되어 건너뜁니다")
+
+    rows = iter_archive_rows(source, date_from, date_to)
+    batches = iter_batches(rows, batch_size)
+
+    restored_count = 0
+    failed = []
+    done = set()
+    in_flight = {}
+
+    def advance_checkpoint():
+        nonlocal committed
+        moved = False
+        while committed in done:
+            done.discard(committed)
+            committed += 1
+            moved = True
+        if moved:
+            checkpoint[key] = {'committed': committed}
+            save_checkpoint(checkpoint_path, checkpoint)
+
+    def collect(finished):
+        nonlocal restored_count
+        for future in finished:
+            index, size = in_flight.pop(future)
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ 배치 {index + 1} 복원 실패 (재시도 초과): {e}")
+                failed.append(index)
+                continue
+            done.add(index)
+            restored_count += size
+        advance_checkpoint()
+        print(f"✅ {restored_count}개 복원 완료 (배치 {committed}개 확정)")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index, batch in batches:
+            if index < committed:
+                continue
+
+            # 동시에 진행 중인 배치 수 제한 (파일 전체를 메모리에 올리지 않음)
+            if len(in_flight) >= workers * 2:
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(finished)
+
+            # original_link 기준 upsert라 같은 배치를 다시 보내도 안전함
+            future = executor.submit(store.upsert_posts, batch)
+            in_flight[future] = (index, len(batch))
+
+        while in_flight:
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(finished)
+
+    return restored_count, sorted(failed)
+
+def restore_from_archive(path, date_from=None, date_to=None, batch_size=DEFAULT_BATCH_SIZE,
+                         workers=DEFAULT_WORKERS, retries=DEFAULT_RETRIES,
+                         checkpoint_path=None, restart=False):
+    """아카이브 파일 또는 디렉토리에서 데이터 복원"""
+
+    try:
+        sources = resolve_sources(path, date_from, date_to)
+    except FileNotFoundError as e:
+        print(f"❌ 파일을 찾을 수 없습니다: {e}")
         return 0
-    
-    # Supabase 클라이언트
-    supabase_url = os.getenv("SUPABASE_URL")
-    supabase_key = os.getenv("SUPABASE_KEY")
-    
-    if not supabase_url or not supabase_key:
-        print("❌ 환경 변수를 설정해주세요: SUPABASE_URL, SUPABASE_KEY")
+
+    if not sources:
+        print("📭 날짜 범위와 겹치는 아카이브 파일이 없습니다.")
         return 0
-    
-    supabase = create_client(supabase_url, supabase_key)
-    
-    print(f"📂 파일 읽기: {csv_file}")
-    
-    # CSV 파일 읽기
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        posts = list(reader)
-    
-    if not posts:
-        print("📭 복원할 데이터가 없습니다.")
+
+    # posts 저장소 (STORAGE_BACKEND=sqlite이면 로컬 SQLite 파일)
+    # Supabase 요청 속도 / 재시도(지터 백오프, Retry-After)는 스케줄러가 조절
+    scheduler = RequestScheduler(concurrency=workers, max_retries=retries)
+    try:
+        store = open_post_store(scheduler=scheduler)
+    except ValueError as e:
+        print(f"❌ 저장소를 열 수 없습니다: {e}")
+        print("   SUPABASE_URL, SUPABASE_KEY를 설정하거나 STORAGE_BACKEND=sqlite로 실행하세요")
         return 0
-    
-    print(f"📊 총 {len(posts)}개 포스트 복원 시작...")
-    
-    # 배치로 삽입 (1000개씩)
-    batch_size = 1000
-    restored_count = 0
-    
-    for i in range(0, len(posts), batch_size):
-        batch = posts[i:i + batch_size]
-        
-        try:
-            # upsert로 중복 방지
-            supabase.table('posts').upsert(batch, on_conflict='original_link').execute()
-            restored_count += len(batch)
-            print(f"✅ {restored_count}/{len(posts)} 복원 완료")
-        except Exception as e:
-            print(f"⚠️  배치 {i//batch_size + 1} 복원 실패: {e}")
-            continue
-    
-    print(f"\n🎉 총 {restored_count}개 포스트 복원 완료")
-    return restored_count
+
+    checkpoint_path = checkpoint_path or f"{path.rstrip('/')}.restore-checkpoint.json"
+    checkpoint = {} if restart else load_checkpoint(checkpoint_path)
+
+    total_restored = 0
+    all_failed = []
+    start_time = time.time()
+
+    for source in sources:
+        print(f"📂 파일 읽기: {source}")
+        restored, failed = restore_file(
+            store, source, checkpoint, checkpoint_path, date_from, date_to,
+            batch_size, workers,
+        )
+        total_restored += restored
+        all_failed.extend((source, index) for index in failed)
+
+    elapsed = time.time() - start_time
+    rate = total_restored / elapsed if elapsed > 0 else 0
+    print(f"\n🎉 총 {total_restored}개 포스트 복원 완료 ({elapsed:.1f}초, {rate:.0f}행/초)")
+    if scheduler.stats['retries']:
+        print(f"   재시도 {scheduler.stats['retries']}번 (스로틀링 {scheduler.stats['throttled']}번), "
+              f"마지막 요청 속도 {scheduler.rate:.1f}회/초")
+
+    if all_failed:
+        print(f"⚠️  {len(all_failed)}개 배치가 실패했습니다. 같은 명령을 다시 실행하면 이어서 복원합니다:")
+        for source, index in all_failed:
+            print(f"   - {source}: 배치 {index + 1}")
+        raise RuntimeError(f"{len(all_failed)}개 배치 복원 실패")
+
+    return total_restored
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="아카이브에서 posts 데이터를 복원합니다.")
+    parser.add_argument('path', help="아카이브 CSV(.csv, .csv.gz) 파일 또는 manifest.json이 있는 디렉토리")
+    parser.add_argument('--from', dest='date_from', help="복원 시작 날짜 (YYYY-MM-DD)")
+    parser.add_argument('--to', dest='date_to', help="복원 종료 날짜 (YYYY-MM-DD, 포함)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES)
+    parser.add_argument('--checkpoint', help="체크포인트 파일 경로")
+    parser.add_argument('--restart', action='store_true', help="체크포인트를 무시하고 처음부터 복원")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("사용법: python scripts/restore_archive.py <csv_file>")
+        print("사용법: python scripts/restore_archive.py <아카이브 파일 또는 디렉토리> [옵션]")
         print("\n예시:")
         print("  python scripts/restore_archive.py archives/posts_archive_20240124.csv")
+        print("  python scripts/restore_archive.py archives/20250101_020000 --from 2024-05-01 --to 2024-05-31")
         sys.exit(1)
-    
-    csv_file = sys.argv[1]
-    
+
+    args = parse_args()
+
     try:
-        count = restore_from_archive(csv_file)
+        count = restore_from_archive(
+            args.path,
+            date_from=args.date_from,
+            date_to=args.date_to,
+            batch_size=args.batch_size,
+            workers=max(1, args.workers),
+            retries=args.retries,
+            checkpoint_path=args.checkpoint,
+            restart=args.restart,
+        )
         if count > 0:
             print(f"\n💡 팁: 데이터베이스 용량을 확인하세요:")
             print(f"   python scripts/check_db_capacity.py")
@@ -41,6 +41,34 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- ========================================
+-- 1-1. 단일 배치 삭제 함수
+-- ========================================
+-- 기준 시각보다 오래된 포스트를 최대 batch_size개만 삭제하고 삭제한 개수를 반환합니다.
+-- scripts/cleanup_old_posts.py가 배치마다 호출하며, 응답 시간에 맞춰 배치 크기와 대기 시간을 조절합니다.
+-- (delete_old_posts_batch는 모든 행을 한 트랜잭션 안에서 반복 삭제하므로 중간에 조절할 수 없습니다)
+
+CREATE OR REPLACE FUNCTION delete_old_posts_step(
+  cutoff_at TIMESTAMPTZ,
+  batch_size INTEGER DEFAULT 1000
+)
+RETURNS INTEGER AS $$
+DECLARE
+  rows_deleted INTEGER;
+BEGIN
+  DELETE FROM posts
+  WHERE id IN (
+    SELECT id FROM posts
+    WHERE created_at < cutoff_at
+    ORDER BY created_at
+    LIMIT batch_size
+  );
+
+  GET DIAGNOSTICS rows_deleted = ROW_COUNT;
+  RETURN rows_deleted;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ========================================
 -- 2. 데이터베이스 용량 확인 함수
 -- ========================================
@@ -78,6 +106,28 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- ========================================
+-- 3. 태그 일괄 갱신 함수
+-- ========================================
+-- [{"id": "...", "tags": [...]}, ...] 배열을 받아 UPDATE 한 번으로 태그를 바꾸고, 바뀐 행 수를 반환합니다.
+-- scripts/backfill_tags.py가 배치마다 호출합니다.
+-- upsert와 달리 그 사이 삭제된 id는 건너뛰므로 정리 스크립트와 동시에 실행해도 행이 되살아나지 않습니다.
+
+CREATE OR REPLACE FUNCTION update_post_tags(updates JSONB)
+RETURNS INTEGER AS $$
+DECLARE
+  updated_count INTEGER;
+BEGIN
+  UPDATE posts AS p
+  SET tags = u.tags
+  FROM jsonb_to_recordset(updates) AS u(id UUID, tags JSONB)
+  WHERE p.id = u.id;
+
+  GET DIAGNOSTICS updated_count = ROW_COUNT;
+  RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql;
+
 -- ========================================
 -- 사용 예시
 -- ========================================
@@ -90,3 +140,9 @@ $$ LANGUAGE plpgsql;
 
 -- 3개월 이상 된 포스트를 500개씩 삭제
 -- SELECT delete_old_posts_batch(3, 500);
+
+-- 특정 시각 이전 포스트를 한 배치(1000개)만 삭제
+-- SELECT delete_old_posts_step('2024-01-01T00:00:00+00', 1000);
+
+-- 태그 일괄 갱신
+-- SELECT update_post_tags('[{"id": "00000000-0000-0000-0000-000000000000", "tags": ["넥슨"]}]'::jsonb);
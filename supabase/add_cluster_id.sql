@@ -0,0 +1,12 @@
+-- posts.cluster_id 열 추가 (같은 사건을 다룬 기사 묶음)
+-- 크롤러의 스토리 묶기(gamenews/clustering.py)가 저장할 때 채웁니다
+-- Supabase SQL Editor에서 실행하세요 (여러 번 실행해도 안전합니다)
+
+-- 1. 열 추가
+ALTER TABLE posts ADD COLUMN IF NOT EXISTS cluster_id UUID;
+
+-- 2. 기존 게시물은 각자 하나의 스토리로 시작
+UPDATE posts SET cluster_id = id WHERE cluster_id IS NULL;
+
+-- 3. 스토리별 게시물 조회용 인덱스
+CREATE INDEX IF NOT EXISTS idx_posts_cluster_id ON posts(cluster_id, created_at DESC);
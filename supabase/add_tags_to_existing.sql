@@ -1,5 +1,6 @@
 -- 기존 뉴스 데이터에 태그 자동 추출 및 업데이트
 -- Supabase SQL Editor에서 실행하세요
+-- ⚠️ 키워드 목록(config/keywords)과 따로 관리되어 오래되었습니다. 대신 `python scripts/backfill_tags.py`를 사용하세요.
 
 -- 1. posts 테이블의 기존 뉴스에 태그 추출
 UPDATE posts
@@ -0,0 +1,12 @@
+-- posts.original_link에 UNIQUE 인덱스 추가
+-- 크롤러의 일괄 저장(upsert on_conflict='original_link')과 아카이브 복원에 필요합니다
+-- Supabase SQL Editor에서 실행하세요 (여러 번 실행해도 안전합니다)
+
+-- 1. 같은 링크가 여러 번 저장된 경우 가장 먼저 저장된 행만 남기기
+DELETE FROM posts p
+USING posts older
+WHERE p.original_link = older.original_link
+  AND (p.created_at, p.id) > (older.created_at, older.id);
+
+-- 2. UNIQUE 인덱스 생성
+CREATE UNIQUE INDEX IF NOT EXISTS idx_posts_original_link ON posts(original_link);
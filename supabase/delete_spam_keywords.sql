@@ -1,5 +1,6 @@
 -- 스팸 키워드가 포함된 뉴스 삭제
 -- Supabase SQL Editor에서 실행하세요
+-- ⚠️ 키워드 목록(config/keywords)과 따로 관리되어 오래되었습니다. 대신 `python scripts/backfill_tags.py --delete-spam`을 사용하세요.
 
 -- 1. posts 테이블에서 스팸 키워드 포함 뉴스 삭제
 DELETE FROM posts
@@ -21,12 +21,15 @@ CREATE TABLE IF NOT EXISTS posts (
   original_link TEXT NOT NULL,
   category TEXT NOT NULL,
   tags JSONB DEFAULT '[]'::jsonb,  -- 자동 추출된 태그 (회사명, 게임명, 기술 등)
+  cluster_id UUID,                 -- 같은 사건을 다룬 기사 묶음 (크롤러의 스토리 묶기)
   created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
 -- 인덱스 생성 (성능 최적화)
 CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_cluster_id ON posts(cluster_id, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_posts_category ON posts(category);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_posts_original_link ON posts(original_link);
 
 -- Row Level Security (RLS) 활성화
 ALTER TABLE posts ENABLE ROW LEVEL SECURITY;
@@ -0,0 +1,9 @@
+"""
+pytest 공통 설정: 저장소 루트를 import 경로에 넣어 gamenews 패키지를 바로 불러옵니다.
+
+    python -m pytest -q
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,143 @@
+"""gamenews/canonical.py: 추적 파라미터 제거와 래퍼 링크 해제 캐시"""
+import base64
+
+import pytest
+
+from gamenews.canonical import LinkCanonicalizer, ResolvedLinkCache, decode_google_news_url, strip_tracking
+from gamenews.seen_links import normalize_link
+
+
+@pytest.mark.parametrize('url, expected', [
+    # 추적 파라미터가 아닌 조각은 바이트 그대로 (%20 -> +, flag -> flag= 로 바뀌지 않음)
+    ('https://example.com/a?q=hello%20world&flag&utm_source=x', 'https://example.com/a?q=hello%20world&flag'),
+    ('https://example.com/a?utm_source=rss&utm_medium=feed', 'https://example.com/a'),
+    ('https://example.com/a?b=2&fbclid=abc&a=1', 'https://example.com/a?b=2&a=1'),
+    # 퍼센트 인코딩된 키와 대문자 키도 추적 파라미터로 봄
+    ('https://example.com/a?UTM%5Fcampaign=x&id=7', 'https://example.com/a?id=7'),
+    ('HTTPS://Example.COM/Path?id=1', 'https://example.com/Path?id=1'),
+    ('https://example.com', 'https://example.com/'),
+    # 문서 안 앵커는 지우고, 해시 라우팅 주소는 기사를 구분하므로 남김
+    ('https://example.com/a?utm_source=x#comments', 'https://example.com/a'),
+    ('https://example.com/#/article/123', 'https://example.com/#/article/123'),
+    ('https://example.com/#!/article/123?utm_source=x', 'https://example.com/#!/article/123?utm_source=x'),
+    ('', ''),
+])
+def test_strip_tracking(url, expected):
+    assert strip_tracking(url) == expected
+
+
+def test_hash_routed_articles_keep_distinct_seen_link_keys():
+    assert normalize_link('https://example.com/#/article/1') != normalize_link('https://example.com/#/article/2')
+    assert normalize_link('https://example.com/a#top') == normalize_link('https://example.com/a')
+
+
+def _old_google_news_link(target: str) -> str:
+    raw = b'\x08\x13\x22' + bytes([len(target)]) + target.encode('utf-8') + b'\xd2\x01\x00'
+    article_id = base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+    return f'https://news.google.com/rss/articles/{article_id}?oc=5'
+
+
+def test_decode_google_news_url():
+    link = _old_google_news_link('https://publisher.example/news/1')
+    assert decode_google_news_url(link) == 'https://publisher.example/news/1'
+    assert decode_google_news_url('https://news.google.com/rss/articles/AUzYQLnew-format') is None
+    assert decode_google_news_url('https://publisher.example/news/1') is None
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, location: str = None):
+        self.status_code = status_code
+        self.headers = {'Location': location} if location else {}
+        self.is_redirect = location is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """래퍼 링크 -> 응답(Location)을 돌려주고 요청한 URL을 기록합니다."""
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return self.routes.get(url) or FakeResponse(404)
+
+
+WRAPPED = 'https://news.google.com/rss/articles/AUzYQLnew?oc=5'
+WRAPPED_STRIPPED = 'https://news.google.com/rss/articles/AUzYQLnew'
+OTHER_WRAPPED = 'https://news.google.com/rss/articles/AUzYQLother?oc=5'
+
+
+def test_canonicalize_many_resolves_redirects_once_and_caches(tmp_path):
+    path = str(tmp_path / 'resolved_links.sqlite')
+    # 두 검색 피드가 같은 기사를 서로 다른 래퍼 링크로 돌려준 경우
+    session = FakeSession({
+        WRAPPED: FakeResponse(302, 'https://publisher.example/a?id=1&utm_source=google'),
+        OTHER_WRAPPED: FakeResponse(302, 'https://PUBLISHER.example/a?id=1'),
+    })
+    links = [WRAPPED, OTHER_WRAPPED, WRAPPED]
+
+    canonicalizer = LinkCanonicalizer(ResolvedLinkCache(path), session=session, max_workers=1)
+    result = canonicalizer.canonicalize_many(links)
+    canonicalizer.cache.close()
+
+    assert result == {WRAPPED: 'https://publisher.example/a?id=1', OTHER_WRAPPED: 'https://publisher.example/a?id=1'}
+    assert sorted(session.calls) == sorted([WRAPPED, OTHER_WRAPPED])
+    assert canonicalizer.requests == 2
+
+    # 다음 실행은 캐시에서 꺼내므로 요청하지 않음
+    session.calls.clear()
+    cached = LinkCanonicalizer(ResolvedLinkCache(path), session=session, max_workers=1)
+    assert cached.canonicalize_many(links) == result
+    assert session.calls == []
+    assert cached.requests == 0
+    cached.cache.close()
+
+
+def test_failed_resolution_is_cached_for_retry_window(tmp_path):
+    path = str(tmp_path / 'resolved_links.sqlite')
+    session = FakeSession({})
+
+    canonicalizer = LinkCanonicalizer(ResolvedLinkCache(path), session=session, max_workers=1)
+    assert canonicalizer.canonicalize(WRAPPED) == WRAPPED_STRIPPED
+    assert len(session.calls) == 1
+
+    # 실패도 RESOLVE_RETRY_HOURS 동안 기억하므로 다시 요청하지 않음
+    assert canonicalizer.canonicalize(WRAPPED) == WRAPPED_STRIPPED
+    assert len(session.calls) == 1
+    canonicalizer.cache.close()
+
+
+def test_decodable_wrapper_needs_no_request(tmp_path):
+    session = FakeSession({})
+    canonicalizer = LinkCanonicalizer(ResolvedLinkCache(str(tmp_path / 'r.sqlite')), session=session)
+    link = _old_google_news_link('https://publisher.example/news/2?utm_source=gn')
+
+    assert canonicalizer.canonicalize(link) == 'https://publisher.example/news/2'
+    assert session.calls == []
+    canonicalizer.cache.close()
+
+
+def test_offline_canonicalizer_does_not_cache_failures(tmp_path):
+    path = str(tmp_path / 'resolved_links.sqlite')
+    canonicalizer = LinkCanonicalizer(ResolvedLinkCache(path), resolve=False, session=FakeSession({}))
+    assert canonicalizer.canonicalize(WRAPPED) == WRAPPED_STRIPPED
+    assert canonicalizer.cache.get_many([WRAPPED]) == {}
+    canonicalizer.cache.close()
+
+
+def test_request_count_is_exact_across_worker_threads(tmp_path):
+    links = [f'https://news.google.com/rss/articles/AUzYQL{i}' for i in range(200)]
+    session = FakeSession({link: FakeResponse(302, f'https://publisher.example/{i}') for i, link in enumerate(links)})
+    canonicalizer = LinkCanonicalizer(ResolvedLinkCache(str(tmp_path / 'r.sqlite')), session=session, max_workers=8)
+
+    result = canonicalizer.canonicalize_many(links)
+    assert len(set(result.values())) == len(links)
+    assert canonicalizer.requests == len(links)
+    canonicalizer.cache.close()
@@ -0,0 +1,111 @@
+"""gamenews/feeds.py: 피드 커서로 새 항목 고르기 (select_new_entries / advance_cursor)"""
+import time
+
+from gamenews.feeds import CURSOR_MAX_IDS, FeedCursorStore, advance_cursor, entry_timestamp, select_new_entries
+
+HOUR = 3600
+NOW = 1_700_000_000
+
+
+def entry(ident: str, at: float = None) -> dict:
+    """feedparser 항목과 같은 모양 (published_parsed는 UTC struct_time)"""
+    item = {'id': ident, 'link': f'https://example.com/{ident}'}
+    if at is not None:
+        item['published_parsed'] = time.gmtime(at)
+    return item
+
+
+def ids(entries) -> list:
+    return [item['id'] for item in entries]
+
+
+def test_first_run_returns_every_entry_oldest_first():
+    # 피드는 보통 최신 항목이 위
+    feed = [entry('c', NOW), entry('b', NOW - HOUR), entry('a', NOW - 2 * HOUR)]
+    selected, total = select_new_entries(feed)
+    assert ids(selected) == ['a', 'b', 'c']
+    assert total == 3
+
+
+def test_entries_without_or_with_equal_timestamps_use_reverse_feed_order():
+    feed = [entry('new-undated'), entry('x', NOW), entry('y', NOW), entry('old-undated')]
+    selected, _ = select_new_entries(feed)
+    # 같은 시각은 피드의 역순(= 오래된 순), 시각이 없는 항목은 마지막에 역순으로
+    assert ids(selected) == ['y', 'x', 'old-undated', 'new-undated']
+
+
+def test_known_ids_are_skipped_even_if_newer():
+    cursor = {'published': NOW - HOUR, 'ids': ['b']}
+    feed = [entry('c', NOW), entry('b', NOW - HOUR)]
+    selected, total = select_new_entries(feed, cursor)
+    assert ids(selected) == ['c']
+    assert total == 1
+
+
+def test_late_indexed_entry_inside_slack_is_processed():
+    # 관련도 순 피드에 커서보다 이전 날짜의 새 기사가 늦게 올라온 경우
+    cursor = {'published': NOW, 'ids': ['c']}
+    feed = [entry('c', NOW), entry('late', NOW - 10 * HOUR)]
+    selected, _ = select_new_entries(feed, cursor, slack_hours=72)
+    assert ids(selected) == ['late']
+
+
+def test_entries_older_than_slack_are_skipped():
+    cursor = {'published': NOW, 'ids': []}
+    feed = [entry('fresh', NOW - HOUR), entry('stale', NOW - 100 * HOUR), entry('undated')]
+    selected, total = select_new_entries(feed, cursor, slack_hours=72)
+    assert ids(selected) == ['fresh', 'undated']
+    assert total == 2
+
+
+def test_max_entries_keeps_oldest_and_cursor_resumes_next_run():
+    feed = [entry(str(i), NOW - i * HOUR) for i in range(5)]     # '0'이 최신
+
+    selected, total = select_new_entries(feed, None, max_entries=2)
+    assert ids(selected) == ['4', '3']
+    assert total == 5
+
+    cursor = advance_cursor(None, selected)
+    assert cursor['published'] == NOW - 3 * HOUR
+
+    selected, total = select_new_entries(feed, cursor, max_entries=2)
+    assert ids(selected) == ['2', '1']
+    assert total == 3
+
+    cursor = advance_cursor(cursor, selected)
+    selected, _ = select_new_entries(feed, cursor, max_entries=2)
+    assert ids(selected) == ['0']
+
+
+def test_advance_cursor_keeps_latest_time_and_recent_ids():
+    cursor = {'published': NOW, 'ids': ['a']}
+    cursor = advance_cursor(cursor, [entry('old', NOW - HOUR), entry('b', NOW + HOUR), entry('a', NOW)])
+    assert cursor['published'] == NOW + HOUR
+    assert cursor['ids'] == ['a', 'old', 'b']
+
+    many = [entry(f'id{i}', NOW) for i in range(CURSOR_MAX_IDS + 10)]
+    cursor = advance_cursor(cursor, many)
+    assert len(cursor['ids']) == CURSOR_MAX_IDS
+    assert cursor['ids'][-1] == f'id{CURSOR_MAX_IDS + 9}'
+
+
+def test_advance_cursor_does_not_modify_the_original():
+    original = {'published': NOW, 'ids': ['a']}
+    advance_cursor(original, [entry('b', NOW + HOUR)])
+    assert original == {'published': NOW, 'ids': ['a']}
+
+
+def test_entry_timestamp_falls_back_to_updated():
+    item = {'id': 'a', 'updated_parsed': time.gmtime(NOW)}
+    assert entry_timestamp(item) == NOW
+    assert entry_timestamp({'id': 'b'}) is None
+
+
+def test_cursor_store_round_trip(tmp_path):
+    path = str(tmp_path / 'feed_cursors.json')
+    store = FeedCursorStore(path)
+    cursor = advance_cursor(store.get('https://feed.example/rss'), [entry('a', NOW)])
+    store.set('https://feed.example/rss', cursor)
+    store.save()
+
+    assert FeedCursorStore(path).get('https://feed.example/rss') == cursor
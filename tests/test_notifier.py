@@ -0,0 +1,154 @@
+"""gamenews/notifier.py: 이벤트 묶기, 429 retry_after 처리, 재시도 한도 (가짜 세션 사용)"""
+import threading
+import time
+
+import pytest
+
+from gamenews import notifier
+from gamenews.notifier import DiscordNotifier, NotifyEvent, build_embed, rate_limit_wait
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body: dict = None, headers: dict = None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = headers or {}
+        self._body = body
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("no JSON body")
+        return self._body
+
+
+class FakeSession:
+    """responses를 차례로 돌려주고(마지막 응답은 반복) 보낸 payload와 시각을 기록합니다."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses) or [FakeResponse(204)]
+        self.posts = []
+        self._lock = threading.Lock()
+
+    def post(self, url, json=None, timeout=None):
+        with self._lock:
+            self.posts.append((time.monotonic(), json))
+            index = min(len(self.posts), len(self.responses)) - 1
+            return self.responses[index]
+
+
+@pytest.fixture(autouse=True)
+def quiet_and_fast(monkeypatch):
+    # 테스트가 초 단위로 기다리지 않도록 최소 대기 / 백오프를 줄임
+    monkeypatch.setattr(notifier, 'RATE_LIMIT_MIN_WAIT', 0.05)
+    monkeypatch.setattr(notifier, 'RETRY_BASE_DELAY', 0.01)
+
+
+def stats(added: int, **extra) -> dict:
+    return dict({'added': added, 'skipped': 1, 'spam': 0, 'total_processed': added + 1, 'total_tags': 0,
+                 'duration': 1.0, 'top_tags': []}, **extra)
+
+
+def test_rate_limit_wait_reads_body_then_header_with_minimum():
+    assert rate_limit_wait(FakeResponse(429, {'retry_after': 0.3})) == pytest.approx(0.3)
+    assert rate_limit_wait(FakeResponse(429, headers={'Retry-After': '2'})) == pytest.approx(2)
+    # retry_after가 0이거나 없어도 최소 RATE_LIMIT_MIN_WAIT초
+    assert rate_limit_wait(FakeResponse(429, {'retry_after': 0})) == pytest.approx(0.05)
+    assert rate_limit_wait(FakeResponse(429)) == pytest.approx(0.05)
+    # 남은 요청이 0이면 Reset-After만큼 기다림
+    headers = {'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset-After': '1.5'}
+    assert rate_limit_wait(FakeResponse(204, headers=headers)) == pytest.approx(1.5)
+    assert rate_limit_wait(FakeResponse(204, headers={'X-RateLimit-Remaining': '3'})) == 0.0
+
+
+def test_events_within_window_are_coalesced_into_one_message():
+    session = FakeSession()
+    queue = DiscordNotifier('https://discord.example/webhook', window=0.3, session=session)
+
+    for added in (1, 2, 3):
+        queue.notify(stats(added))
+    queue.notify({}, error="boom")
+    time.sleep(0.6)
+
+    assert len(session.posts) == 1
+    embed = session.posts[0][1]['embeds'][0]
+    assert embed['title'].startswith("🎮 게임 뉴스 크롤러 4회 실행 요약")
+    fields = {field['name']: field['value'] for field in embed['fields']}
+    assert fields["✅ 새 기사"] == "**6개**"
+    assert "boom" in fields["❌ 에러"]
+    assert queue.close(timeout=1) is True
+    assert queue.sent == 1 and queue.delivered == 4
+
+
+def test_close_flushes_without_waiting_for_the_window():
+    session = FakeSession()
+    queue = DiscordNotifier('https://discord.example/webhook', window=60, session=session)
+    queue.notify(stats(1))
+
+    start = time.monotonic()
+    assert queue.close(timeout=5) is True
+    assert time.monotonic() - start < 1
+    assert len(session.posts) == 1
+
+
+def test_429_waits_for_retry_after_before_resending():
+    session = FakeSession(FakeResponse(429, {'retry_after': 0.3}), FakeResponse(204))
+    queue = DiscordNotifier('https://discord.example/webhook', window=0, session=session)
+
+    queue.notify(stats(1))
+    time.sleep(0.1)
+    assert queue.close(timeout=5) is True
+
+    (first_at, _), (second_at, _) = session.posts
+    assert second_at - first_at >= 0.3
+    assert queue.rate_limited == 1
+    assert queue.sent == 1 and queue.dropped == 0
+
+
+def test_message_is_dropped_after_too_many_rate_limits():
+    session = FakeSession(FakeResponse(429, {'retry_after': 0}))
+    queue = DiscordNotifier('https://discord.example/webhook', window=0, max_rate_limits=2, session=session)
+
+    queue.notify(stats(1))
+    assert queue.close(timeout=5) is False
+
+    # 처음 보낸 것 + 429 재시도 2번
+    assert len(session.posts) == 3
+    assert queue.dropped == 1 and queue.sent == 0
+
+
+def test_rate_limits_do_not_use_up_server_error_retries():
+    session = FakeSession(FakeResponse(429, {'retry_after': 0}), FakeResponse(429, {'retry_after': 0}),
+                          FakeResponse(500), FakeResponse(204))
+    queue = DiscordNotifier('https://discord.example/webhook', window=0, max_retries=1, session=session)
+
+    queue.notify(stats(1))
+    assert queue.close(timeout=5) is True
+    assert len(session.posts) == 4
+    assert queue.sent == 1
+
+
+def test_client_error_is_not_retried():
+    session = FakeSession(FakeResponse(400))
+    queue = DiscordNotifier('https://discord.example/webhook', window=0, session=session)
+
+    queue.notify(stats(1))
+    assert queue.close(timeout=5) is False
+    assert len(session.posts) == 1
+    assert queue.dropped == 1
+
+
+def test_close_gives_up_when_retry_after_exceeds_deadline():
+    session = FakeSession(FakeResponse(429, {'retry_after': 30}))
+    queue = DiscordNotifier('https://discord.example/webhook', window=0, session=session)
+
+    queue.notify(stats(1))
+    start = time.monotonic()
+    assert queue.close(timeout=1) is False
+    assert time.monotonic() - start < 2
+    assert queue.dropped == 1
+
+
+def test_single_event_embed_keeps_original_title():
+    embed = build_embed([NotifyEvent(stats(2))])
+    assert embed['title'] == "🎮 게임 뉴스 크롤러 실행 완료"
+    assert build_embed([NotifyEvent({}, error="x")])['title'] == "❌ 크롤러 실행 실패"
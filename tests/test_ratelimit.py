@@ -0,0 +1,228 @@
+"""gamenews/ratelimit.py: 토큰 버킷, AIMD 속도 조절, 재시도, 서킷 브레이커 (가짜 시계 사용)"""
+import pytest
+
+from gamenews import ratelimit
+from gamenews.ratelimit import CircuitBreaker, CircuitOpenError, RequestScheduler, TokenBucket, record_response
+
+
+class FakeClock:
+    """sleep()이 실제로 기다리지 않고 시계만 앞으로 보냅니다."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class HTTPError(Exception):
+    """PostgREST APIError처럼 code에 HTTP 상태를 담은 예외"""
+
+    def __init__(self, code: int):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class FakeHTTPResponse:
+    def __init__(self, status_code: int, retry_after: str = None):
+        self.status_code = status_code
+        self.headers = {'Retry-After': retry_after} if retry_after else {}
+
+
+def failing(*statuses, retry_after: str = None):
+    """statuses 순서대로 실패한 뒤 'ok'를 반환하는 함수"""
+    remaining = list(statuses)
+
+    def call():
+        if remaining:
+            status = remaining.pop(0)
+            record_response(FakeHTTPResponse(status, retry_after))
+            raise HTTPError(status)
+        return 'ok'
+    return call
+
+
+def make_scheduler(clock: FakeClock, **kwargs) -> RequestScheduler:
+    kwargs.setdefault('rate', 10)
+    kwargs.setdefault('max_rate', 1000)
+    return RequestScheduler(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def no_jitter(monkeypatch):
+    # backoff의 full jitter를 최댓값으로 고정해 결과를 결정적으로 만듦
+    monkeypatch.setattr(ratelimit.random, 'uniform', lambda low, high: high)
+
+
+def test_token_bucket_waits_for_tokens():
+    clock = FakeClock()
+    bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+
+    assert bucket.capacity == 1.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.1)
+
+
+def test_token_bucket_burst_is_bounded():
+    clock = FakeClock()
+    bucket = TokenBucket(100, clock=clock, sleep=clock.sleep)
+    clock.now += 60     # 오래 쉬어도 BUCKET_BURST_SECONDS 분량만 모임
+
+    waits = [bucket.acquire() for _ in range(20)]
+    assert waits[:10] == [0.0] * 10
+    assert all(wait > 0 for wait in waits[10:])
+
+
+def test_token_bucket_pause_blocks_until_resume():
+    clock = FakeClock()
+    bucket = TokenBucket(10, clock=clock, sleep=clock.sleep)
+    bucket.pause(5)
+
+    assert bucket.acquire() >= 5
+
+
+def test_slow_start_adds_one_per_success():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+
+    for _ in range(5):
+        assert scheduler.call(lambda: 'ok') == 'ok'
+    assert scheduler.rate == pytest.approx(15)
+
+
+def test_throttle_decreases_multiplicatively_then_increases_additively():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=20)
+
+    assert scheduler.call(failing(429)) == 'ok'
+    # 429로 70%, 재시도 성공으로 RATE_INCREASE만큼
+    assert scheduler.rate == pytest.approx(20 * ratelimit.RATE_DECREASE + ratelimit.RATE_INCREASE)
+    assert scheduler.stats['throttled'] == 1
+    assert scheduler.stats['retries'] == 1
+
+    rate = scheduler.rate
+    for _ in range(10):
+        scheduler.call(lambda: 'ok')
+    # slow start는 끝났으므로 성공마다 RATE_INCREASE씩만
+    assert scheduler.rate == pytest.approx(rate + 10 * ratelimit.RATE_INCREASE)
+
+
+def test_one_decrease_per_congestion_event():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=100)
+    sent_at = clock()
+    clock.now += 0.5
+
+    # 같은 시점에 보낸 요청들의 429는 한 번만 줄임
+    scheduler._on_throttled(sent_at, None)
+    scheduler._on_throttled(sent_at, None)
+    assert scheduler.rate == pytest.approx(100 * ratelimit.RATE_DECREASE)
+
+    # 줄인 뒤에 보낸 요청의 429는 다시 줄임
+    scheduler._on_throttled(clock(), None)
+    assert scheduler.rate == pytest.approx(100 * ratelimit.RATE_DECREASE ** 2)
+
+
+def test_rate_stays_within_bounds():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, rate=2, min_rate=1, max_rate=3)
+
+    for _ in range(5):
+        scheduler._on_throttled(clock(), None)
+        clock.now += 1
+    assert scheduler.rate == 1
+
+    for _ in range(50):
+        scheduler.call(lambda: 'ok')
+    assert scheduler.rate == 3
+
+
+def test_short_retry_after_delays_only_the_retry():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+
+    assert scheduler.call(failing(429, retry_after='2')) == 'ok'
+    assert scheduler.bucket.resume_at < clock()
+    assert max(clock.slept) == pytest.approx(2)
+
+
+def test_long_retry_after_pauses_every_request():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+    start = clock()
+
+    assert scheduler.call(failing(429, retry_after='30')) == 'ok'
+    assert scheduler.bucket.resume_at == pytest.approx(start + 30)
+    assert clock() >= start + 30
+
+
+def test_non_transient_error_is_not_retried():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock)
+
+    with pytest.raises(HTTPError):
+        scheduler.call(failing(400))
+    assert scheduler.stats['requests'] == 1
+    assert scheduler.stats['retries'] == 0
+    assert scheduler.breaker.state == 'closed'
+
+
+def test_gives_up_after_max_retries():
+    clock = FakeClock()
+    scheduler = make_scheduler(clock, max_retries=2, breaker=CircuitBreaker(failure_threshold=100, clock=clock))
+
+    with pytest.raises(HTTPError):
+        scheduler.call(failing(503, 503, 503, 503))
+    assert scheduler.stats['requests'] == 3
+    assert scheduler.stats['retries'] == 2
+
+
+def test_circuit_breaker_state_transitions():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=clock)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == 'closed'
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # reset_seconds 뒤에는 요청 하나를 통과시키고, 실패하면 바로 다시 열림
+    clock.now += 30
+    breaker.before_call()
+    assert breaker.state == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    clock.now += 30
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.failures == 0
+    breaker.before_call()
+
+
+def test_scheduler_opens_breaker_on_server_errors_but_not_on_throttling():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=clock)
+    scheduler = make_scheduler(clock, max_retries=5, breaker=breaker)
+
+    # 429는 서버가 속도를 늦추라고 한 것이므로 장애로 세지 않음
+    assert scheduler.call(failing(429, 429, 429, 429)) == 'ok'
+    assert breaker.state == 'closed'
+
+    with pytest.raises(CircuitOpenError):
+        scheduler.call(failing(502, 502, 502, 502))
+    assert breaker.state == 'open'
+    assert scheduler.stats['requests'] == 5 + 3